@@ -0,0 +1,97 @@
+"""
+Throughput comparison of the AST dependency extractor against the legacy regex parser.
+
+Usage:
+python -m benchmarks.bench_extractor --tasks 20000 --repeat 5
+"""
+import argparse
+import time
+
+from dag_validator.dag_validation import AirflowDAGValidation
+from dag_validator.dependency_extractor import extract_dependencies
+
+
+def generate_dag_source(task_count: int, mixed: bool = False) -> str:
+    """
+    Generate a large synthetic DAG module.
+    By default only '>>' and '[a, b]' declarations are used, the subset both parsers
+    understand. With 'mixed', a third of the chains use the other declaration styles.
+    """
+    lines = [
+        "from airflow import DAG",
+        "from airflow.models.baseoperator import chain",
+        "from airflow.operators.empty import EmptyOperator",
+        "",
+        "dag = DAG('synthetic_dag', schedule=None)",
+        "",
+    ]
+    for index in range(task_count):
+        lines.append(f"source_task_{index} = EmptyOperator(task_id='source_task_{index}', dag=dag)")
+        lines.append(f"staging_task_{index} = EmptyOperator(task_id='staging_task_{index}', dag=dag)")
+        lines.append(f"landing_task_{index} = EmptyOperator(task_id='landing_task_{index}', dag=dag)")
+
+    lines.append("")
+    for index in range(0, task_count - 1, 2):
+        style = index // 2 % 3 if mixed else 0
+        if style == 0:
+            lines.append(
+                f"[source_task_{index}, source_task_{index + 1}] >> staging_task_{index}"
+                f" >> [landing_task_{index}, landing_task_{index + 1}]"
+            )
+        elif style == 1:
+            lines.append(
+                f"(\n    [source_task_{index}, source_task_{index + 1}]\n"
+                f"    >> staging_task_{index}\n"
+                f"    >> [landing_task_{index}, landing_task_{index + 1}]\n)"
+            )
+        else:
+            lines.append(
+                f"chain([source_task_{index}, source_task_{index + 1}], staging_task_{index},"
+                f" [landing_task_{index}, landing_task_{index + 1}])"
+            )
+        if mixed:
+            lines.append(f"staging_task_{index + 1} << source_task_{index + 1}")
+        else:
+            lines.append(f"source_task_{index + 1} >> staging_task_{index + 1}")
+    return "\n".join(lines) + "\n"
+
+
+def time_best(function, argument, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(argument)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    validator = AirflowDAGValidation(".")
+    parsers = {
+        "regex": lambda dag_string: list(validator._iter_regex_dependency_edges(dag_string)),
+        "ast": extract_dependencies,
+    }
+
+    for mixed in (False, True):
+        dag_string = generate_dag_source(args.tasks, mixed=mixed)
+        size_mb = len(dag_string.encode()) / 1024 / 1024
+        print(
+            f"\n{'Mixed' if mixed else 'Plain'} synthetic DAG: "
+            f"{args.tasks} tasks per layer, {size_mb:.1f} MiB"
+        )
+        for name, parse in parsers.items():
+            edge_count = len(set(parse(dag_string)))
+            seconds = time_best(parse, dag_string, args.repeat)
+            print(
+                f"{name:>6}: {seconds * 1000:8.1f} ms  {size_mb / seconds:6.1f} MiB/s"
+                f"  {edge_count} edges"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Benchmark of the lineage sweep on deep same-layer chains and wide diamonds.
+
+The legacy per-path walk, which re-explored shared ancestors from every base model,
+is timed alongside where its path count stays small enough to finish.
+
+Usage:
+python -m benchmarks.bench_lineage
+"""
+import sys
+import time
+from typing import Dict, List, Tuple
+
+from dag_validator.dependency_graph import DependencyGraph
+from dag_validator.lineage import LineageEngine
+
+# Estimated number of upstream paths above which the per-path walk is skipped
+PATH_WALK_LIMIT = 2_000_000
+
+
+def deep_chain(depth: int) -> List[Tuple[str, str]]:
+    # i.e. source_0 >> staging_0 >> staging_1 >> ... >> staging_<depth - 1>
+    edges = [("source_0", "staging_0")]
+    edges.extend((f"staging_{index}", f"staging_{index + 1}") for index in range(depth - 1))
+    return edges
+
+
+def wide_diamond(width: int, depth: int) -> List[Tuple[str, str]]:
+    # i.e. 'width' sources fully connected to 'depth' ranks of 'width' staging models each
+    edges = [
+        (f"source_{upstream}", f"staging_0_{downstream}")
+        for upstream in range(width)
+        for downstream in range(width)
+    ]
+    for rank in range(depth - 1):
+        edges.extend(
+            (f"staging_{rank}_{upstream}", f"staging_{rank + 1}_{downstream}")
+            for upstream in range(width)
+            for downstream in range(width)
+        )
+    return edges
+
+
+def path_walk(graph: DependencyGraph, layer: str, upstream_layer: str) -> Dict[str, set]:
+    """
+    Reference implementation of the legacy recursive walk (one walk per path, no memo)
+    """
+
+    def walk(base_model: str, node: int, layer_map: Dict[str, set]) -> None:
+        for upstream_node in graph.upstream(node):
+            if graph.layer_of(upstream_node) == upstream_layer:
+                layer_map[base_model].add(graph.name(upstream_node))
+            elif graph.layer_of(upstream_node) == layer:
+                walk(base_model, upstream_node, layer_map)
+
+    layer_map = {}
+    for node in graph.layer_nodes(layer):
+        if graph.upstream(node):
+            layer_map[graph.name(node)] = set()
+            walk(graph.name(node), node, layer_map)
+    return layer_map
+
+
+def run_case(name: str, edges: List[Tuple[str, str]], run_path_walk: bool) -> None:
+    graph = DependencyGraph.from_edges(edges)
+
+    start = time.perf_counter()
+    layer_map = LineageEngine({"staging": "source"}).resolve(graph)["staging"]
+    sweep_seconds = time.perf_counter() - start
+
+    if run_path_walk:
+        start = time.perf_counter()
+        try:
+            assert path_walk(graph, "staging", "source") == layer_map
+            path_walk_result = f"{(time.perf_counter() - start) * 1000:10.1f} ms"
+        except RecursionError:
+            path_walk_result = "RecursionError"
+    else:
+        path_walk_result = "skipped"
+
+    print(
+        f"{name:<24} {len(graph):>8} nodes {graph.edge_count:>8} edges"
+        f"  sweep {sweep_seconds * 1000:8.1f} ms  path walk {path_walk_result:>14}"
+    )
+
+
+def main() -> None:
+    print(f"Python recursion limit: {sys.getrecursionlimit()}")
+    for depth in (500, 10_000, 100_000):
+        # The per-path walk recurses once per chain link
+        run_case(f"deep chain {depth}", deep_chain(depth), run_path_walk=True)
+    for width, depth in ((4, 4), (4, 8), (8, 8), (30, 30)):
+        run_case(
+            f"wide diamond {width}x{depth}",
+            wide_diamond(width, depth),
+            run_path_walk=width ** (depth + 1) <= PATH_WALK_LIMIT,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Benchmark of the lineage index on DAGs linked by a shared Dataset.
+
+One producer DAG publishes a Dataset that schedules every consumer DAG, so all DAGs
+form one connected graph. Index build time, peak traced memory and cold query times
+are reported for a growing number of consumers: memory should grow linearly with the
+number of DAGs, not with the square of the connected graph size.
+
+Usage:
+python -m benchmarks.bench_lineage_index --consumers 50 100 200 --tasks 230
+"""
+import argparse
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from benchmarks.synthetic import generate_dag_source
+from dag_validator.dag_validation import AirflowDAGValidation
+from dag_validator.lineage_index import LineageIndex
+
+DATASET = "s3://shared/orders"
+
+
+def generate_linked_dag_folder(folder: Path, consumers: int, tasks: int) -> None:
+    """
+    Write one producer DAG publishing DATASET and 'consumers' DAGs scheduled on it.
+    """
+    producer = generate_dag_source(dag_id="producer", tasks=tasks)
+    producer += (
+        f"publish = EmptyOperator(task_id='publish', outlets=[Dataset('{DATASET}')], dag=dag)\n"
+        "landing_task_0 >> publish\n"
+    )
+    (folder / "producer.py").write_text(producer)
+    for index in range(consumers):
+        dag_id = f"consumer_{index:05d}"
+        source = generate_dag_source(dag_id=dag_id, tasks=tasks).replace(
+            "schedule=None", f"schedule=[Dataset('{DATASET}')]"
+        )
+        (folder / f"{dag_id}.py").write_text(source)
+
+
+def run_case(consumers: int, tasks: int) -> None:
+    with tempfile.TemporaryDirectory() as temp_dir:
+        folder = Path(temp_dir)
+        generate_linked_dag_folder(folder, consumers, tasks)
+        graph = AirflowDAGValidation(folder, quiet=True).build_global_graph().graph
+
+    start = time.perf_counter()
+    index = LineageIndex(graph)
+    build_seconds = time.perf_counter() - start
+
+    # Memory is traced on a second build, tracing slows the first one down several times
+    tracemalloc.start()
+    LineageIndex(graph)
+    _, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    upstream = index.upstream("consumer_00000::landing_task_0")
+    upstream_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    downstream = index.downstream("producer::publish")
+    downstream_ms = (time.perf_counter() - start) * 1000
+
+    print(
+        f"{consumers + 1:>5} DAGs {len(graph):>7} nodes: build {build_seconds:6.2f} s, "
+        f"peak {peak_bytes / 2**20:7.1f} MiB, upstream {upstream_ms:6.2f} ms "
+        f"({len(upstream)} models), downstream {downstream_ms:7.2f} ms ({len(downstream)} models)"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--consumers", type=int, nargs="+", default=[50, 100, 200])
+    parser.add_argument("--tasks", type=int, default=230, help="tasks per DAG file")
+    args = parser.parse_args()
+
+    for consumers in args.consumers:
+        run_case(consumers, args.tasks)
+
+
+if __name__ == "__main__":
+    main()
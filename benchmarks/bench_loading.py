@@ -0,0 +1,66 @@
+"""
+Benchmark of concurrent DAG file loading against a slow filesystem.
+
+A reader sleeping before every read stands in for per-file latency (e.g. NFS or a
+network mount), and the serial loop is timed against increasing thread pool sizes.
+
+Usage:
+python -m benchmarks.bench_loading --files 200 --latency-ms 5
+"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.synthetic import generate_dag_folder
+from dag_validator.dag_validation import AirflowDAGValidation
+from dag_validator.loader import read_file_bytes
+
+
+class LatencyReader:
+    """
+    Read files after sleeping 'latency' seconds, i.e. the round trip of a remote filesystem
+    """
+
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    def __call__(self, file_path: Path) -> bytes:
+        time.sleep(self.latency)
+        return read_file_bytes(file_path)
+
+
+def run_case(folder: Path, reader: LatencyReader, io_workers: int, baseline: tuple) -> float:
+    validator = AirflowDAGValidation(folder, io_workers=io_workers, reader=reader, quiet=True)
+    start = time.perf_counter()
+    results = validator.process_dag_folder()
+    seconds = time.perf_counter() - start
+    assert results == baseline
+    return seconds
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--files", type=int, default=200)
+    parser.add_argument("--tasks", type=int, default=100, help="tasks per DAG file")
+    parser.add_argument("--latency-ms", type=float, default=5.0, help="per-file read latency")
+    args = parser.parse_args()
+
+    reader = LatencyReader(args.latency_ms / 1000)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        folder = Path(temp_dir)
+        generate_dag_folder(folder, files=args.files, tasks=args.tasks)
+        baseline = AirflowDAGValidation(folder, quiet=True).process_dag_folder()
+
+        serial_seconds = run_case(folder, reader, 0, baseline)
+        print(f"{'serial':<12} {serial_seconds * 1000:10.1f} ms")
+        for io_workers in (4, 8, 16, 32):
+            seconds = run_case(folder, reader, io_workers, baseline)
+            print(
+                f"{f'{io_workers} threads':<12} {seconds * 1000:10.1f} ms"
+                f"  {serial_seconds / seconds:5.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
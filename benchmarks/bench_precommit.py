@@ -0,0 +1,73 @@
+"""
+Benchmark of the pre-commit hook against its latency target.
+
+Generates a repository of 1,000 synthetic DAG files, then times the hook process
+(interpreter start-up included, as pre-commit runs it) on a few changed files, and
+exits with an error when the median run is over the target.
+
+Usage:
+python -m benchmarks.bench_precommit --files 1000 --changed 5 --target-ms 200
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.synthetic import generate_dag_folder
+
+# Documented latency target of 'python -m dag_validator.precommit' for 5 changed files
+PRECOMMIT_TARGET_MS = 200
+
+
+def time_hook(dag_folder: Path, changed_files, repeat: int) -> list:
+    command = [
+        sys.executable,
+        "-m",
+        "dag_validator.precommit",
+        "--fail-fast",
+        "--dag-folder",
+        str(dag_folder),
+        *map(str, changed_files),
+    ]
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        completed = subprocess.run(command, capture_output=True, text=True)
+        timings.append((time.perf_counter() - start) * 1000)
+        if completed.returncode not in (0, 1):
+            raise RuntimeError(completed.stderr)
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--files", type=int, default=1000, help="DAG files in the repository")
+    parser.add_argument("--changed", type=int, default=5, help="changed DAG files per commit")
+    parser.add_argument("--tasks", type=int, default=300, help="tasks per DAG file")
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--target-ms", type=float, default=PRECOMMIT_TARGET_MS)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        dag_folder = Path(temp_dir)
+        dag_files = generate_dag_folder(dag_folder, files=args.files, tasks=args.tasks)
+        step = max(len(dag_files) // args.changed, 1)
+        changed_files = dag_files[::step][: args.changed]
+
+        time_hook(dag_folder, changed_files, 1)  # warm the file system and bytecode caches
+        timings = time_hook(dag_folder, changed_files, args.repeat)
+
+    median = statistics.median(timings)
+    print(
+        f"{args.changed} changed files of {args.files}: median {median:.1f} ms, "
+        f"min {min(timings):.1f} ms, max {max(timings):.1f} ms (target {args.target_ms:.0f} ms)"
+    )
+    if median > args.target_ms:
+        sys.exit(f"Pre-commit hook over its {args.target_ms:.0f} ms target")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+Benchmark harness for AirflowDAGValidation on a synthetic DAG folder.
+
+Times parsing, every layer mapper and the full process_dag_folder run, and reports
+throughput and peak memory as JSON so results can be compared between commits.
+
+Usage:
+python -m benchmarks.run --files 200 --tasks 300 --layers 6 --output bench_output.json
+"""
+import argparse
+import json
+import platform
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Dict
+
+from benchmarks.synthetic import generate_dag_folder, upstream_layer_mapping
+from dag_validator import __version__
+from dag_validator.dag_validation import AirflowDAGValidation
+from dag_validator.lineage import LineageEngine
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def run_benchmark(folder: Path, shape: Dict[str, int], repeat: int = 3) -> Dict:
+    mapping = upstream_layer_mapping(shape["layers"])
+    validator = AirflowDAGValidation(folder, upstream_layer_mapping=mapping, quiet=True)
+    dag_paths = sorted(folder.glob("*.py"))
+    total_bytes = sum(dag_path.stat().st_size for dag_path in dag_paths)
+
+    def best_of(function) -> float:
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            function()
+            best = min(best, time.perf_counter() - start)
+        return best
+
+    timings = {}
+    timings["parse"] = best_of(lambda: [validator.parse_dag_file(path) for path in dag_paths])
+    graphs = [validator.parse_dag_file(path) for path in dag_paths]
+
+    # One sweep resolves every layer, so each mapper is timed with a cold engine
+    for layer, layer_function in validator.layer_functions.items():
+
+        def map_layer():
+            validator.lineage_engine = LineageEngine(mapping)
+            for graph in graphs:
+                validator.find_orphaned_models(layer_function(graph))
+
+        timings[f"map:{layer}"] = best_of(map_layer)
+
+    def map_all_layers():
+        validator.lineage_engine = LineageEngine(mapping)
+        for graph in graphs:
+            for layer_function in validator.layer_functions.values():
+                validator.find_orphaned_models(layer_function(graph))
+
+    timings["map:all_layers"] = best_of(map_all_layers)
+    timings["process_dag_folder"] = best_of(validator.process_dag_folder)
+
+    # Phase breakdown and peak memory of one more full run
+    validator.metrics.reset()
+    tracemalloc.start()
+    validator.process_dag_folder()
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    full_run = timings["process_dag_folder"]
+    return {
+        "commit": _git_commit(),
+        "validator_version": __version__,
+        "python": platform.python_version(),
+        "shape": shape,
+        "nodes": sum(len(graph) for graph in graphs),
+        "edges": sum(graph.edge_count for graph in graphs),
+        "bytes": total_bytes,
+        "timings_seconds": timings,
+        "phases_seconds": validator.metrics.summary()["phases"],
+        "throughput": {
+            "files_per_second": len(dag_paths) / full_run,
+            "edges_per_second": sum(graph.edge_count for graph in graphs) / full_run,
+            "megabytes_per_second": total_bytes / 1024 / 1024 / full_run,
+        },
+        "peak_traced_memory_bytes": peak_memory,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--files", type=int, default=100)
+    parser.add_argument("--tasks", type=int, default=300, help="tasks per DAG file")
+    parser.add_argument("--layers", type=int, default=3)
+    parser.add_argument("--chain-depth", type=int, default=3)
+    parser.add_argument("--fan-in", type=int, default=2)
+    parser.add_argument("--fan-out", type=int, default=2)
+    parser.add_argument("--list-size", type=int, default=2)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--dag-folder", help="reuse or keep the generated folder here")
+    parser.add_argument("--output", help="write the JSON report to this file")
+    args = parser.parse_args()
+
+    shape = {
+        "files": args.files,
+        "tasks": args.tasks,
+        "layers": args.layers,
+        "chain_depth": args.chain_depth,
+        "fan_in": args.fan_in,
+        "fan_out": args.fan_out,
+        "list_size": args.list_size,
+    }
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        folder = Path(args.dag_folder or temp_dir)
+        if not any(folder.glob("*.py")):
+            generate_dag_folder(folder, **shape)
+        report = run_benchmark(folder, shape, repeat=args.repeat)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(output + "\n")
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
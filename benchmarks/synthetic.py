@@ -0,0 +1,103 @@
+"""
+Synthetic Airflow DAG generator with a controlled dependency shape.
+"""
+import random
+from pathlib import Path
+from typing import Dict, List
+
+DEFAULT_LAYERS = ["source", "staging", "landing"]
+
+
+def layer_names(layer_count: int) -> List[str]:
+    """
+    Return 'layer_count' layer names, from the most upstream layer
+    # i.e. 4 -> ['source', 'staging', 'landing', 'layer3']
+    """
+    extra_layers = [f"layer{index}" for index in range(len(DEFAULT_LAYERS), layer_count)]
+    return (DEFAULT_LAYERS + extra_layers)[:layer_count]
+
+
+def upstream_layer_mapping(layer_count: int) -> Dict[str, str]:
+    layers = layer_names(layer_count)
+    return {layer: upstream_layer for upstream_layer, layer in zip(layers, layers[1:])}
+
+
+def _declare(upstream_models: List[str], downstream_models: List[str], list_size: int) -> List[str]:
+    # i.e. list_size 2: [a, b] >> [c, d], list_size 1: a >> c, a >> d, b >> c, b >> d
+    def chunks(models):
+        return [models[index:index + list_size] for index in range(0, len(models), list_size)]
+
+    def expression(models):
+        return models[0] if len(models) == 1 and list_size == 1 else f"[{', '.join(models)}]"
+
+    return [
+        f"{expression(upstream_chunk)} >> {expression(downstream_chunk)}"
+        for upstream_chunk in chunks(upstream_models)
+        for downstream_chunk in chunks(downstream_models)
+    ]
+
+
+def generate_dag_source(
+    dag_id: str = "synthetic_dag",
+    tasks: int = 300,
+    layers: int = 3,
+    chain_depth: int = 3,
+    fan_in: int = 2,
+    fan_out: int = 2,
+    list_size: int = 2,
+    seed: int = 0,
+) -> str:
+    """
+    Generate one DAG module with 'tasks' tasks spread evenly over 'layers' layers.
+
+    Every layer after the first is made of same-layer chains of 'chain_depth' tasks.
+    Chain heads are grouped by 'fan_out', and each group is fed by 'fan_in' tasks of the
+    upstream layer, declared as list expressions of up to 'list_size' tasks per side.
+    """
+    rng = random.Random(f"{seed}:{dag_id}")
+    names = layer_names(layers)
+    tasks_per_layer = max(1, tasks // len(names))
+
+    lines = [
+        "from airflow import DAG",
+        "from airflow.operators.empty import EmptyOperator",
+        "",
+        f"dag = DAG('{dag_id}', schedule=None)",
+        "",
+    ]
+    layer_tasks = []
+    for layer in names:
+        models = [f"{layer}_task_{index}" for index in range(tasks_per_layer)]
+        layer_tasks.append(models)
+        lines.extend(f"{model} = EmptyOperator(task_id='{model}', dag=dag)" for model in models)
+
+    lines.append("")
+    for upstream_models, models in zip(layer_tasks, layer_tasks[1:]):
+        chains = [models[index:index + chain_depth] for index in range(0, len(models), chain_depth)]
+        for chain in chains:
+            if len(chain) > 1:
+                lines.append(" >> ".join(chain))
+
+        # Each group of chain heads is fed by 'fan_in' tasks of the upstream layer
+        heads = [chain[0] for chain in chains]
+        for index in range(0, len(heads), fan_out):
+            group = heads[index:index + fan_out]
+            feeders = rng.sample(upstream_models, min(fan_in, len(upstream_models)))
+            lines.extend(_declare(feeders, group, list_size))
+
+    return "\n".join(lines) + "\n"
+
+
+def generate_dag_folder(folder: Path, files: int = 100, **shape) -> List[Path]:
+    """
+    Write 'files' synthetic DAG modules into 'folder' and return their paths.
+    """
+    folder = Path(folder)
+    folder.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for index in range(files):
+        dag_id = f"synthetic_dag_{index:05d}"
+        path = folder / f"{dag_id}.py"
+        path.write_text(generate_dag_source(dag_id=dag_id, **shape))
+        paths.append(path)
+    return paths
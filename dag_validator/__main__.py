@@ -0,0 +1,5 @@
+import sys
+
+from dag_validator.cli import main
+
+sys.exit(main())
@@ -0,0 +1,151 @@
+import hashlib
+import json
+import mmap
+import os
+import tempfile
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from dag_validator import __version__
+
+# Default upper bound for the total size of the cache directory
+DEFAULT_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+# Modules deciding what a DAG file produces (parsing, graph, lineage and the entry
+# format), their sources are part of every key so behaviour changes invalidate entries
+VALIDATOR_SOURCE_MODULES = (
+    "cache.py",
+    "dag_validation.py",
+    "dependency_extractor.py",
+    "dependency_graph.py",
+    "lineage.py",
+)
+
+
+@lru_cache(maxsize=None)
+def validator_source_digest(modules: Tuple[str, ...] = VALIDATOR_SOURCE_MODULES) -> bytes:
+    digest = hashlib.sha256()
+    package_path = Path(__file__).parent
+    for module in modules:
+        digest.update(module.encode() + b"\0" + (package_path / module).read_bytes())
+    return digest.digest()
+
+
+class ValidationCache:
+    """
+    On-disk cache of per-file validation results keyed by file content hash.
+
+    Each entry stores the parsed edges, every layer map and the orphaned models
+    of one DAG file. Entries are written to a temporary file and atomically
+    renamed into place, so several processes can share one cache directory.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int = DEFAULT_CACHE_MAX_BYTES):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def make_key(self, content: Union[bytes, mmap.mmap], layer_signature: Iterable[str]) -> str:
+        """
+        Hash the file content together with the validator version and sources, and the
+        configured layers
+        """
+        digest = hashlib.sha256()
+        digest.update(__version__.encode())
+        digest.update(validator_source_digest())
+        for layer in layer_signature:
+            digest.update(b"\0" + layer.encode())
+        digest.update(b"\0\0")
+        digest.update(content)
+        return digest.hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def get(
+        self, key: str
+    ) -> Optional[Tuple[List[Tuple[str, str]], Dict[str, Dict[str, set]], Dict[str, List[str]]]]:
+        entry_path = self._entry_path(key)
+        try:
+            with open(entry_path, "r") as file:
+                entry = json.load(file)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError):
+            # Unreadable or corrupted entry, treat it as a cache miss
+            self._remove(entry_path)
+            return None
+
+        # Refresh the access time used for least-recently-used eviction
+        try:
+            os.utime(entry_path)
+        except OSError:
+            pass
+
+        edges = [tuple(edge) for edge in entry["edges"]]
+        layer_maps = {
+            layer: {model: set(upstream) for model, upstream in layer_map.items()}
+            for layer, layer_map in entry["layer_maps"].items()
+        }
+        return edges, layer_maps, entry["orphans"]
+
+    def put(
+        self,
+        key: str,
+        edges: Iterable[Tuple[str, str]],
+        layer_maps: Dict[str, Dict[str, set]],
+        orphans: Dict[str, List[str]],
+    ) -> None:
+        entry = {
+            "edges": [list(edge) for edge in edges],
+            "layer_maps": {
+                layer: {model: sorted(upstream) for model, upstream in layer_map.items()}
+                for layer, layer_map in layer_maps.items()
+            },
+            "orphans": orphans,
+        }
+
+        entry_path = self._entry_path(key)
+        entry_path.parent.mkdir(exist_ok=True)
+        file_descriptor, temp_path = tempfile.mkstemp(
+            dir=entry_path.parent, prefix=".", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(file_descriptor, "w") as file:
+                json.dump(entry, file, separators=(",", ":"))
+            # Atomic on POSIX and Windows, the last concurrent writer wins
+            os.replace(temp_path, entry_path)
+        except OSError:
+            self._remove(Path(temp_path))
+
+    def prune(self) -> int:
+        """
+        Evict the least recently used entries until the cache fits in 'max_bytes'.
+        Returns the number of evicted entries.
+        """
+        entries = []
+        total_bytes = 0
+        for entry_path in self.cache_dir.glob("*/*.json"):
+            try:
+                stat = entry_path.stat()
+            except FileNotFoundError:
+                continue  # removed by a concurrent pruner
+            entries.append((stat.st_mtime, stat.st_size, entry_path))
+            total_bytes += stat.st_size
+
+        evicted = 0
+        for _, size, entry_path in sorted(entries):
+            if total_bytes <= self.max_bytes:
+                break
+            self._remove(entry_path)
+            total_bytes -= size
+            evicted += 1
+
+        return evicted
+
+    def _remove(self, path: Path) -> None:
+        try:
+            path.unlink()
+        except OSError:
+            pass
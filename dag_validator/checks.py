@@ -0,0 +1,98 @@
+import json
+from typing import Dict, Iterable, List, Optional
+
+from dag_validator.dependency_graph import get_layer
+from dag_validator.lineage import DEFAULT_UPSTREAM_LAYER_MAPPING
+
+
+def load_expected_orphans(path: Optional[str]) -> Optional[Dict[str, Dict[str, List[str]]]]:
+    # i.e. {"staging_to_source": {"example_dag.py": ["staging_task_with_no_upstream"]}}
+    if path is None:
+        return None
+    with open(path, "r") as file:
+        return json.load(file)
+
+
+def orphan_message(model: str) -> str:
+    return f"orphaned model '{model}'"
+
+
+def incorrect_upstream_messages(
+    model: str, upstream_models: Iterable[str], upstream_layer_mapping: Dict[str, str]
+) -> List[str]:
+    """
+    Return one message per upstream model of 'model' that is not in its expected
+    upstream layer, comparing layer prefixes with 'get_layer'. Shared by the checks
+    below and by the upstream prefix rule of the rule engine.
+    # i.e. with {'landing': 'staging'}
+    'landing_task_c1', {'source_task_a1'}
+    -> ["'landing_task_c1' maps to 'source_task_a1', expected layer 'staging'"]
+    """
+    expected_layer = upstream_layer_mapping.get(get_layer(model))
+    if expected_layer is None:
+        return []
+    return [
+        f"'{model}' maps to '{upstream_model}', expected layer '{expected_layer}'"
+        for upstream_model in sorted(upstream_models)
+        if get_layer(upstream_model) != expected_layer
+    ]
+
+
+def find_unexpected_orphans(
+    results: Dict[str, Dict[str, List[str]]],
+    expected_orphans: Optional[Dict[str, Dict[str, List[str]]]] = None,
+) -> List[str]:
+    """
+    Return one message per orphaned model (no upstream model of its upstream layer)
+    that is not listed in 'expected_orphans' ({layer: {dag: [models]}}).
+    # i.e.
+    {'staging_to_source': {'example_dag.py': ['staging_task_x']}}
+    -> ["example_dag.py, staging_to_source: orphaned model 'staging_task_x'"]
+    """
+    expected_orphans = expected_orphans or {}
+    return [
+        f"{dag}, {layer}: {orphan_message(model)}"
+        for layer, dag_orphans in results.items()
+        for dag, orphans in dag_orphans.items()
+        for model in orphans
+        if model not in expected_orphans.get(layer, {}).get(dag, [])
+    ]
+
+
+def find_incorrect_prefixes(
+    layer_dependencies: Dict[str, Dict[str, Dict[str, set]]],
+    upstream_layer_mapping: Optional[Dict[str, str]] = None,
+) -> List[str]:
+    """
+    Return one message per upstream model that is not in the expected upstream layer
+    of its model.
+    # i.e. with {'landing': 'staging'}
+    'landing_task_c1': {'source_task_a1'}
+    -> ["example_dag.py, landing_to_staging: 'landing_task_c1' maps to 'source_task_a1', expected layer 'staging'"]
+    """
+    if upstream_layer_mapping is None:
+        upstream_layer_mapping = DEFAULT_UPSTREAM_LAYER_MAPPING
+    return [
+        f"{dag}, {layer}: {message}"
+        for layer, dag_layer_maps in layer_dependencies.items()
+        for dag, layer_map in dag_layer_maps.items()
+        for model, upstream_models in layer_map.items()
+        for message in incorrect_upstream_messages(
+            model, upstream_models, upstream_layer_mapping
+        )
+    ]
+
+
+def run_checks(
+    results: Dict[str, Dict[str, List[str]]],
+    layer_dependencies: Dict[str, Dict[str, Dict[str, set]]],
+    upstream_layer_mapping: Optional[Dict[str, str]] = None,
+    expected_orphans: Optional[Dict[str, Dict[str, List[str]]]] = None,
+) -> List[str]:
+    """
+    Run the orphan and prefix checks of the test suite over the output of
+    'process_dag_folder', returning every failure message.
+    """
+    return find_unexpected_orphans(results, expected_orphans) + find_incorrect_prefixes(
+        layer_dependencies, upstream_layer_mapping
+    )
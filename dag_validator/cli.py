@@ -0,0 +1,167 @@
+"""
+Command line interface of the DAG validator, for CI jobs split over several nodes.
+
+Usage:
+python -m dag_validator validate dags/ --shard 1/4 --output partial-1.json
+python -m dag_validator merge partial-*.json
+python -m dag_validator validate dags/  # a single node, checks the results directly
+python -m dag_validator lineage dags/ upstream landing_task_c1 --layer staging
+python -m dag_validator serve dags/ --port 8765
+"""
+import argparse
+import sys
+from typing import List, Optional
+
+from dag_validator.checks import load_expected_orphans, run_checks
+from dag_validator.dag_validation import AirflowDAGValidation
+from dag_validator.sharding import (
+    SHARD_STRATEGIES,
+    PartialResult,
+    merge_partial_results,
+    parse_shard,
+)
+
+
+def _shard_argument(shard: str):
+    try:
+        return parse_shard(shard)
+    except ValueError as error:
+        raise argparse.ArgumentTypeError(str(error))
+
+
+def _report_failures(failures: List[str]) -> int:
+    for failure in failures:
+        print(failure)
+    print(f"{len(failures)} check(s) failed" if failures else "All checks passed")
+    return 1 if failures else 0
+
+
+def validate(args: argparse.Namespace) -> int:
+    validator = AirflowDAGValidation(
+        args.dag_folder_path,
+        parallel=args.parallel,
+        max_workers=args.max_workers,
+        cache_dir=args.cache_dir,
+        quiet=True,
+        shard=args.shard,
+        shard_strategy=args.strategy,
+    )
+    if args.output:
+        partial_result = validator.write_partial_result(args.output)
+        dag_count = len(next(iter(partial_result.results.values()), {}))
+        index, count = partial_result.shard
+        print(f"Shard {index}/{count}: {dag_count} DAG file(s) written to {args.output}")
+        return 0
+
+    results, layer_dependencies = validator.process_dag_folder()
+    return _report_failures(
+        run_checks(
+            results,
+            layer_dependencies,
+            validator.lineage_engine.upstream_layer_mapping,
+            load_expected_orphans(args.expected_orphans),
+        )
+    )
+
+
+def merge(args: argparse.Namespace) -> int:
+    partial_results = [PartialResult.read(path) for path in args.partial_results]
+    results, layer_dependencies = merge_partial_results(partial_results)
+    return _report_failures(
+        run_checks(
+            results,
+            layer_dependencies,
+            partial_results[0].upstream_layer_mapping,
+            load_expected_orphans(args.expected_orphans),
+        )
+    )
+
+
+def lineage(args: argparse.Namespace) -> int:
+    index = AirflowDAGValidation(args.dag_folder_path, quiet=True).build_lineage_index()
+    try:
+        if args.query == "path":
+            if len(args.tasks) != 2:
+                raise ValueError("'path' expects a source and a target task")
+            models = index.path(*args.tasks)
+        elif len(args.tasks) != 1:
+            raise ValueError(f"'{args.query}' expects a single task")
+        else:
+            lookup = index.upstream if args.query == "upstream" else index.downstream
+            models = lookup(args.tasks[0], args.layer)
+    except KeyError as error:
+        raise ValueError(error.args[0])
+
+    if models is None:
+        print(f"'{args.tasks[1]}' does not depend on '{args.tasks[0]}'")
+        return 1
+    for model in models:
+        print(model)
+    return 0
+
+
+def serve(args: argparse.Namespace) -> int:
+    from dag_validator.lineage_server import LineageServer
+
+    index = AirflowDAGValidation(args.dag_folder_path, quiet=True).build_lineage_index()
+    with LineageServer(index, args.host, args.port, verbose=args.verbose) as server:
+        print(f"Serving lineage of {len(index.task_nodes)} tasks on http://{args.host}:{args.port}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    validate_parser = commands.add_parser("validate", help="validate a DAG folder or one shard")
+    validate_parser.add_argument("dag_folder_path", nargs="?", default="dags/")
+    validate_parser.add_argument("--shard", type=_shard_argument, help="i/N, validate shard i of N")
+    validate_parser.add_argument(
+        "--strategy",
+        choices=SHARD_STRATEGIES,
+        default="hash",
+        help="assign files to shards by a stable hash of their name or by file size",
+    )
+    validate_parser.add_argument("--output", help="write a partial result file to merge")
+    validate_parser.add_argument("--parallel", action="store_true")
+    validate_parser.add_argument("--max-workers", type=int)
+    validate_parser.add_argument("--cache-dir")
+    validate_parser.set_defaults(handler=validate)
+
+    merge_parser = commands.add_parser("merge", help="merge partial results and run the checks")
+    merge_parser.add_argument("partial_results", nargs="+")
+    merge_parser.set_defaults(handler=merge)
+
+    lineage_parser = commands.add_parser("lineage", help="query the lineage of a task")
+    lineage_parser.add_argument("dag_folder_path")
+    lineage_parser.add_argument("query", choices=("upstream", "downstream", "path"))
+    lineage_parser.add_argument("tasks", nargs="+", help="a task, or the source and target of a path")
+    lineage_parser.add_argument("--layer", help="only return models of this layer")
+    lineage_parser.set_defaults(handler=lineage)
+
+    serve_parser = commands.add_parser("serve", help="serve lineage queries over local HTTP")
+    serve_parser.add_argument("dag_folder_path", nargs="?", default="dags/")
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=8765)
+    serve_parser.add_argument("--verbose", action="store_true", help="log every request")
+    serve_parser.set_defaults(handler=serve)
+
+    for command_parser in (validate_parser, merge_parser):
+        command_parser.add_argument(
+            "--expected-orphans", help="JSON file of {layer: {dag: [models]}} allowed to be orphaned"
+        )
+
+    args = parser.parse_args(argv)
+    try:
+        return args.handler(args)
+    except ValueError as error:
+        print(error, file=sys.stderr)
+        return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
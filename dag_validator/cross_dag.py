@@ -0,0 +1,160 @@
+import ast
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from dag_validator.dependency_extractor import _function_name, _parse_statement, iter_logical_lines
+
+# Logical lines mentioning any of these may declare a DAG, a sensor, a dataset or a task ID
+CROSS_DAG_MARKER_PATTERN = re.compile(
+    r"\bDAG\b|@dag\b|ExternalTaskSensor|Dataset|outlets|task_id"
+)
+
+# Plain operators ('a = Operator(task_id="a", ...)' without any link marker) only need
+# their task ID, read without building an AST
+LINK_MARKER_PATTERN = re.compile(r"\bDAG\b|@dag\b|ExternalTaskSensor|Dataset|outlets")
+PLAIN_TASK_PATTERN = re.compile(
+    r"""(?P<task>[A-Za-z_]\w*)\s*=\s*[\w.]+\(.*?\btask_id\s*=\s*(?P<quote>["'])(?P<task_id>[^"'\\]*)(?P=quote)""",
+    re.DOTALL,
+)
+
+DAG_FUNCTIONS = {"DAG", "dag"}
+SENSOR_FUNCTIONS = {"ExternalTaskSensor"}
+DATASET_FUNCTIONS = {"Dataset", "Asset"}
+
+
+def _string(node: Optional[ast.expr]) -> Optional[str]:
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return node.value
+    return None
+
+
+def _keywords(node: ast.Call) -> Dict[str, ast.expr]:
+    return {keyword.arg: keyword.value for keyword in node.keywords if keyword.arg}
+
+
+class CrossDAGLinks:
+    """
+    Declarations of one DAG file that link it to other DAGs.
+
+    sensors: local task -> [(external DAG ID, external task ID or None for the whole DAG)]
+    outlets: local task -> [dataset URIs it updates]
+    schedule: dataset URIs that trigger the DAG
+    task_ids: local task -> task ID, where the task ID differs from the variable name
+    """
+
+    def __init__(self, dag_id: str):
+        self.dag_id = dag_id
+        self.sensors: Dict[str, List[Tuple[str, Optional[str]]]] = {}
+        self.outlets: Dict[str, List[str]] = {}
+        self.schedule: List[str] = []
+        self.task_ids: Dict[str, str] = {}
+
+
+class CrossDAGLinkExtractor:
+    """
+    Collect the DAG ID, ExternalTaskSensor targets and dataset producers and consumers
+    from the statements of a DAG module.
+    # i.e.
+    wait_for_sales = ExternalTaskSensor(task_id="wait_for_sales", external_dag_id="sales",
+                                        external_task_id="source_orders")
+    -> sensors {'wait_for_sales': [('sales', 'source_orders')]}
+    """
+
+    def __init__(self, default_dag_id: str):
+        self.links = CrossDAGLinks(default_dag_id)
+        self.dag_id_found = False
+        self.datasets: Dict[str, str] = {}
+
+    def _dataset_uris(self, node: Optional[ast.expr]) -> List[str]:
+        # ie. Dataset("s3://bucket/orders"), a dataset variable, or a list of either
+        if isinstance(node, (ast.List, ast.Tuple, ast.Set)):
+            return [uri for element in node.elts for uri in self._dataset_uris(element)]
+        if isinstance(node, ast.Call) and _function_name(node.func) in DATASET_FUNCTIONS:
+            uri = _string(node.args[0]) if node.args else _string(_keywords(node).get("uri"))
+            return [uri] if uri is not None else []
+        if isinstance(node, ast.Name) and node.id in self.datasets:
+            return [self.datasets[node.id]]
+        return []
+
+    def visit_dag(self, node: ast.Call) -> None:
+        keywords = _keywords(node)
+        if not self.dag_id_found:
+            dag_id = _string(node.args[0]) if node.args else _string(keywords.get("dag_id"))
+            if dag_id is not None:
+                self.links.dag_id = dag_id
+                self.dag_id_found = True
+        for schedule_keyword in ("schedule", "schedule_interval"):
+            self.links.schedule.extend(self._dataset_uris(keywords.get(schedule_keyword)))
+
+    def visit_task_id(self, task: str, task_id: Optional[str]) -> None:
+        if task_id is not None and task_id != task:
+            self.links.task_ids[task] = task_id
+
+    def visit_task(self, task: str, node: ast.Call) -> None:
+        keywords = _keywords(node)
+        name = _function_name(node.func)
+
+        if name in DATASET_FUNCTIONS:
+            self.datasets.update((task, uri) for uri in self._dataset_uris(node))
+            return
+
+        self.visit_task_id(task, _string(keywords.get("task_id")))
+
+        uris = self._dataset_uris(keywords.get("outlets"))
+        if uris:
+            self.links.outlets.setdefault(task, []).extend(uris)
+
+        if name in SENSOR_FUNCTIONS:
+            external_dag_id = _string(keywords.get("external_dag_id"))
+            if external_dag_id is None:
+                return
+            external_task_ids = [_string(keywords.get("external_task_id"))]
+            if isinstance(keywords.get("external_task_ids"), (ast.List, ast.Tuple)):
+                external_task_ids = [
+                    _string(element) for element in keywords["external_task_ids"].elts
+                ]
+            self.links.sensors.setdefault(task, []).extend(
+                (external_dag_id, external_task_id) for external_task_id in external_task_ids
+            )
+
+    def visit(self, tree: ast.AST) -> None:
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Assign) and isinstance(node.value, ast.Call):
+                for target in node.targets:
+                    if isinstance(target, ast.Name):
+                        self.visit_task(target.id, node.value)
+            if isinstance(node, ast.Call) and _function_name(node.func) in DAG_FUNCTIONS:
+                self.visit_dag(node)
+
+
+def extract_cross_dag_links(source: Iterable[str], default_dag_id: str) -> CrossDAGLinks:
+    """
+    Extract the cross-DAG links of a DAG module, given as text or an iterable of lines.
+    Only logical lines mentioning a DAG, sensor, dataset or task ID are parsed, and the
+    first DAG ID found names the DAG ('default_dag_id' otherwise, e.g. the file name).
+    """
+    if isinstance(source, str):
+        source = source.splitlines(keepends=True)
+
+    extractor = CrossDAGLinkExtractor(default_dag_id)
+    for statement in iter_logical_lines(source):
+        if not CROSS_DAG_MARKER_PATTERN.search(statement):
+            continue
+
+        statement = statement.strip()
+        if not LINK_MARKER_PATTERN.search(statement):
+            match = PLAIN_TASK_PATTERN.match(statement)
+            if match is not None:
+                extractor.visit_task_id(match.group("task"), match.group("task_id"))
+                continue
+
+        if statement.startswith("@"):
+            statement = statement[1:]  # ie. '@dag(dag_id="sales")' decorator
+        try:
+            tree = _parse_statement(statement)
+        except RecursionError:
+            tree = None  # nested deeper than the Python parser allows
+        if tree is not None:
+            extractor.visit(tree)
+
+    return extractor.links
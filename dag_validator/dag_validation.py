@@ -1,17 +1,143 @@
+import os
 import re
-from pathlib import Path
-from typing import Callable, Dict, List, Tuple, Optional, Union
+from concurrent.futures import FIRST_COMPLETED, wait
+from fnmatch import fnmatch
+from functools import partial
+from itertools import chain, islice
+from pathlib import Path, PurePosixPath
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Tuple, Optional, Union
+
+from dag_validator.cache import DEFAULT_CACHE_MAX_BYTES, ValidationCache
+from dag_validator.cross_dag import CrossDAGLinks, extract_cross_dag_links
+from dag_validator.dependency_extractor import (
+    DEPENDENCY_MARKER_BYTES_PATTERN,
+    extract_dependencies,
+    has_dependency_markers,
+    map_file,
+)
+from dag_validator.dependency_graph import DependencyGraph
+from dag_validator.global_graph import GlobalDependencyGraph
+from dag_validator.instrumentation import ValidationMetrics
+from dag_validator.lineage import LineageEngine
+from dag_validator.lineage_index import DEFAULT_QUERY_CACHE_SIZE, LineageIndex
+from dag_validator.loader import ConcurrentFileLoader, DAGFileReader
+from dag_validator.rules import Rule, RuleEngine, RuleResults
+from dag_validator.sharding import PartialResult, select_shard
+from dag_validator.snapshot import Snapshot, SnapshotDiff
+
+
+# Lines with a '>>' dependency and the inner models of a '[a, b]' list
+DEPENDENCY_LINE_PATTERN = re.compile(r"\s*.*>>.*")
+LIST_PATTERN = re.compile(r"\[([^\]]+)\]")
+
+# Folders with fewer DAG files than this are validated serially even when
+# parallel mode is enabled, as the process pool start-up would dominate
+PARALLEL_MIN_FILES = 32
+
+# DAG files are discovered recursively, matching patterns against the file or directory
+# name, or the path relative to the DAG folder (e.g. 'marketing/*_dag.py')
+DEFAULT_INCLUDE_PATTERNS = ("*.py",)
+DEFAULT_EXCLUDE_PATTERNS = ("__pycache__", ".*", "tests", "test_*.py", "*_test.py")
+
+# Name of the repository-wide graph in the instrumentation of global lineage mode
+GLOBAL_DAG = "<global>"
+
+
+class DAGFileResult(NamedTuple):
+    """
+    Results of one DAG file, 'results' and 'layer_dependencies' are None if it failed.
+    """
+
+    dag_name: str
+    results: Optional[Dict[str, List[str]]]
+    layer_dependencies: Optional[Dict[str, Dict[str, set]]]
+    error: Optional[str] = None
 
 
 class AirflowDAGValidation:
-    def __init__(self, dag_folder_path: str):
+    def __init__(
+        self,
+        dag_folder_path: str,
+        parallel: bool = False,
+        max_workers: Optional[int] = None,
+        cache_dir: Optional[str] = None,
+        cache_max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+        upstream_layer_mapping: Optional[Dict[str, str]] = None,
+        metrics: Optional[ValidationMetrics] = None,
+        quiet: bool = False,
+        recursive: bool = True,
+        include: Optional[Tuple[str, ...]] = None,
+        exclude: Optional[Tuple[str, ...]] = None,
+        global_lineage: bool = False,
+        io_workers: int = 0,
+        reader: Optional[DAGFileReader] = None,
+        shard: Optional[Tuple[int, int]] = None,
+        shard_strategy: str = "hash",
+    ):
         self.dag_folder_path = Path(dag_folder_path)
+        self.recursive = recursive
+        self.include = tuple(include) if include is not None else DEFAULT_INCLUDE_PATTERNS
+        self.exclude = tuple(exclude) if exclude is not None else DEFAULT_EXCLUDE_PATTERNS
+        self.global_lineage = global_lineage
+        if shard is not None and global_lineage:
+            raise ValueError("Global lineage links every DAG file, it cannot be sharded")
+        self.shard = shard
+        self.shard_strategy = shard_strategy
+        self.io_workers = io_workers
+        self.reader = reader
+        self.parallel = parallel
+        self.max_workers = max_workers
+        self.cache = ValidationCache(cache_dir, cache_max_bytes) if cache_dir else None
+        self.file_errors: Dict[str, str] = {}
+        self.metrics = metrics if metrics is not None else ValidationMetrics()
+        self.quiet = quiet
+        self.lineage_engine = LineageEngine(upstream_layer_mapping)
+
+        # One layer function per entry of the layer mapping (e.g. 'staging_to_source')
         self.layer_functions = {
-            "staging_to_source": self.generate_staging_to_source_upstream_dependencies,
-            "landing_to_staging": self.generate_landing_to_staging_upstream_dependencies,
-            # Add more layers and functions as needed
+            f"{layer}_to_{upstream_layer}": partial(
+                self.generate_upstream_layer_dependencies, layer=layer
+            )
+            for layer, upstream_layer in self.lineage_engine.upstream_layer_mapping.items()
+            # Add more layers through 'upstream_layer_mapping' or here as needed
         }
 
+    def _split_dependency_part(self, part: str) -> List[str]:
+        """
+        Split one side of a '>>' into its models
+        # i.e.
+        'a' -> ['a']
+        '[a, b]' -> ['a', 'b']
+        """
+        if "[" not in part:
+            return [part]
+
+        inner_parts = LIST_PATTERN.findall(part)
+        if not inner_parts:
+            return []
+        return [inner_part.strip() for inner_part in inner_parts[0].split(",")]
+
+    def iter_dependency_edges(self, dep: str) -> Iterator[Tuple[str, str]]:
+        """
+        Generate (upstream, downstream) edges based on the conditions
+        # i.e.
+        Input: a >> [b, c] >> e
+        Expected Output:
+        (a, b)
+        (a, c)
+        (b, e)
+        (c, e)
+        """
+        # Split the string by ' >> '
+        parts = [s.strip() for s in dep.split(">>")]
+
+        for current_part, next_part in zip(parts, parts[1:]):
+            # ie. a >> b, a >> [b, c], [a, b] >> c, [a, b] >> [c, d]
+            next_models = self._split_dependency_part(next_part)
+            for current_model in self._split_dependency_part(current_part):
+                for next_model in next_models:
+                    yield current_model, next_model
+
     def parse_all_dependencies(self, dep):
         """
         Generate dependencies based on the conditions
@@ -23,372 +149,578 @@ class AirflowDAGValidation:
         b >> e
         c >> e
         """
-        # Split the string by ' >> '
-        parts = [s.strip() for s in dep.split(">>")]
+        return [
+            f"\n    {upstream} >> {downstream}"
+            for upstream, downstream in self.iter_dependency_edges(dep)
+        ]
+
+    def _report(self, *values) -> None:
+        if not self.quiet:
+            print(*values)
+
+    def parse_dag_source(
+        self, dag_string: Union[str, Iterable[str]], dag: str = "<string>"
+    ) -> DependencyGraph:
+        """
+        Parse the dependencies of a DAG file once into a graph shared by all layers.
+        'dag_string' is the DAG source or an iterable of its lines (e.g. an open file).
+        """
+        # Edges and list-to-list groups, in declaration order
+        declarations = []
+        with self.metrics.phase(dag, "parse"):
+            extract_dependencies(
+                dag_string,
+                emit=lambda upstream, downstream: declarations.append((upstream, downstream)),
+                fallback=self._iter_regex_dependency_edges,
+                emit_group=lambda upstream_models, downstream_models: declarations.append(
+                    (upstream_models, downstream_models)
+                ),
+            )
 
-        # List to store generated dependencies
-        dependencies = []
-
-        for i in range(len(parts) - 1):
-            current_part = parts[i].strip()
-            next_part = parts[i + 1].strip()
-
-            # Check if either part is a list
-            is_current_list = "[" in current_part
-            is_next_list = "[" in next_part
-
-            # ie. a >> [b, c]
-            if not is_current_list and is_next_list:
-                base_dependency = current_part.strip()
-                inner_parts = re.findall(r"\[([^\]]+)\]", next_part)
-
-                if inner_parts:
-                    inner_parts = [
-                        inner_part.strip() for inner_part in inner_parts[0].split(",")
-                    ]
-                    final_dependency = next_part
-
-                    dependencies.extend(
-                        [
-                            f"\n    {base_dependency} >> {inner_part}"
-                            for inner_part in inner_parts
-                        ]
-                    )
-
-            # ie. a >> b
-            elif not is_current_list and not is_next_list:
-                dependencies.append(f"\n    {current_part} >> {next_part}")
-
-            # ie. [a, b] >> [c, d]
-            elif is_current_list and is_next_list:
-                current_inner_parts = re.findall(r"\[([^\]]+)\]", current_part)
-                next_inner_parts = re.findall(r"\[([^\]]+)\]", next_part)
-                if current_inner_parts and next_inner_parts:
-                    current_inner_parts = [
-                        inner_part.strip()
-                        for inner_part in current_inner_parts[0].split(",")
-                    ]
-                    next_inner_parts = [
-                        inner_part.strip()
-                        for inner_part in next_inner_parts[0].split(",")
-                    ]
-
-                    dependencies.extend(
-                        [
-                            f"\n    {current_inner} >> {next_inner}"
-                            for current_inner in current_inner_parts
-                            for next_inner in next_inner_parts
-                        ]
-                    )
-
-            # ie. [a, b] >> c
-            elif is_current_list and not is_next_list:
-                current_inner_parts = re.findall(r"\[([^\]]+)\]", current_part)
-                if current_inner_parts:
-                    current_inner_parts = [
-                        inner_part.strip()
-                        for inner_part in current_inner_parts[0].split(",")
-                    ]
-                    final_dependency = next_part
-
-                    dependencies.extend(
-                        [
-                            f"\n    {current_inner} >> {final_dependency}"
-                            for current_inner in current_inner_parts
-                        ]
-                    )
-
-        return dependencies
+        with self.metrics.phase(dag, "expand"):
+            graph = DependencyGraph()
+            for upstream, downstream in declarations:
+                if isinstance(upstream, str):
+                    graph.add_edge(upstream, downstream)
+                else:
+                    graph.add_bipartite_edges(upstream, downstream)
 
-    def filter_dag_dependencies_from_file(self, file_path: str) -> str:
-        try:
-            with open(file_path, "r") as file:
-                dag_string = file.read()
+        self.metrics.increment("files")
+        self.metrics.increment("nodes", len(graph))
+        self.metrics.increment("edges", graph.edge_count)
+        return graph
+
+    def _iter_regex_dependency_edges(self, dag_string: str) -> Iterator[Tuple[str, str]]:
+        for match in DEPENDENCY_LINE_PATTERN.finditer(dag_string):
+            yield from self.iter_dependency_edges(match.group())
 
-            # Define a regular expression pattern to match lines with '>>'
-            pattern = re.compile(r"\s*.*>>.*")
+    def parse_dag_source_with_regex(self, dag_string: str) -> DependencyGraph:
+        """
+        Parse the dependencies of a DAG file with the legacy line-based regex parser.
+        """
+        return DependencyGraph.from_edges(self._iter_regex_dependency_edges(dag_string))
 
-            # Use the findall method to extract all matching lines
-            dependencies = pattern.findall(dag_string)
+    def parse_dag_file(self, file_path: Union[str, Path]) -> DependencyGraph:
+        """
+        Parse a DAG file, skipping files without any dependency marker after a byte scan and
+        streaming the others line by line, so memory follows the longest statement.
+        """
+        dag = self.dag_name(file_path)
+        with self.metrics.phase(dag, "read"):
+            has_markers = has_dependency_markers(file_path)
 
-            # List to store modified dependencies
-            modified_dependencies = []
+        if not has_markers:
+            self.metrics.increment("skipped_files")
+            return self.parse_dag_source("", dag)
+        with open(file_path, "r") as file:
+            return self.parse_dag_source(file, dag)
 
-            for dep in dependencies:
-                modified_dependencies.extend(self.parse_all_dependencies(dep))
+    def parse_dag_content(self, content: bytes, dag: str = "<bytes>") -> DependencyGraph:
+        """
+        Parse the raw content of a DAG file already loaded by a reader, skipping it
+        without decoding when it has no dependency marker.
+        """
+        if DEPENDENCY_MARKER_BYTES_PATTERN.search(content) is None:
+            self.metrics.increment("skipped_files")
+            return self.parse_dag_source("", dag)
+        return self.parse_dag_source(content.decode(), dag)
 
-            # Join the matching lines into a single string
-            result_string = "".join(modified_dependencies)
-            return result_string
+    def filter_dag_dependencies_from_file(self, file_path: str) -> str:
+        try:
+            graph = self.parse_dag_file(file_path)
         except FileNotFoundError:
             return f"Error: File not found - {file_path}"
 
-    def _extract_dependencies_by_regex(
-        self, dependencies: str, regex_pattern: re.Pattern
-    ) -> List[str]:
-        dependencies = regex_pattern.findall(dependencies)
-        stripped_dependencies = [string.strip() for string in dependencies]
-        return stripped_dependencies
-
-    def _extract_source_dependencies(self, dependencies: str) -> List[str]:
-        regex_pattern = re.compile(r"^\s*(?:source_)\S*.*$", re.MULTILINE)
-        stripped_dependencies = self._extract_dependencies_by_regex(
-            dependencies, regex_pattern
+        # Join the dependencies into a single string
+        return "".join(
+            f"\n    {upstream} >> {downstream}"
+            for upstream, downstream in graph.expanded_edges()
         )
-        return stripped_dependencies
 
-    def _extract_staging_dependencies(self, dependencies: str) -> List[str]:
-        regex_pattern = re.compile(r"^.*>>\s*staging_\S+.*$", re.MULTILINE)
-        stripped_dependencies = self._extract_dependencies_by_regex(
-            dependencies, regex_pattern
-        )
-        stripped_dependencies = self._extract_dependencies_by_regex(
-            dependencies, regex_pattern
-        )
-        return stripped_dependencies
+    def generate_upstream_layer_dependencies(
+        self, dependencies: Union[str, DependencyGraph], layer: str
+    ) -> Dict[str, set]:
+        """
+        Create a dictionary with upstream dependencies from 'layer' to its expected upstream layer
+        """
+        if isinstance(dependencies, str):
+            dependencies = DependencyGraph.from_dependency_string(dependencies)
 
-    def _extract_landing_dependencies(self, dependencies: str) -> List[str]:
-        regex_pattern = re.compile(r"^.*>>\s*landing_\S+.*$", re.MULTILINE)
-        stripped_dependencies = self._extract_dependencies_by_regex(
-            dependencies, regex_pattern
-        )
-        stripped_dependencies = self._extract_dependencies_by_regex(
-            dependencies, regex_pattern
-        )
-        return stripped_dependencies
+        # All mapped layers of a DAG are resolved together in one sweep and cached
+        layer_map = self.lineage_engine.resolve(dependencies)[layer]
+        self._report(layer_map)
+        return layer_map
 
-    def _get_upstream_model(self, model: str, separator: str = " >> ") -> str:
-        return model.split(separator)[-2]
+    def generate_staging_to_source_upstream_dependencies(
+        self, dependencies: Union[str, DependencyGraph]
+    ) -> Dict[str, set]:
+        """
+        Create a dictionary with upstream dependencies from 'staging' to 'source'
+        """
+        return self.generate_upstream_layer_dependencies(dependencies, "staging")
 
-    def _get_downstream_model(self, model: str, separator: str = " >> ") -> str:
-        return model.split(separator)[-1]
+    def generate_landing_to_staging_upstream_dependencies(
+        self, dependencies: Union[str, DependencyGraph]
+    ) -> Dict[str, set]:
+        """
+        Create a dictionary with upstream dependencies from 'landing' to 'staging'
+        """
+        return self.generate_upstream_layer_dependencies(dependencies, "landing")
 
-    def _join_parts(self, parts: List[str], separator: str = "_") -> str:
-        return separator.join(parts)
+    def find_orphaned_models(self, input_dict: Dict[str, set]) -> List[str]:
+        orphaned_keys = [key for key, value in input_dict.items() if not value]
+        return orphaned_keys
 
-    def _recursive_result_processing(
-        self,
-        base_model: str,
-        dependency: str,
-        layer_dependencies_map: Dict[str, List[str]],
-        map_dict: Dict[str, set],
-        from_layer: str,
-        to_layer: str,
-        output_layer: str,
-    ) -> None:
-
-        mapped_layer_dependencies = layer_dependencies_map[from_layer]
-        result = list(
-            filter(lambda x: x.endswith(f">> {dependency}"), mapped_layer_dependencies)
+    def dag_name(self, dag_path: Union[str, Path]) -> str:
+        """
+        Return the name of a DAG file in the results, its path relative to the DAG folder
+        # i.e.
+        'dags/example_dag.py' -> 'example_dag.py'
+        'dags/marketing/daily_dag.py' -> 'marketing/daily_dag.py'
+        '/repo/dags/marketing/daily_dag.py' -> 'marketing/daily_dag.py'
+        """
+        dag_path = Path(dag_path)
+        try:
+            return dag_path.relative_to(self.dag_folder_path).as_posix()
+        except ValueError:
+            pass
+        # e.g. an absolute file name with a relative DAG folder, as pre-commit may pass
+        try:
+            return dag_path.resolve().relative_to(self.dag_folder_path.resolve()).as_posix()
+        except ValueError:
+            return dag_path.name
+
+    def _matches(self, relative_path: PurePosixPath, patterns: Tuple[str, ...]) -> bool:
+        # Patterns match either the file or directory name, or the whole relative path
+        return any(
+            fnmatch(relative_path.name, pattern) or fnmatch(str(relative_path), pattern)
+            for pattern in patterns
         )
 
-        for upstream in result:
-            while True:
-                model_upstream = self._get_upstream_model(upstream)
-                model_downstream = self._get_downstream_model(upstream)
-
-                model_upstream_split = model_upstream.split("_")
-                model_downstream_split = model_downstream.split("_")
-
-                if model_upstream_split[0] == to_layer:
-
-                    # 'output_layer': This is used to specify the layer you want to output
-                    # as value in the dependency dictionary. Either upstream or downstream
-                    # (e.g. raw_aln_dbo_c_udkey_18 >> cur_aln_dbo_c_udkey_18)
-                    # In the vault-to-curated mapping, output cur_aln_dbo_c_udkey_18
-                    # In the curated-to-raw mapping, output raw_aln_dbo_c_udkey_18
-                    if model_upstream_split[0] == output_layer:
-                        self._update_map_dict(map_dict, base_model, model_upstream)
-                    elif model_downstream_split[0] == output_layer:
-                        self._update_map_dict(map_dict, base_model, model_downstream)
-                    break  # Exit the while loop when 'raw' is found
+    def is_dag_file(self, dag_path: Union[str, Path]) -> bool:
+        """
+        Return whether discovery would yield this file, without walking the folder
+        # i.e.
+        'dags/marketing/daily_dag.py' -> True
+        'dags/tests/test_daily_dag.py', 'scripts/deploy.py' -> False
+        """
+        dag_path = Path(dag_path)
+        try:
+            relative_path = PurePosixPath(
+                dag_path.resolve().relative_to(self.dag_folder_path.resolve()).as_posix()
+            )
+        except ValueError:
+            return False  # outside the DAG folder
+
+        parents = list(reversed(relative_path.parents))[1:]
+        if not self.recursive and parents:
+            return False
+        return (
+            dag_path.is_file()
+            and not any(self._matches(parent, self.exclude) for parent in parents)
+            and self._matches(relative_path, self.include)
+            and not self._matches(relative_path, self.exclude)
+        )
 
-                model_upstream_parts = model_upstream.split("_")
+    def iter_dag_files(self) -> Iterator[Path]:
+        """
+        Discover the DAG files of the folder one directory at a time, in sorted order.
+        Excluded directories (e.g. '__pycache__', 'tests') are not descended into.
+        With a shard (i, N), only the files assigned to that shard are yielded.
+        """
+        dag_files = self._discover_dag_files()
+        if self.shard is None:
+            return dag_files
+        return select_shard(dag_files, self.dag_name, self.shard, self.shard_strategy)
+
+    def _discover_dag_files(self) -> Iterator[Path]:
+        for directory, dirnames, filenames in os.walk(self.dag_folder_path):
+            relative_directory = PurePosixPath(
+                Path(directory).relative_to(self.dag_folder_path).as_posix()
+            )
+            if self.recursive:
+                dirnames[:] = sorted(
+                    dirname
+                    for dirname in dirnames
+                    if not self._matches(relative_directory / dirname, self.exclude)
+                )
+            else:
+                dirnames[:] = []
 
-                next_from_layer = "_".join(model_upstream_parts[:2])
+            for filename in sorted(filenames):
+                relative_path = relative_directory / filename
+                if self._matches(relative_path, self.include) and not self._matches(
+                    relative_path, self.exclude
+                ):
+                    yield Path(directory, filename)
 
-                self._recursive_result_processing(
-                    base_model,
-                    model_upstream,
-                    layer_dependencies_map,
-                    map_dict,
-                    next_from_layer,
-                    to_layer,
-                    output_layer,
-                )  # Recursive call
+    def iter_dag_results(self) -> Iterator[DAGFileResult]:
+        """
+        Validate the DAG files of the folder, yielding each file's results as soon as it
+        completes. Files are discovered lazily, so memory stays flat whatever the folder size.
 
-                break  # Break the while loop as the recursive call handles further processing
+        Serially, the first failing file raises. In the process pool, per-file errors are
+        yielded in 'error' and collected in 'self.file_errors' instead of stopping the pool.
+        """
+        self.file_errors = {}
+        dag_files = self.iter_dag_files()
+
+        # Look ahead just far enough to know whether the folder is worth a process pool
+        first_dag_files = list(islice(dag_files, PARALLEL_MIN_FILES))
+        if not first_dag_files and self.shard is not None:
+            return  # more shards than DAG files
+        if not first_dag_files:
+            raise ValueError(
+                f"{self.dag_folder_path} is empty. There is no valid DAG to validate."
+            )
+        dag_files = chain(first_dag_files, dag_files)
+
+        if self._use_process_pool(len(first_dag_files)):
+            yield from self._process_dag_files_in_pool(dag_files)
+        elif self.io_workers or self.reader is not None:
+            # Overlap file reads on a thread pool, parsing each file as soon as it arrives
+            loader = ConcurrentFileLoader(self.reader, max_workers=self.io_workers)
+            for dag_path, content in loader.load(dag_files):
+                yield DAGFileResult(*self._process_dag_file(dag_path, content))
+        else:
+            for dag_path in dag_files:
+                yield DAGFileResult(*self._process_dag_file(dag_path))
+
+        if self.cache is not None:
+            self.cache.prune()
 
-    def generate_staging_to_source_upstream_dependencies(self, dependencies: str) -> Dict[str, set]:
+    def process_dag_folder(
+        self,
+    ) -> Tuple[Dict[str, Dict[str, List[str]]], Dict[str, Dict[str, set]]]:
         """
-        Create a dictionary with upstream dependencies from 'staging' to 'source'
+        Process all DAG files in a folder for different layers.
         """
-        stripped_staging_dependencies = self._extract_staging_dependencies(dependencies)
+        if self.global_lineage:
+            return self.process_global_graph(self.build_global_graph())
 
-        LAYER_DEPENDENCIES_MAP = {
-            "staging": stripped_staging_dependencies,
-        }
+        results, layer_dependencies = self._merge_dag_results(self.iter_dag_results())
 
-        STAGING_SOURCE_MAP = {}
-        filtered_staging_dependencies = [
-            item for item in stripped_staging_dependencies if ">> staging_" in item
-        ]  # only include 'staging_*' model as base model
-        for model in filtered_staging_dependencies:
-            model_staging = self._get_downstream_model(model)
-            STAGING_SOURCE_MAP[model_staging] = set()
-
-            # Create a list of all upstream dependencies
-            result = list(
-                filter(
-                    lambda x: x.endswith(f">> {model_staging}"),
-                    stripped_staging_dependencies,
-                )
+        if self.file_errors:
+            errors = "\n".join(
+                f"- {dag_name}: {error}" for dag_name, error in sorted(self.file_errors.items())
+            )
+            raise ValueError(
+                f"{len(self.file_errors)} DAG file(s) failed validation:\n{errors}"
             )
 
-            # Check if result is empty, raise 'no upstream task' error
-            if len(result) == 0:
-                raise ValueError(
-                    f"There is no upstream task found for '{model_staging}'. Please review DAG dependencies."
-                )
-
-            # Update the dictionary key (curated model) with the corresponding raw model
-            for upstream in result:
-                model_upstream = self._get_upstream_model(upstream)
-                model_upstream_split = model_upstream.split("_")
-
-                if (
-                    model_upstream_split[0] == "source"
-                ):  # (e.g. 'source_task_a1 >> staging_task_a2')
-                    self._update_map_dict(
-                        STAGING_SOURCE_MAP, model_staging, model_upstream
-                    )
-
-                # e.g. 'staging_task_b3 >> staging_task_b4'
-                else:
-                    self._recursive_result_processing(
-                        model_staging,
-                        model_upstream,
-                        LAYER_DEPENDENCIES_MAP,
-                        STAGING_SOURCE_MAP,
-                        from_layer="staging",
-                        to_layer="source",
-                        output_layer="source",
-                    )
+        return results, layer_dependencies
 
-        print(STAGING_SOURCE_MAP)
-        return STAGING_SOURCE_MAP
+    def _merge_dag_results(
+        self, dag_results: Iterable[DAGFileResult]
+    ) -> Tuple[Dict[str, Dict[str, List[str]]], Dict[str, Dict[str, set]]]:
+        # Dictionary to store orphaned model (if any) and dependencies for each DAG and layer
+        results = {layer: {} for layer in self.layer_functions.keys()}
+        layer_dependencies = {layer: {} for layer in self.layer_functions.keys()}
 
+        # Merge per-file results in DAG name order, whichever order they completed in
+        for dag_result in sorted(dag_results):
+            if dag_result.error is not None:
+                continue
+            for layer in self.layer_functions.keys():
+                results[layer][dag_result.dag_name] = dag_result.results[layer]
+                layer_dependencies[layer][dag_result.dag_name] = (
+                    dag_result.layer_dependencies[layer]
+                )
+        return results, layer_dependencies
 
-    def generate_landing_to_staging_upstream_dependencies(self, dependencies: str) -> Dict[str, set]:
+    def write_partial_result(self, path: Union[str, Path]) -> PartialResult:
         """
-        Create a dictionary with upstream dependencies from 'landing' to 'staging'
+        Validate the DAG files of this validator's shard and write them as a partial result,
+        to be combined with the other shards by 'merge_partial_results'. Files failing in
+        the process pool are recorded in the partial result and reported by the merge.
         """
-        stripped_landing_dependencies = self._extract_landing_dependencies(dependencies)
+        results, layer_dependencies = self._merge_dag_results(self.iter_dag_results())
+        partial_result = PartialResult(
+            self.shard or (1, 1),
+            self.lineage_engine.upstream_layer_mapping,
+            results,
+            layer_dependencies,
+            self.file_errors,
+        )
+        partial_result.write(path)
+        return partial_result
 
-        LAYER_DEPENDENCIES_MAP = {
-            "landing": stripped_landing_dependencies,
-        }
+    def evaluate_rules(self, rules: Optional[List[Rule]] = None) -> Dict[str, RuleResults]:
+        """
+        Evaluate rules (the orphan and upstream prefix checks by default) over every DAG
+        file, parsing each file once and sharing one graph traversal between all rules.
+        Returns {dag: {layer: {rule: [messages]}}}, with clean DAG files mapped to {}.
+        """
+        rule_engine = RuleEngine(rules, self.lineage_engine.upstream_layer_mapping)
+        rule_results = {}
+        for dag_path in self.iter_dag_files():
+            dag = self.dag_name(dag_path)
+            graph = self.parse_dag_file(dag_path)
+            with self.metrics.phase(dag, "map"):
+                layer_maps = self.lineage_engine.resolve(graph)
+            with self.metrics.phase(dag, "rules"):
+                rule_results[dag] = rule_engine.evaluate(graph, layer_maps)
+            self._report(f"*** Rule results of {dag}: {rule_results[dag]}")
+        return rule_results
+
+    def parse_cross_dag_links(self, file_path: Union[str, Path]) -> CrossDAGLinks:
+        """
+        Parse the DAG ID, ExternalTaskSensor targets and datasets of a DAG file. Files
+        without a DAG ID are named after their path relative to the DAG folder.
+        # i.e.
+        'dags/sales.py' -> 'sales', 'dags/marketing/daily_dag.py' -> 'marketing.daily_dag'
+        """
+        dag = self.dag_name(file_path)
+        default_dag_id = PurePosixPath(dag).with_suffix("").as_posix().replace("/", ".")
+        with self.metrics.phase(dag, "links"):
+            with open(file_path, "r") as file:
+                return extract_cross_dag_links(file, default_dag_id=default_dag_id)
 
-        LANDING_STAGING_MAP = {}
-        filtered_landing_dependencies = [
-            item for item in stripped_landing_dependencies if ">> landing_" in item
-        ]  # only include 'landing_*' model as base model
-        for model in filtered_landing_dependencies:
-            model_landing = self._get_downstream_model(model)
-            LANDING_STAGING_MAP[model_landing] = set()
-
-            # Create a list of all upstream dependencies
-            result = list(
-                filter(
-                    lambda x: x.endswith(f">> {model_landing}"),
-                    stripped_landing_dependencies,
-                )
+    def build_global_graph(self) -> GlobalDependencyGraph:
+        """
+        Merge the graphs of all DAG files into one repository-wide graph.
+        """
+        global_graph = GlobalDependencyGraph()
+        for dag_path in self.iter_dag_files():
+            global_graph.update_file(
+                self.dag_name(dag_path),
+                self.parse_dag_file(dag_path),
+                self.parse_cross_dag_links(dag_path),
             )
 
-            # Check if result is empty, raise 'no upstream task' error
-            if len(result) == 0:
-                raise ValueError(
-                    f"There is no upstream task found for '{model_landing}'. Please review DAG dependencies."
-                )
+        if not global_graph.files:
+            raise ValueError(
+                f"{self.dag_folder_path} is empty. There is no valid DAG to validate."
+            )
+        return global_graph
 
-            # Update the dictionary key (curated model) with the corresponding raw model
-            for upstream in result:
-                model_upstream = self._get_upstream_model(upstream)
-                model_upstream_split = model_upstream.split("_")
+    def build_lineage_index(
+        self, cache_size: int = DEFAULT_QUERY_CACHE_SIZE
+    ) -> LineageIndex:
+        """
+        Index the lineage of every DAG file for upstream, downstream and path queries,
+        through the repository-wide graph so sensor and dataset links are followed.
+        """
+        global_graph = self.build_global_graph()
+        with self.metrics.phase(GLOBAL_DAG, "index"):
+            return LineageIndex(global_graph.graph, cache_size)
 
-                if (
-                    model_upstream_split[0] == "staging"
-                ):  # (e.g. 'staging_task_b3 >> landing_task_b4')
-                    self._update_map_dict(
-                        LANDING_STAGING_MAP, model_landing, model_upstream
-                    )
+    def process_global_graph(
+        self, global_graph: GlobalDependencyGraph
+    ) -> Tuple[Dict[str, Dict[str, List[str]]], Dict[str, Dict[str, set]]]:
+        """
+        Run every layer over the repository-wide graph, so models fed through an
+        ExternalTaskSensor or a Dataset by another DAG are not reported as orphaned.
+        Returns the same structure as the per-file 'process_dag_folder'.
+        """
+        results = {}
+        layer_dependencies = {}
+        for layer, layer_function in self.layer_functions.items():
+            self._report(f"\nValidating all DAGs: {layer}")
+            with self.metrics.phase(GLOBAL_DAG, "map"):
+                layer_dependencies[layer] = global_graph.layer_dependencies(layer_function)
+
+            with self.metrics.phase(GLOBAL_DAG, "orphans"):
+                results[layer] = {
+                    dag: self.find_orphaned_models(layer_map)
+                    for dag, layer_map in layer_dependencies[layer].items()
+                }
+            for dag, result in results[layer].items():
+                self._report(f"*** Orphaned Models found in {dag}: {result}")
 
-                # e.g. [landing_task_a3, landing_task_b5] >> landing_task_c1
-                else:
-                    self._recursive_result_processing(
-                        model_landing,
-                        model_upstream,
-                        LAYER_DEPENDENCIES_MAP,
-                        LANDING_STAGING_MAP,
-                        from_layer="landing",
-                        to_layer="staging",
-                        output_layer="staging",
-                    )
-
-        print(LANDING_STAGING_MAP)
-        return LANDING_STAGING_MAP
-
-    def _update_map_dict(
-        self, map_dict: Dict[str, set], base_model: str, model: str
-    ) -> None:
-        map_dict[base_model].add(model)
+        return results, layer_dependencies
 
-    def find_orphaned_models(self, input_dict: Dict[str, set]) -> List[str]:
-        orphaned_keys = [key for key, value in input_dict.items() if not value]
-        return orphaned_keys
+    def write_snapshot(
+        self,
+        snapshot_path: str,
+        layer_dependencies: Optional[Dict[str, Dict[str, Dict[str, set]]]] = None,
+    ) -> Snapshot:
+        """
+        Write the layer maps of every DAG to a compact binary baseline snapshot,
+        validating the folder first unless 'layer_dependencies' is given.
+        """
+        if layer_dependencies is None:
+            _, layer_dependencies = self.process_dag_folder()
+        snapshot = Snapshot.from_layer_dependencies(layer_dependencies)
+        snapshot.write(snapshot_path)
+        return snapshot
 
-    def process_dag_folder(
+    def diff_snapshot(
         self,
-    ) -> Tuple[Dict[str, Dict[str, List[str]]], Dict[str, Dict[str, set]]]:
+        snapshot_path: str,
+        layer_dependencies: Optional[Dict[str, Dict[str, Dict[str, set]]]] = None,
+    ) -> SnapshotDiff:
         """
-        Process all DAG files in a folder for different layers.
+        Compare the layer maps of every DAG against a baseline snapshot, reporting only
+        added or removed edges, new orphaned models and changed mappings.
         """
-        # Dictionary to store orphaned model (if any) and dependencies for each DAG and layer
-        results = {layer: {} for layer in self.layer_functions.keys()}
-        layer_dependencies = {layer: {} for layer in self.layer_functions.keys()}
+        if layer_dependencies is None:
+            _, layer_dependencies = self.process_dag_folder()
+        diff = Snapshot.from_layer_dependencies(layer_dependencies).diff(
+            Snapshot.read(snapshot_path)
+        )
+        if diff:
+            self._report(f"\n*** Changes against {snapshot_path}:\n{diff.format()}")
+        return diff
 
-        # Check if there are any .py files in the folder
-        py_files = list(self.dag_folder_path.glob("*.py"))
-        if not py_files:
-            raise ValueError(
-                f"{self.dag_folder_path} is empty. There is no valid DAG to validate."
+    def _use_process_pool(self, file_count: int) -> bool:
+        workers = self.max_workers or os.cpu_count() or 1
+        return self.parallel and workers > 1 and file_count >= PARALLEL_MIN_FILES
+
+    def _process_dag_files_in_pool(self, dag_files: Iterator[Path]) -> Iterator[DAGFileResult]:
+        """
+        Spread DAG files over a process pool, yielding results as they complete.
+        At most a few files per worker are in flight, so pending results stay bounded.
+        """
+        # Imported on first use, loading multiprocessing slows down short serial runs
+        from concurrent.futures import ProcessPoolExecutor
+
+        workers = self.max_workers or os.cpu_count()
+        in_flight = workers * 4
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            pending = {
+                executor.submit(self._process_dag_file_collecting_errors, dag_path)
+                for dag_path in islice(dag_files, in_flight)
+            }
+            try:
+                while pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for dag_path in islice(dag_files, len(done)):
+                        pending.add(
+                            executor.submit(self._process_dag_file_collecting_errors, dag_path)
+                        )
+
+                    for future in done:
+                        dag_result, metrics = future.result()
+                        self.metrics.merge(metrics)
+                        if dag_result.error is not None:
+                            self.file_errors[dag_result.dag_name] = dag_result.error
+                        yield dag_result
+            finally:
+                # The consumer stopped early, drop the files that have not started yet
+                for future in pending:
+                    future.cancel()
+
+    def _process_dag_file_collecting_errors(self, dag_path: Path):
+        # Runs in a pool worker, send this file's measurements back with its results
+        self.metrics = self.metrics.spawn()
+        try:
+            return DAGFileResult(*self._process_dag_file(dag_path)), self.metrics
+        except Exception as error:
+            error_message = f"{type(error).__name__}: {error}"
+            return DAGFileResult(self.dag_name(dag_path), None, None, error_message), self.metrics
+
+    def __getstate__(self) -> Dict:
+        # Pool workers start from empty measurements and errors, only the parent merges them
+        state = self.__dict__.copy()
+        state["metrics"] = self.metrics.spawn()
+        state["file_errors"] = {}
+        state["reader"] = None  # pool workers read their files directly
+        return state
+
+    def _process_dag_file(
+        self, dag_path: Path, content: Optional[bytes] = None
+    ) -> Tuple[str, Dict[str, List[str]], Dict[str, Dict[str, set]]]:
+        """
+        Process a single DAG file for all layers, served from the cache when unchanged.
+        'content' is the file already loaded by the reader, otherwise it is read here.
+        """
+        if self.cache is not None:
+            return self._process_dag_file_with_cache(dag_path, content)
+
+        graph = self._parse_dag_file_or_content(dag_path, content)
+        return (self.dag_name(dag_path), *self.process_dag_graph(dag_path, graph))
+
+    def _parse_dag_file_or_content(
+        self, dag_path: Path, content: Optional[bytes]
+    ) -> DependencyGraph:
+        if content is None:
+            return self.parse_dag_file(dag_path)
+        return self.parse_dag_content(content, self.dag_name(dag_path))
+
+    def _process_dag_file_with_cache(
+        self, dag_path: Path, content: Optional[bytes] = None
+    ) -> Tuple[str, Dict[str, List[str]], Dict[str, Dict[str, set]]]:
+        dag = self.dag_name(dag_path)
+        if content is not None:
+            key = self.cache.make_key(content, self._layer_signature())
+        else:
+            with self.metrics.phase(dag, "read"):
+                with open(dag_path, "rb") as file, map_file(file) as mapped_content:
+                    key = self.cache.make_key(mapped_content, self._layer_signature())
+
+        cached = self.cache.get(key)
+        if cached is not None:
+            self.metrics.increment("cache_hits")
+            _, file_layer_dependencies, file_result = cached
+            for layer, result in file_result.items():
+                self._report(f"\nValidating '{dag}': {layer} (cached)")
+                self._report(f"*** Orphaned Models found in {dag}: {result}")
+            return dag, file_result, file_layer_dependencies
+
+        self.metrics.increment("cache_misses")
+        graph = self._parse_dag_file_or_content(dag_path, content)
+        file_result, file_layer_dependencies = self.process_dag_graph(dag_path, graph)
+        self.cache.put(key, graph.edges(), file_layer_dependencies, file_result)
+        return dag, file_result, file_layer_dependencies
+
+    def _layer_signature(self) -> List[str]:
+        signature = [
+            f"{layer}:{self._describe_layer_function(layer_function)}"
+            for layer, layer_function in self.layer_functions.items()
+        ]
+        signature.extend(
+            f"{layer}>{upstream_layer}"
+            for layer, upstream_layer in self.lineage_engine.upstream_layer_mapping.items()
+        )
+        return signature
+
+    def _describe_layer_function(self, layer_function: Callable) -> str:
+        if isinstance(layer_function, partial):
+            return (
+                f"{self._describe_layer_function(layer_function.func)}"
+                f"{layer_function.args}{sorted(layer_function.keywords.items())}"
             )
+        return getattr(layer_function, "__qualname__", repr(layer_function))
 
-        for dag_path in py_files:
-            dag_name = dag_path.name
-            for layer, layer_function in self.layer_functions.items():
-                result, layer_map = self.process_single_dag(
-                    dag_path, layer, layer_function
-                )
-                results[layer][dag_name] = result
-                layer_dependencies[layer][dag_name] = layer_map
+    def process_dag_graph(
+        self, dag_path: Path, graph: DependencyGraph
+    ) -> Tuple[Dict[str, List[str]], Dict[str, Dict[str, set]]]:
+        """
+        Process the parsed graph of a single DAG file for all layers.
+        """
+        file_result = {}
+        file_layer_dependencies = {}
+        for layer, layer_function in self.layer_functions.items():
+            result, layer_map = self.process_single_dag(
+                dag_path, layer, layer_function, graph
+            )
+            file_result[layer] = result
+            file_layer_dependencies[layer] = layer_map
 
-        # print(results, layer_dependencies)
-        return results, layer_dependencies
+        return file_result, file_layer_dependencies
 
     def process_single_dag(
-        self, dag_path: Path, layer: str, layer_function: Callable
+        self,
+        dag_path: Path,
+        layer: str,
+        layer_function: Callable,
+        graph: Optional[DependencyGraph] = None,
     ) -> Tuple[List[str], Dict[str, set]]:
         """
         Process a single DAG file for a specific layer.
         """
-        dag = dag_path.name
-        print(f"\nValidating '{dag}': {layer}")
+        dag = self.dag_name(dag_path)
+        self._report(f"\nValidating '{dag}': {layer}")
 
-        all_dependencies = self.filter_dag_dependencies_from_file(dag_path)
-        layer_dependencies = layer_function(all_dependencies)
+        if graph is None:
+            graph = self.parse_dag_file(dag_path)
+        with self.metrics.phase(dag, "map"):
+            layer_dependencies = layer_function(graph)
 
-        result = self.find_orphaned_models(layer_dependencies)
-        print(f"*** Orphaned Models found in {dag}: {result}")
+        with self.metrics.phase(dag, "orphans"):
+            result = self.find_orphaned_models(layer_dependencies)
+        self._report(f"*** Orphaned Models found in {dag}: {result}")
 
         return result, layer_dependencies
@@ -0,0 +1,441 @@
+import ast
+import mmap
+import os
+import re
+from contextlib import contextmanager
+from typing import (
+    BinaryIO,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+
+Edge = Tuple[str, str]
+# Every upstream model of a group feeds every downstream model, i.e. '[a, b] >> [c, d]'
+EdgeGroup = Tuple[List[str], List[str]]
+
+# Logical lines mentioning any of these are parsed, all other statements are skipped
+DEPENDENCY_MARKER_PATTERN = re.compile(
+    r">>|<<|set_downstream|set_upstream|chain|cross_downstream"
+)
+# Same markers for scanning raw file bytes without decoding them
+DEPENDENCY_MARKER_BYTES_PATTERN = re.compile(DEPENDENCY_MARKER_PATTERN.pattern.encode())
+
+# Plain 'a >> [b, c] << d' chains are split without building an AST
+SHIFT_OPERATOR_PATTERN = re.compile(r"(>>|<<)")
+SIMPLE_OPERAND_PATTERN = re.compile(
+    r"\s*(?:(?P<name>[A-Za-z_][\w.]*)|\[(?P<list>[\w.\s,]*)\])\s*"
+)
+NAME_PATTERN = re.compile(r"[A-Za-z_][\w.]*")
+
+# Characters that may open or close a bracket, string, comment or line continuation
+SPECIAL_CHARACTER_PATTERN = re.compile(r"""['"#()\[\]{}\\]""")
+LEXICAL_TOKEN_PATTERN = re.compile(
+    r"""(?P<triple>""\"|''')"""
+    r"""|(?P<string>"[^"\\\n]*(?:\\.[^"\\\n]*)*"|'[^'\\\n]*(?:\\.[^'\\\n]*)*')"""
+    r"""|(?P<comment>\#.*)"""
+    r"""|(?P<open>[\[({])"""
+    r"""|(?P<close>[\])}])"""
+)
+STRING_OR_COMMENT_PATTERN = re.compile(
+    r"""(?:"[^"\\\n]*(?:\\.[^"\\\n]*)*"|'[^'\\\n]*(?:\\.[^'\\\n]*)*')|\#.*"""
+)
+TRIPLE_QUOTE_END_PATTERNS = {
+    '"""': re.compile(r'''(?:[^"\\]|\\.|"(?!""))*"""''', re.DOTALL),
+    "'''": re.compile(r"""(?:[^'\\]|\\.|'(?!''))*'''""", re.DOTALL),
+}
+
+# Functions from 'airflow.models.baseoperator' that declare dependencies
+CHAIN_FUNCTIONS = {"chain", "chain_linear"}
+CROSS_DOWNSTREAM_FUNCTIONS = {"cross_downstream"}
+SHIFT_OPERATORS = (ast.RShift, ast.LShift)
+# Modules the dependency functions are imported from, other 'chain' functions (e.g.
+# 'itertools.chain') are ordinary calls
+AIRFLOW_HELPER_MODULES = {"airflow.models.baseoperator", "airflow.utils.helpers"}
+# Airflow imports are parsed even without a dependency marker, i.e.
+# 'from airflow.models import baseoperator' before 'baseoperator.chain(a, b)'
+AIRFLOW_IMPORT_PATTERN = re.compile(r"\s*(?:from|import)\s+airflow\b")
+
+
+def _function_name(node: ast.expr) -> str:
+    # ie. 'DAG(...)' or 'models.DAG(...)'
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        return node.attr
+    return ""
+
+
+class DependencyExtractor(ast.NodeVisitor):
+    """
+    Single pass over a DAG module AST, emitting every (upstream, downstream) edge.
+
+    Supported declarations:
+    a >> b, a << b, a >> [b, c] >> d (also split over several lines)
+    a.set_downstream(b), a.set_upstream(b)
+    chain(a, [b, c], d), cross_downstream([a, b], [c, d])
+
+    List-to-list groups are passed whole to 'emit_group' if given, instead of one
+    'emit' call per pair. Dependency functions only count once imported from Airflow
+    ('from airflow.models.baseoperator import chain', or 'baseoperator.chain(...)'),
+    so imports must be visited before the statements using them.
+    """
+
+    def __init__(
+        self,
+        emit: Callable[[str, str], None],
+        emit_group: Optional[Callable[[List[str], List[str]], None]] = None,
+    ):
+        self.emit = emit
+        self.emit_group = emit_group
+        # Local name -> Airflow dependency function, i.e. {'chain': 'chain'}
+        self.helper_functions: Dict[str, str] = {}
+        # Local names of the Airflow helper modules, i.e. {'baseoperator'}
+        self.helper_modules: Set[str] = set()
+
+    def visit_Import(self, node: ast.Import) -> None:
+        for alias in node.names:
+            if alias.name in AIRFLOW_HELPER_MODULES:
+                self.helper_modules.add(alias.asname or alias.name)
+
+    def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
+        for alias in node.names:
+            local_name = alias.asname or alias.name
+            if node.module in AIRFLOW_HELPER_MODULES and (
+                alias.name in CHAIN_FUNCTIONS | CROSS_DOWNSTREAM_FUNCTIONS
+            ):
+                self.helper_functions[local_name] = alias.name
+            elif f"{node.module}.{alias.name}" in AIRFLOW_HELPER_MODULES:
+                self.helper_modules.add(local_name)
+            else:
+                # i.e. 'from itertools import chain' shadows an earlier Airflow import
+                self.helper_functions.pop(local_name, None)
+
+    def _helper_function(self, node: ast.expr) -> str:
+        # ie. 'chain(...)' or 'baseoperator.chain(...)', once imported from Airflow
+        if isinstance(node, ast.Name):
+            return self.helper_functions.get(node.id, "")
+        if isinstance(node, ast.Attribute) and ast.unparse(node.value) in self.helper_modules:
+            return node.attr
+        return ""
+
+    def _emit_all(self, upstream_models: List[str], downstream_models: List[str]) -> None:
+        if self.emit_group is not None:
+            self.emit_group(upstream_models, downstream_models)
+            return
+        for upstream in upstream_models:
+            for downstream in downstream_models:
+                self.emit(upstream, downstream)
+
+    def _models(self, node: ast.expr) -> List[str]:
+        """
+        Return the models an expression evaluates to, emitting any nested dependencies
+        # i.e.
+        'a' -> ['a']
+        '[a, b]' -> ['a', 'b']
+        'a >> b' -> ['b'] (emits a >> b)
+        """
+        if isinstance(node, ast.Name):
+            return [node.id]
+        if isinstance(node, (ast.List, ast.Tuple, ast.Set)):
+            models = []
+            for element in node.elts:
+                models.extend(self._models(element))
+            return models
+        if isinstance(node, ast.BinOp) and isinstance(node.op, SHIFT_OPERATORS):
+            return self._shift_chain(node)
+        if isinstance(node, ast.Constant):
+            return []
+        if isinstance(node, ast.Call) and self._dependency_call(node):
+            return []
+        # e.g. 'tasks["a"]' or 'group.task'
+        return [ast.unparse(node)]
+
+    def _shift_chain(self, node: ast.BinOp) -> List[str]:
+        # Walk the left spine iteratively so very long chains do not hit the recursion limit
+        # i.e. ((a >> b) << c) >> d -> operands [a, b, c, d], operators [>>, <<, >>]
+        operands = [node.right]
+        operators = [node.op]
+        left = node.left
+        while isinstance(left, ast.BinOp) and isinstance(left.op, SHIFT_OPERATORS):
+            operands.append(left.right)
+            operators.append(left.op)
+            left = left.left
+        operands.append(left)
+        operands.reverse()
+        operators.reverse()
+
+        current_models = self._models(operands[0])
+        for operator, operand in zip(operators, operands[1:]):
+            next_models = self._models(operand)
+            # 'a >> b' and 'a << b' both evaluate to 'b'
+            if isinstance(operator, ast.RShift):
+                self._emit_all(current_models, next_models)
+            else:
+                self._emit_all(next_models, current_models)
+            current_models = next_models
+
+        return current_models
+
+    def _dependency_call(self, node: ast.Call) -> bool:
+        """
+        Emit the dependencies of a call, returning False if it is not a dependency call
+        """
+        if (
+            isinstance(node.func, ast.Attribute)
+            and node.func.attr in ("set_downstream", "set_upstream")
+            and node.args
+        ):
+            name = node.func.attr
+            models = self._models(node.func.value)
+            other_models = self._models(node.args[0])
+            if name == "set_downstream":
+                self._emit_all(models, other_models)
+            else:
+                self._emit_all(other_models, models)
+            return True
+
+        name = self._helper_function(node.func)
+        if name in CHAIN_FUNCTIONS:
+            # Consecutive lists of the same length are linked pairwise, as in Airflow
+            previous = None
+            for argument in node.args:
+                is_list = isinstance(argument, (ast.List, ast.Tuple))
+                models = self._models(argument)
+                if previous is not None:
+                    previous_is_list, previous_models = previous
+                    if (
+                        name == "chain"
+                        and previous_is_list
+                        and is_list
+                        and len(previous_models) == len(models)
+                    ):
+                        for upstream, downstream in zip(previous_models, models):
+                            self.emit(upstream, downstream)
+                    else:
+                        self._emit_all(previous_models, models)
+                previous = (is_list, models)
+            return True
+
+        if name in CROSS_DOWNSTREAM_FUNCTIONS:
+            arguments = dict(zip(("from_tasks", "to_tasks"), node.args))
+            arguments.update({keyword.arg: keyword.value for keyword in node.keywords})
+            if "from_tasks" in arguments and "to_tasks" in arguments:
+                self._emit_all(
+                    self._models(arguments["from_tasks"]),
+                    self._models(arguments["to_tasks"]),
+                )
+            return True
+
+        return False
+
+    def visit_BinOp(self, node: ast.BinOp) -> None:
+        if isinstance(node.op, SHIFT_OPERATORS):
+            self._shift_chain(node)
+        else:
+            self.generic_visit(node)
+
+    def visit_Call(self, node: ast.Call) -> None:
+        if not self._dependency_call(node):
+            self.generic_visit(node)
+
+
+def iter_logical_lines(lines: Iterable[str]) -> Iterator[str]:
+    """
+    Group physical lines into logical lines (complete statements), following brackets,
+    string literals and backslash continuations the same way the Python tokenizer does.
+    # i.e.
+    Input: ["(\n", "    a\n", "    >> b\n", ")\n"]
+    Expected Output: "(\n    a\n    >> b\n)\n"
+    """
+    buffer = []
+    depth = 0
+    triple_quote = None
+
+    for line in lines:
+        buffer.append(line)
+        position = 0
+
+        if triple_quote is not None:
+            match = TRIPLE_QUOTE_END_PATTERNS[triple_quote].match(line)
+            if match is None:
+                continue  # still inside a triple-quoted string
+            triple_quote = None
+            position = match.end()
+
+        # Fast path for lines without any bracket, string, comment or continuation
+        if not SPECIAL_CHARACTER_PATTERN.search(line, position):
+            if depth == 0:
+                yield "".join(buffer)
+                buffer = []
+            continue
+
+        # Lines without triple quotes: drop strings and comments, then count brackets
+        if '"""' not in line and "'''" not in line:
+            code = STRING_OR_COMMENT_PATTERN.sub("", line[position:])
+            depth += (
+                code.count("(") + code.count("[") + code.count("{")
+                - code.count(")") - code.count("]") - code.count("}")
+            )
+            if depth > 0:
+                continue
+            depth = 0
+            if code.rstrip("\r\n").endswith("\\"):
+                continue  # explicit line continuation
+
+            yield "".join(buffer)
+            buffer = []
+            continue
+
+        in_comment = False
+        while True:
+            match = LEXICAL_TOKEN_PATTERN.search(line, position)
+            if match is None:
+                break
+            position = match.end()
+            kind = match.lastgroup
+            if kind == "open":
+                depth += 1
+            elif kind == "close":
+                depth = max(depth - 1, 0)
+            elif kind == "comment":
+                in_comment = True
+            elif kind == "triple":
+                end = TRIPLE_QUOTE_END_PATTERNS[match.group()].match(line, position)
+                if end is None:
+                    triple_quote = match.group()
+                    break
+                position = end.end()
+
+        if triple_quote is not None or depth > 0:
+            continue
+        if not in_comment and line.rstrip("\r\n").endswith("\\"):
+            continue  # explicit line continuation
+
+        yield "".join(buffer)
+        buffer = []
+
+    if buffer:
+        yield "".join(buffer)
+
+
+@contextmanager
+def map_file(file: BinaryIO) -> Iterator[Union[mmap.mmap, bytes]]:
+    """
+    Memory-map an open binary file read-only. Empty files cannot be mapped, they map to b"".
+    """
+    if os.fstat(file.fileno()).st_size == 0:
+        yield b""
+        return
+    with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as content:
+        yield content
+
+
+def has_dependency_markers(file_path: Union[str, os.PathLike]) -> bool:
+    """
+    Return whether a file mentions any dependency marker, scanning its bytes in place so
+    helper and config modules are skipped without being read into memory or decoded.
+    """
+    with open(file_path, "rb") as file, map_file(file) as content:
+        return DEPENDENCY_MARKER_BYTES_PATTERN.search(content) is not None
+
+
+def _simple_chain_groups(statement: str) -> Optional[List[EdgeGroup]]:
+    """
+    Split a chain made only of names and flat lists into its edge groups, or return None
+    if the statement needs the full parser.
+    # i.e.
+    Input: a >> [b, c] << d
+    Expected Output: [([a], [b, c]), ([d], [b, c])]
+    """
+    parts = SHIFT_OPERATOR_PATTERN.split(statement)
+    if len(parts) < 3:
+        return None
+
+    operands = []
+    for part in parts[::2]:
+        match = SIMPLE_OPERAND_PATTERN.fullmatch(part)
+        if match is None:
+            return None
+        if match.group("name") is not None:
+            operands.append([match.group("name")])
+            continue
+        models = [model.strip() for model in match.group("list").split(",")]
+        models = [model for model in models if model]
+        if not all(NAME_PATTERN.fullmatch(model) for model in models):
+            return None
+        operands.append(models)
+
+    return [
+        (current_models, next_models) if operator == ">>" else (next_models, current_models)
+        for operator, current_models, next_models in zip(parts[1::2], operands, operands[1:])
+    ]
+
+
+def _parse_statement(statement: str) -> Optional[ast.Module]:
+    try:
+        return ast.parse(statement)
+    except SyntaxError:
+        pass
+    try:
+        # ie. a compound statement header such as 'with DAG("chain_dag") as dag:'
+        return ast.parse(f"{statement} pass")
+    except SyntaxError:
+        return None
+
+
+def extract_dependencies(
+    source: Iterable[str],
+    emit: Optional[Callable[[str, str], None]] = None,
+    fallback: Optional[Callable[[str], Iterable[Edge]]] = None,
+    emit_group: Optional[Callable[[List[str], List[str]], None]] = None,
+) -> List[Edge]:
+    """
+    Extract all (upstream, downstream) edges declared in a DAG module.
+
+    'source' is either the module text or an iterable of its lines (e.g. an open file).
+    Only logical lines mentioning a dependency marker are parsed, so operator definitions
+    and other statements cost a single regex scan. Statements that are not valid on their
+    own (e.g. 'else:') are handed to 'fallback' if given, and skipped otherwise.
+    Edges are passed to 'emit' if given, and returned as a list otherwise. With
+    'emit_group', list-to-list declarations are passed as (upstream, downstream) groups
+    instead of being expanded into every pair, e.g. to DependencyGraph.add_bipartite_edges.
+    """
+    edges = []
+    if emit is None:
+        emit = lambda upstream, downstream: edges.append((upstream, downstream))
+    if isinstance(source, str):
+        source = source.splitlines(keepends=True)
+
+    extractor = DependencyExtractor(emit, emit_group)
+    for statement in iter_logical_lines(source):
+        if not DEPENDENCY_MARKER_PATTERN.search(statement) and not (
+            AIRFLOW_IMPORT_PATTERN.match(statement)
+        ):
+            continue
+
+        statement = statement.strip()
+        simple_groups = _simple_chain_groups(statement)
+        if simple_groups is not None:
+            for upstream_models, downstream_models in simple_groups:
+                extractor._emit_all(upstream_models, downstream_models)
+            continue
+
+        try:
+            tree = _parse_statement(statement)
+        except RecursionError:
+            tree = None  # nested deeper than the Python parser allows
+
+        if tree is not None:
+            extractor.visit(tree)
+        elif fallback is not None:
+            for upstream, downstream in fallback(statement):
+                emit(upstream, downstream)
+
+    return edges
@@ -0,0 +1,304 @@
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+def get_layer(model: str, separator: str = "_") -> str:
+    """
+    Return the layer prefix of a model name
+    # i.e.
+    'staging_task_a2' -> 'staging'
+    'start' -> ''
+    """
+    layer, found, _ = model.partition(separator)
+    return layer if found else ""
+
+
+# Node kinds. Passthrough nodes (e.g. sensors, datasets) belong to no layer and hand
+# their upstream models on to their downstream models during layer mapping
+MODEL = 0
+PASSTHROUGH = 1
+
+# List-to-list declarations of at least this many pairwise edges are stored through a
+# passthrough join node, i.e. '[a1..a300] >> [b1..b300]' as 600 edges instead of 90,000
+JOIN_MIN_EDGES = 32
+# Join node names cannot clash with task names, which are Python expressions
+JOIN_PREFIX = "<join>"
+
+
+class DependencyCycleError(ValueError):
+    """
+    Raised when the dependencies of a DAG contain a cycle.
+    """
+
+    def __init__(self, cycle: List[str]):
+        self.cycle = cycle
+        path = " >> ".join(cycle + cycle[:1])
+        super().__init__(
+            f"Dependency cycle found: {path}. Please review DAG dependencies."
+        )
+
+
+class DependencyGraph:
+    """
+    In-memory dependency graph of a single DAG file.
+
+    Model names are interned to integer node IDs on insert. Edges are stored as
+    compact forward (downstream) and reverse (upstream) adjacency arrays, and
+    every model is indexed by its layer prefix (e.g. 'source', 'staging').
+    'version' changes on every mutation, so derived results can be memoized.
+    """
+
+    def __init__(self):
+        self.names: List[str] = []
+        self.ids: Dict[str, int] = {}
+        self.layers: List[str] = []
+        self.kinds = array("b")
+        self.passthrough_count = 0
+        self.join_count = 0
+        self.version = 0
+        self._downstream: List[array] = []
+        self._upstream: List[array] = []
+        self._layer_index: Dict[str, array] = {}
+        self._edge_keys: set = set()
+
+    @classmethod
+    def from_edges(cls, edges: Iterable[Tuple[str, str]]) -> "DependencyGraph":
+        graph = cls()
+        graph.add_edges(edges)
+        return graph
+
+    @classmethod
+    def from_dependency_string(
+        cls, dependencies: str, separator: str = ">>"
+    ) -> "DependencyGraph":
+        """
+        Build a graph from newline-separated dependencies
+        # i.e.
+        Input: "\\n    a >> b\\n    b >> c"
+        """
+        graph = cls()
+        for line in dependencies.splitlines():
+            upstream, found, downstream = line.rpartition(separator)
+            if found:
+                graph.add_edge(upstream.strip(), downstream.strip())
+        return graph
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, model: str) -> bool:
+        return model in self.ids
+
+    @property
+    def edge_count(self) -> int:
+        return len(self._edge_keys)
+
+    def add_node(self, model: str, layer: Optional[str] = None) -> int:
+        """
+        Intern a model, its layer defaults to the prefix of its name
+        # i.e.
+        'staging_task_a2' -> layer 'staging'
+        'other_dag::staging_task_a2' with layer='staging' -> layer 'staging'
+        """
+        node = self.ids.get(model)
+        if node is not None:
+            return node
+
+        node = len(self.names)
+        if layer is None:
+            layer = get_layer(model)
+        self.names.append(model)
+        self.ids[model] = node
+        self.layers.append(layer)
+        self.kinds.append(MODEL)
+        self._downstream.append(array("i"))
+        self._upstream.append(array("i"))
+        self._layer_index.setdefault(layer, array("i")).append(node)
+        self.version += 1
+        return node
+
+    def set_kind(self, node: int, kind: int) -> None:
+        """
+        Turn a model into a passthrough node (removing it from its layer) or back.
+        """
+        if self.kinds[node] == kind:
+            return
+        layer_nodes = self._layer_index.setdefault(self.layers[node], array("i"))
+        if kind == PASSTHROUGH:
+            layer_nodes.remove(node)
+            self.passthrough_count += 1
+        else:
+            layer_nodes.append(node)
+            self.passthrough_count -= 1
+        self.kinds[node] = kind
+        self.version += 1
+
+    def add_edge(self, upstream: str, downstream: str) -> None:
+        upstream_node = self.add_node(upstream)
+        downstream_node = self.add_node(downstream)
+
+        # Skip duplicated edges (e.g. the same dependency declared twice)
+        edge_key = (upstream_node << 32) | downstream_node
+        if edge_key in self._edge_keys:
+            return
+        self._edge_keys.add(edge_key)
+
+        self._downstream[upstream_node].append(downstream_node)
+        self._upstream[downstream_node].append(upstream_node)
+        self.version += 1
+
+    def add_bipartite_edges(
+        self, upstream_models: List[str], downstream_models: List[str]
+    ) -> None:
+        """
+        Make every downstream model depend on every upstream model. Large groups share
+        one passthrough join node, so storage and traversal are O(m + n) instead of O(m * n)
+        # i.e.
+        [a, b] >> [c, d] -> a >> c, a >> d, b >> c, b >> d
+        [a1..a300] >> [b1..b300] -> a1..a300 >> '<join>0' >> b1..b300
+        """
+        if (
+            len(upstream_models) < 2
+            or len(downstream_models) < 2
+            or len(upstream_models) * len(downstream_models) < JOIN_MIN_EDGES
+        ):
+            for upstream in upstream_models:
+                for downstream in downstream_models:
+                    self.add_edge(upstream, downstream)
+            return
+
+        # Intern the models in the order the pairwise edges would, so node IDs (and the
+        # order of the layer maps) do not depend on how the group is stored
+        self.add_node(upstream_models[0])
+        for model in downstream_models:
+            self.add_node(model)
+        for model in upstream_models:
+            self.add_node(model)
+
+        join = f"{JOIN_PREFIX}{self.join_count}"
+        self.join_count += 1
+        self.set_kind(self.add_node(join, layer=""), PASSTHROUGH)
+        for upstream in upstream_models:
+            self.add_edge(upstream, join)
+        for downstream in downstream_models:
+            self.add_edge(join, downstream)
+
+    def remove_edge(self, upstream: str, downstream: str) -> bool:
+        """
+        Remove an edge, keeping both nodes. Returns False if there was no such edge.
+        """
+        upstream_node = self.ids.get(upstream)
+        downstream_node = self.ids.get(downstream)
+        if upstream_node is None or downstream_node is None:
+            return False
+
+        edge_key = (upstream_node << 32) | downstream_node
+        if edge_key not in self._edge_keys:
+            return False
+        self._edge_keys.remove(edge_key)
+
+        self._downstream[upstream_node].remove(downstream_node)
+        self._upstream[downstream_node].remove(upstream_node)
+        self.version += 1
+        return True
+
+    def add_edges(self, edges: Iterable[Tuple[str, str]]) -> None:
+        for upstream, downstream in edges:
+            self.add_edge(upstream, downstream)
+
+    def node_id(self, model: str) -> Optional[int]:
+        return self.ids.get(model)
+
+    def name(self, node: int) -> str:
+        return self.names[node]
+
+    def layer_of(self, node: int) -> str:
+        return self.layers[node]
+
+    def kind_of(self, node: int) -> int:
+        return self.kinds[node]
+
+    def upstream(self, node: int) -> array:
+        return self._upstream[node]
+
+    def downstream(self, node: int) -> array:
+        return self._downstream[node]
+
+    def layer_nodes(self, layer: str) -> array:
+        return self._layer_index.get(layer, array("i"))
+
+    def edges(self) -> Iterator[Tuple[str, str]]:
+        names = self.names
+        for upstream_node, downstream_nodes in enumerate(self._downstream):
+            for downstream_node in downstream_nodes:
+                yield names[upstream_node], names[downstream_node]
+
+    def is_join(self, node: int) -> bool:
+        return self.kinds[node] == PASSTHROUGH and self.names[node].startswith(JOIN_PREFIX)
+
+    def expanded_edges(self) -> Iterator[Tuple[str, str]]:
+        """
+        Edges between tasks, expanding join nodes back into every pair they stand for
+        # i.e.
+        a1 >> '<join>0', a2 >> '<join>0', '<join>0' >> b1 -> (a1, b1), (a2, b1)
+        """
+        names = self.names
+        seen = set()
+        for upstream_node, downstream_nodes in enumerate(self._downstream):
+            if self.is_join(upstream_node):
+                continue
+            stack = list(reversed(downstream_nodes))
+            while stack:
+                downstream_node = stack.pop()
+                if self.is_join(downstream_node):
+                    stack.extend(reversed(self._downstream[downstream_node]))
+                    continue
+                edge_key = (upstream_node << 32) | downstream_node
+                if edge_key not in seen:
+                    seen.add(edge_key)
+                    yield names[upstream_node], names[downstream_node]
+
+    def topological_order(self) -> array:
+        """
+        Return node IDs ordered so that every upstream model comes before its downstream
+        models (Kahn's algorithm). Raises ValueError if the graph has a cycle.
+        """
+        in_degree = array("i", (len(upstream) for upstream in self._upstream))
+        order = array("i", (node for node, degree in enumerate(in_degree) if degree == 0))
+
+        position = 0
+        while position < len(order):
+            for downstream_node in self._downstream[order[position]]:
+                in_degree[downstream_node] -= 1
+                if in_degree[downstream_node] == 0:
+                    order.append(downstream_node)
+            position += 1
+
+        if len(order) < len(self.names):
+            raise DependencyCycleError(self._find_cycle(in_degree))
+        return order
+
+    def _find_cycle(self, in_degree: array) -> List[str]:
+        """
+        Return one cycle among the nodes Kahn's algorithm could not order.
+        Every such node has an unordered upstream node, so walking upstream must revisit a node.
+        """
+        node = next(node for node, degree in enumerate(in_degree) if degree > 0)
+        path_index = {}
+        path = []
+        while node not in path_index:
+            path_index[node] = len(path)
+            path.append(node)
+            node = next(
+                upstream_node
+                for upstream_node in self._upstream[node]
+                if in_degree[upstream_node] > 0
+            )
+
+        # The path was walked upstream, reverse it into dependency order and start the
+        # cycle at its first declared model so the report is stable
+        cycle = path[path_index[node]:]
+        cycle.reverse()
+        first = cycle.index(min(cycle))
+        cycle = cycle[first:] + cycle[:first]
+        return [self.names[cycle_node] for cycle_node in cycle]
@@ -0,0 +1,182 @@
+from typing import Callable, Dict, Set, Tuple
+
+from dag_validator.cross_dag import CrossDAGLinks
+from dag_validator.dependency_graph import MODEL, PASSTHROUGH, DependencyGraph, get_layer
+
+# Qualified node names, i.e. 'sales::source_orders'
+QUALIFIER = "::"
+# Passthrough node fed by every leaf task of a DAG, for sensors waiting on the whole DAG
+DAG_END = "*"
+# Dataset nodes are qualified by this pseudo DAG, i.e. 'dataset::s3://bucket/orders'
+DATASET_DAG = "dataset"
+
+
+def qualify(dag_id: str, task: str) -> str:
+    return f"{dag_id}{QUALIFIER}{task}"
+
+
+class GlobalDependencyGraph:
+    """
+    Repository-wide dependency graph merging the per-file graphs of every DAG.
+
+    Tasks are interned once as qualified 'dag_id::task' nodes of a single shared graph,
+    and cross-DAG links become edges through passthrough nodes:
+    - ExternalTaskSensor: 'other_dag::task' >> sensor (or 'other_dag::*' for a whole DAG)
+    - Datasets: producer >> 'dataset::uri' >> every root task of each consumer DAG
+    Links can point at DAGs that are not loaded yet, they resolve once their file is merged.
+
+    Each file remembers the edges it contributed, so re-merging a changed file only
+    removes and adds the edges that differ instead of rebuilding the graph. Edges and
+    passthrough nodes are counted per contributing file, and a DAG ID can only belong
+    to one file at a time.
+    """
+
+    def __init__(self):
+        self.graph = DependencyGraph()
+        # dag name (file) -> dag ID, contributed edges and passthrough nodes
+        self.files: Dict[str, Tuple[str, Set[Tuple[str, str]], Set[str]]] = {}
+        self._passthrough_marks: Dict[str, int] = {}
+        self._edge_marks: Dict[Tuple[str, str], int] = {}
+        # dag ID -> dag name (file) declaring it
+        self._dag_names: Dict[str, str] = {}
+
+    def _file_contribution(
+        self, graph: DependencyGraph, links: CrossDAGLinks
+    ) -> Tuple[Set[Tuple[str, str]], Set[str]]:
+        dag_id = links.dag_id
+        edges = {
+            (qualify(dag_id, upstream), qualify(dag_id, downstream))
+            for upstream, downstream in graph.edges()
+        }
+        passthrough = {qualify(dag_id, DAG_END)}
+
+        for node in range(len(graph)):
+            task = qualify(dag_id, graph.name(node))
+            if graph.kind_of(node) == PASSTHROUGH:
+                passthrough.add(task)  # i.e. the join node of a list-to-list declaration
+                continue
+            if not graph.downstream(node):
+                edges.add((task, qualify(dag_id, DAG_END)))
+            if not graph.upstream(node):
+                edges.update(
+                    (qualify(DATASET_DAG, uri), task) for uri in links.schedule
+                )
+
+        for task, targets in links.sensors.items():
+            passthrough.add(qualify(dag_id, task))
+            passthrough.update(
+                qualify(external_dag_id, DAG_END)
+                for external_dag_id, external_task_id in targets
+                if external_task_id is None
+            )
+            edges.update(
+                (qualify(external_dag_id, external_task_id or DAG_END), qualify(dag_id, task))
+                for external_dag_id, external_task_id in targets
+            )
+
+        for task, uris in links.outlets.items():
+            edges.update((qualify(dag_id, task), qualify(DATASET_DAG, uri)) for uri in uris)
+        passthrough.update(
+            qualify(DATASET_DAG, uri) for uris in links.outlets.values() for uri in uris
+        )
+        passthrough.update(qualify(DATASET_DAG, uri) for uri in links.schedule)
+
+        # Sensors refer to task IDs, alias them where they differ from the variable names
+        for task, task_id in links.task_ids.items():
+            edges.add((qualify(dag_id, task), qualify(dag_id, task_id)))
+            passthrough.add(qualify(dag_id, task_id))
+
+        return edges, passthrough
+
+    def _add_node(self, name: str) -> int:
+        # Qualified tasks keep the layer of their task name
+        _, _, task = name.partition(QUALIFIER)
+        return self.graph.add_node(name, layer=get_layer(task))
+
+    def _update_passthrough(self, marked: Set[str], unmarked: Set[str]) -> None:
+        # Several files may mark the same node (e.g. a shared dataset), count the marks
+        for name in marked:
+            self._passthrough_marks[name] = self._passthrough_marks.get(name, 0) + 1
+            self.graph.set_kind(self._add_node(name), PASSTHROUGH)
+        for name in unmarked:
+            self._passthrough_marks[name] -= 1
+            if not self._passthrough_marks[name]:
+                del self._passthrough_marks[name]
+                self.graph.set_kind(self._add_node(name), MODEL)
+
+    def _update_edges(
+        self, added: Set[Tuple[str, str]], removed: Set[Tuple[str, str]]
+    ) -> None:
+        # An edge stays in the graph until no file contributes it any more
+        for edge in removed:
+            self._edge_marks[edge] -= 1
+            if not self._edge_marks[edge]:
+                del self._edge_marks[edge]
+                self.graph.remove_edge(*edge)
+        for upstream, downstream in added:
+            self._edge_marks[(upstream, downstream)] = (
+                self._edge_marks.get((upstream, downstream), 0) + 1
+            )
+            self._add_node(upstream)
+            self._add_node(downstream)
+            self.graph.add_edge(upstream, downstream)
+
+    def update_file(self, dag_name: str, graph: DependencyGraph, links: CrossDAGLinks) -> None:
+        """
+        Merge the graph of one DAG file, replacing what the file contributed before.
+        Raises ValueError when another file already declares the same DAG ID.
+        """
+        other_dag_name = self._dag_names.get(links.dag_id, dag_name)
+        if other_dag_name != dag_name:
+            raise ValueError(
+                f"DAG ID '{links.dag_id}' of {dag_name} is already declared by {other_dag_name}"
+            )
+
+        old_dag_id, old_edges, old_passthrough = self.files.get(dag_name, ("", set(), set()))
+        edges, passthrough = self._file_contribution(graph, links)
+
+        self._update_edges(set(), old_edges - edges)
+        self._update_passthrough(passthrough - old_passthrough, old_passthrough - passthrough)
+        self._update_edges(edges - old_edges, set())
+
+        self.files[dag_name] = (links.dag_id, edges, passthrough)
+        self._dag_names.pop(old_dag_id, None)
+        self._dag_names[links.dag_id] = dag_name
+
+    def remove_file(self, dag_name: str) -> None:
+        dag_id, edges, passthrough = self.files.pop(dag_name, ("", set(), set()))
+        self._dag_names.pop(dag_id, None)
+        self._update_edges(set(), edges)
+        self._update_passthrough(set(), passthrough)
+
+    def split_layer_map(self, layer_map: Dict[str, Set[str]]) -> Dict[str, Dict[str, set]]:
+        """
+        Split a layer map of the global graph into one layer map per DAG file. Models and
+        upstream models of the same DAG keep their task names, others stay qualified.
+        # i.e.
+        'sales::staging_orders': {'crm::source_customers', 'sales::source_orders'}
+        -> ('sales.py', {'staging_orders': {'crm::source_customers', 'source_orders'}})
+        """
+        dag_names = self._dag_names
+        dag_layer_maps = {dag_name: {} for dag_name in sorted(self.files)}
+        for model, upstream_models in layer_map.items():
+            dag_id, _, task = model.partition(QUALIFIER)
+            dag_name = dag_names.get(dag_id)
+            if dag_name is None:
+                continue  # a task referenced by a sensor, in a DAG that is not loaded
+
+            prefix = f"{dag_id}{QUALIFIER}"
+            dag_layer_maps[dag_name][task] = {
+                upstream[len(prefix):] if upstream.startswith(prefix) else upstream
+                for upstream in upstream_models
+            }
+        return dag_layer_maps
+
+    def layer_dependencies(
+        self, layer_function: Callable[[DependencyGraph], Dict[str, Set[str]]]
+    ) -> Dict[str, Dict[str, set]]:
+        """
+        Run a layer function over the global graph, returning its layer map per DAG file.
+        """
+        return self.split_layer_map(layer_function(self.graph))
+
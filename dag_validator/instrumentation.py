@@ -0,0 +1,102 @@
+import json
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+# Validation phases in pipeline order
+PHASES = ("read", "parse", "expand", "map", "orphans")
+
+
+class ValidationMetrics:
+    """
+    Collector of per-file phase durations and run counters.
+
+    Subclass and override 'record' and 'increment' to forward measurements elsewhere
+    (e.g. a metrics backend), and 'spawn' if the subclass takes constructor arguments.
+    """
+
+    def __init__(self):
+        self.timings: Dict[str, Dict[str, float]] = {}
+        self.counters: Dict[str, int] = {}
+
+    def spawn(self) -> "ValidationMetrics":
+        """
+        Return an empty collector of the same type, e.g. for a process pool worker
+        """
+        return type(self)()
+
+    def record(self, dag: str, phase: str, seconds: float) -> None:
+        dag_timings = self.timings.setdefault(dag, {})
+        dag_timings[phase] = dag_timings.get(phase, 0.0) + seconds
+
+    def increment(self, counter: str, amount: int = 1) -> None:
+        self.counters[counter] = self.counters.get(counter, 0) + amount
+
+    @contextmanager
+    def phase(self, dag: str, phase: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(dag, phase, time.perf_counter() - start)
+
+    def merge(self, other: "ValidationMetrics") -> None:
+        for dag, dag_timings in other.timings.items():
+            for phase, seconds in dag_timings.items():
+                self.record(dag, phase, seconds)
+        for counter, amount in other.counters.items():
+            self.increment(counter, amount)
+
+    def reset(self) -> None:
+        self.timings.clear()
+        self.counters.clear()
+
+    def cache_hit_rate(self) -> Optional[float]:
+        hits = self.counters.get("cache_hits", 0)
+        lookups = hits + self.counters.get("cache_misses", 0)
+        return hits / lookups if lookups else None
+
+    def summary(self) -> Dict:
+        """
+        Return phase totals, the slowest files, counters and the cache hit rate
+        """
+        phase_totals = {}
+        for dag_timings in self.timings.values():
+            for phase, seconds in dag_timings.items():
+                phase_totals[phase] = phase_totals.get(phase, 0.0) + seconds
+
+        slowest_files = sorted(
+            self.timings.items(), key=lambda item: sum(item[1].values()), reverse=True
+        )[:10]
+        # Known phases in pipeline order, then any custom phases by name
+        phase_order = sorted(
+            phase_totals,
+            key=lambda phase: (PHASES.index(phase) if phase in PHASES else len(PHASES), phase),
+        )
+        return {
+            "phases": {phase: phase_totals[phase] for phase in phase_order},
+            "slowest_files": {dag: sum(dag_timings.values()) for dag, dag_timings in slowest_files},
+            "counters": dict(sorted(self.counters.items())),
+            "cache_hit_rate": self.cache_hit_rate(),
+        }
+
+    def format_summary(self) -> str:
+        summary = self.summary()
+        lines = ["*** Validation summary"]
+        lines.extend(
+            f"    {phase:<10} {seconds * 1000:10.1f} ms" for phase, seconds in summary["phases"].items()
+        )
+        lines.extend(f"    {counter:<10} {amount:10d}" for counter, amount in summary["counters"].items())
+        if summary["cache_hit_rate"] is not None:
+            lines.append(f"    cache hit rate {summary['cache_hit_rate']:.1%}")
+        return "\n".join(lines)
+
+    def to_json(self, path: Optional[str] = None) -> str:
+        """
+        Export the summary and the per-file timings as JSON, optionally to a file
+        """
+        report = json.dumps({**self.summary(), "files": self.timings}, indent=2)
+        if path is not None:
+            with open(path, "w") as file:
+                file.write(report + "\n")
+        return report
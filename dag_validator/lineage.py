@@ -0,0 +1,127 @@
+import weakref
+from typing import Dict, List, Optional, Set, Tuple
+
+from dag_validator.dependency_graph import PASSTHROUGH, DependencyGraph
+
+# Expected upstream layer of every layer, from the most downstream layer to the source
+DEFAULT_UPSTREAM_LAYER_MAPPING = {"staging": "source", "landing": "staging"}
+
+
+class LineageEngine:
+    """
+    Resolve the nearest upstream layer models of every model in one topological sweep.
+
+    A model in layer L maps to the models of its upstream layer U (given by the layer
+    mapping) that feed it directly or through other models of layer L.
+    # i.e. with {"staging": "source"}
+    source_a >> staging_a >> staging_b -> 'staging_b': {'source_a'}
+    """
+
+    def __init__(self, upstream_layer_mapping: Optional[Dict[str, str]] = None):
+        if upstream_layer_mapping is None:
+            upstream_layer_mapping = DEFAULT_UPSTREAM_LAYER_MAPPING
+        self.upstream_layer_mapping = dict(upstream_layer_mapping)
+        self._results = weakref.WeakKeyDictionary()
+
+    def __getstate__(self) -> dict:
+        # The memoized results are per process, e.g. not sent to process pool workers
+        return {"upstream_layer_mapping": self.upstream_layer_mapping}
+
+    def __setstate__(self, state: dict) -> None:
+        self.upstream_layer_mapping = state["upstream_layer_mapping"]
+        self._results = weakref.WeakKeyDictionary()
+
+    def resolve(self, graph: DependencyGraph) -> Dict[str, Dict[str, set]]:
+        """
+        Return {layer: {model: {upstream layer models}}} for every mapped layer.
+        Only models with at least one upstream task are included as base models.
+        Results are memoized per graph, so all layers of a file share one sweep.
+        """
+        version = graph.version
+        cached = self._results.get(graph)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        nearest = self._sweep(graph)
+
+        names = graph.names
+        layer_maps = {layer: {} for layer in self.upstream_layer_mapping}
+        for layer, layer_map in layer_maps.items():
+            for node in graph.layer_nodes(layer):
+                if graph.upstream(node):
+                    layer_map[names[node]] = {names[upstream] for upstream in nearest[node]}
+
+        self._results[graph] = (version, layer_maps)
+        return layer_maps
+
+    def _sweep(self, graph: DependencyGraph) -> Dict[int, Set[int]]:
+        layers = graph.layers
+        kinds = graph.kinds
+        mapping = self.upstream_layer_mapping
+        nearest: Dict[int, Set[int]] = {}
+        # Models feeding every passthrough node, directly or through other passthrough nodes
+        through: Dict[int, Set[int]] = {}
+        # Nearest upstream layer models a passthrough node hands to the models of a layer,
+        # resolved once per (node, layer) so a join feeding n models costs O(m + n)
+        handed: Dict[Tuple[int, str], Set[int]] = {}
+
+        for node in graph.topological_order():
+            if kinds[node] == PASSTHROUGH:
+                through[node] = self._upstream_models(graph, node, through)
+                continue
+
+            layer = layers[node]
+            upstream_layer = mapping.get(layer)
+            if upstream_layer is None:
+                continue  # not a mapped layer
+
+            # Upstream layer models found directly, and sets inherited from same-layer models
+            direct = set()
+            inherited = []
+            for upstream_node in graph.upstream(node):
+                if kinds[upstream_node] == PASSTHROUGH:
+                    key = (upstream_node, layer)
+                    if key not in handed:
+                        handed[key] = self._nearest_of(
+                            through[upstream_node], layers, layer, upstream_layer, nearest
+                        )
+                    inherited.append(handed[key])
+                    continue
+
+                upstream_node_layer = layers[upstream_node]
+                if upstream_node_layer == upstream_layer:
+                    direct.add(upstream_node)
+                elif upstream_node_layer == layer:
+                    inherited.append(nearest[upstream_node])
+
+            # Share the upstream set along same-layer chains instead of copying it
+            if not direct and len(inherited) == 1:
+                nearest[node] = inherited[0]
+            else:
+                nearest[node] = direct.union(*inherited)
+
+        return nearest
+
+    def _nearest_of(
+        self,
+        models: Set[int],
+        layers: List[str],
+        layer: str,
+        upstream_layer: str,
+        nearest: Dict[int, Set[int]],
+    ) -> Set[int]:
+        # Nearest upstream layer models of a layer model fed by all of 'models'
+        direct = {model for model in models if layers[model] == upstream_layer}
+        return direct.union(*(nearest[model] for model in models if layers[model] == layer))
+
+    def _upstream_models(
+        self, graph: DependencyGraph, node: int, through: Dict[int, Set[int]]
+    ) -> Set[int]:
+        # Upstream models of a node, looking through passthrough nodes
+        models = set()
+        for upstream_node in graph.upstream(node):
+            if graph.kinds[upstream_node] == PASSTHROUGH:
+                models.update(through[upstream_node])
+            else:
+                models.add(upstream_node)
+        return models
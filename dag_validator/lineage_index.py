@@ -0,0 +1,231 @@
+from collections import deque
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from dag_validator.dependency_graph import PASSTHROUGH, DependencyGraph
+from dag_validator.global_graph import QUALIFIER
+
+# Number of distinct (query, task, layer) results kept warm by each LineageIndex
+DEFAULT_QUERY_CACHE_SIZE = 4096
+
+
+def _iter_bits(bits: int) -> Iterator[int]:
+    # i.e. 0b10110 -> 1, 2, 4
+    while bits:
+        lowest = bits & -bits
+        yield lowest.bit_length() - 1
+        bits ^= lowest
+
+
+class LineageIndex:
+    """
+    Precomputed reachability of a dependency graph, answering lineage queries without
+    walking the graph again.
+
+    Nodes are grouped by DAG (the 'dag_id::' qualifier of their name, datasets forming
+    one pseudo DAG). Every node keeps its ancestors and descendants within its own DAG
+    as int bitsets numbered within that DAG, so bitsets stay as small as the DAG even
+    when sensors and datasets link every DAG of the repository. Edges between DAGs are
+    kept as portals: a query ORs the bitsets of its DAG, then follows the portals its
+    bitset reaches into the other DAGs. Layer queries intersect the result with a
+    per-layer mask of every reached DAG.
+
+    Tasks are given as qualified 'dag_id::task' names, or as bare task names matching
+    the task in every DAG. Passthrough nodes (sensors, datasets, join nodes) are looked
+    through and never returned. Results of hot queries are kept in an LRU cache.
+    # i.e.
+    index.upstream("landing_task_c1", layer="staging")
+    -> ('example_dag::staging_task_a2', 'example_dag::staging_task_b3', 'example_dag::staging_task_b4')
+    """
+
+    def __init__(self, graph: DependencyGraph, cache_size: int = DEFAULT_QUERY_CACHE_SIZE):
+        self.graph = graph
+        order = graph.topological_order()
+
+        # DAG group of every node, and its bit number within the group
+        self.groups = [0] * len(graph)
+        self.bits = [0] * len(graph)
+        self.group_nodes: List[List[int]] = []
+        group_ids: Dict[str, int] = {}
+        for node, name in enumerate(graph.names):
+            dag_id, _, _ = name.rpartition(QUALIFIER)
+            group = group_ids.setdefault(dag_id, len(group_ids))
+            if group == len(self.group_nodes):
+                self.group_nodes.append([])
+            self.groups[node] = group
+            self.bits[node] = len(self.group_nodes[group])
+            self.group_nodes[group].append(node)
+
+        # Model masks of every group, in total and per layer
+        self.model_masks = [0] * len(self.group_nodes)
+        self.layer_masks: Dict[Tuple[int, str], int] = {}
+        for node in range(len(graph)):
+            if graph.kind_of(node) == PASSTHROUGH:
+                continue
+            group, bit = self.groups[node], 1 << self.bits[node]
+            self.model_masks[group] |= bit
+            key = (group, graph.layer_of(node))
+            self.layer_masks[key] = self.layer_masks.get(key, 0) | bit
+
+        # Edges between groups, from the node of each side: {node: [other group nodes]}
+        self.cross_upstream: Dict[int, List[int]] = {}
+        self.cross_downstream: Dict[int, List[int]] = {}
+        # Nodes of every group with an edge from (entries) or to (exits) another group
+        self.entries: List[List[int]] = [[] for _ in self.group_nodes]
+        self.exits: List[List[int]] = [[] for _ in self.group_nodes]
+
+        self.ancestors = [0] * len(graph)
+        for node in order:
+            ancestors = 0
+            for upstream_node in graph.upstream(node):
+                if self.groups[upstream_node] != self.groups[node]:
+                    if node not in self.cross_upstream:
+                        self.entries[self.groups[node]].append(node)
+                    self.cross_upstream.setdefault(node, []).append(upstream_node)
+                    if upstream_node not in self.cross_downstream:
+                        self.exits[self.groups[upstream_node]].append(upstream_node)
+                    self.cross_downstream.setdefault(upstream_node, []).append(node)
+                    continue
+                ancestors |= self.ancestors[upstream_node] | (1 << self.bits[upstream_node])
+            self.ancestors[node] = ancestors
+
+        self.descendants = [0] * len(graph)
+        for node in reversed(order):
+            descendants = 0
+            for downstream_node in graph.downstream(node):
+                if self.groups[downstream_node] == self.groups[node]:
+                    descendants |= self.descendants[downstream_node] | (
+                        1 << self.bits[downstream_node]
+                    )
+            self.descendants[node] = descendants
+
+        # Bare task names -> nodes of every DAG declaring them
+        self.task_nodes: Dict[str, List[int]] = {}
+        for node, name in enumerate(graph.names):
+            if graph.kind_of(node) != PASSTHROUGH:
+                _, _, task = name.rpartition(QUALIFIER)
+                self.task_nodes.setdefault(task, []).append(node)
+
+        # One LRU cache per index, shared by all kinds of queries, and one for the
+        # reachable sets composed across groups that the queries are built from
+        self._query = lru_cache(maxsize=cache_size)(self._run_query)
+        self._reach = lru_cache(maxsize=cache_size)(self._compose_reach)
+
+    def _compose_reach(self, node: int, upstream: bool) -> Dict[int, int]:
+        """
+        Nodes reachable from a node, as {group: bitset}, following the edges between
+        groups from every portal its own bitset reaches.
+        """
+        bitsets = self.ancestors if upstream else self.descendants
+        portals = self.entries if upstream else self.exits
+        crossings = self.cross_upstream if upstream else self.cross_downstream
+
+        reached: Dict[int, int] = {}
+        pending = [node]
+        while pending:
+            current = pending.pop()
+            group = self.groups[current]
+            own_bit = 1 << self.bits[current]
+            if current != node:
+                if reached.get(group, 0) & own_bit:
+                    continue  # already reached through a node it feeds (or is fed by)
+                reached[group] = reached.get(group, 0) | own_bit
+            reached[group] = reached.get(group, 0) | bitsets[current]
+
+            reachable = bitsets[current] | own_bit
+            for portal in portals[group]:
+                if reachable >> self.bits[portal] & 1:
+                    pending.extend(crossings[portal])
+        return reached
+
+    def nodes(self, task: str) -> List[int]:
+        """
+        Return the nodes of a qualified or bare task name. Raises KeyError if unknown.
+        """
+        node = self.graph.node_id(task)
+        if node is not None and self.graph.kind_of(node) != PASSTHROUGH:
+            return [node]
+        if task in self.task_nodes:
+            return self.task_nodes[task]
+        raise KeyError(f"Unknown task '{task}'")
+
+    def _select(self, task: str, layer: Optional[str], upstream: bool) -> Tuple[str, ...]:
+        names = set()
+        for node in self.nodes(task):
+            for group, bits in self._reach(node, upstream).items():
+                if layer is None:
+                    mask = self.model_masks[group]
+                else:
+                    mask = self.layer_masks.get((group, layer), 0)
+                group_nodes = self.group_nodes[group]
+                names.update(
+                    self.graph.name(group_nodes[bit]) for bit in _iter_bits(bits & mask)
+                )
+        return tuple(sorted(names))
+
+    def _run_query(self, query: str, *arguments) -> Optional[Tuple[str, ...]]:
+        if query == "upstream":
+            return self._select(*arguments, upstream=True)
+        if query == "downstream":
+            return self._select(*arguments, upstream=False)
+        return self._shortest_path(*arguments)
+
+    def upstream(self, task: str, layer: Optional[str] = None) -> Tuple[str, ...]:
+        """
+        Every model 'task' depends on, directly or not, optionally only of one layer.
+        """
+        return self._query("upstream", task, layer)
+
+    def downstream(self, task: str, layer: Optional[str] = None) -> Tuple[str, ...]:
+        """
+        Every model depending on 'task', directly or not, optionally only of one layer.
+        """
+        return self._query("downstream", task, layer)
+
+    def path(self, source: str, target: str) -> Optional[Tuple[str, ...]]:
+        """
+        Shortest chain of models from 'source' down to 'target', or None if 'target'
+        does not depend on 'source'.
+        # i.e.
+        path('source_task_a1', 'landing_task_a3')
+        -> ('example_dag::source_task_a1', 'example_dag::staging_task_a2', 'example_dag::landing_task_a3')
+        """
+        return self._query("path", source, target)
+
+    def _shortest_path(self, source: str, target: str) -> Optional[Tuple[str, ...]]:
+        graph = self.graph
+
+        def fed_by_source(node: int) -> bool:
+            return bool(fed.get(self.groups[node], 0) >> self.bits[node] & 1)
+
+        paths = []
+        for source_node in self.nodes(source):
+            fed = self._reach(source_node, False)
+            for target_node in self.nodes(target):
+                if not fed_by_source(target_node):
+                    continue
+
+                # Walk upstream from the target, only through nodes fed by the source
+                previous = {target_node: None}
+                queue = deque([target_node])
+                while source_node not in previous:
+                    node = queue.popleft()
+                    for upstream_node in graph.upstream(node):
+                        if upstream_node not in previous and (
+                            upstream_node == source_node or fed_by_source(upstream_node)
+                        ):
+                            previous[upstream_node] = node
+                            queue.append(upstream_node)
+
+                path = []
+                node = source_node
+                while node is not None:
+                    if graph.kind_of(node) != PASSTHROUGH:
+                        path.append(graph.name(node))
+                    node = previous[node]
+                paths.append(tuple(path))
+
+        return min(paths, key=lambda path: (len(path), path)) if paths else None
+
+    def cache_info(self):
+        return self._query.cache_info()
@@ -0,0 +1,90 @@
+"""
+Local HTTP server answering lineage queries from a warm LineageIndex, e.g. for data
+catalogs and on-call tooling.
+
+Usage:
+python -m dag_validator serve dags/ --port 8765
+
+GET /upstream?task=landing_task_c1&layer=staging
+GET /downstream?task=source_task_a1
+GET /path?source=source_task_a1&target=landing_task_c1
+"""
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from dag_validator.lineage_index import LineageIndex
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+
+class LineageRequestHandler(BaseHTTPRequestHandler):
+    """
+    Answer GET lineage queries as JSON from the index of the server.
+    """
+
+    server: "LineageServer"
+
+    def _send_json(self, status: int, document: Dict) -> None:
+        body = json.dumps(document).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _parameters(self, query: Dict[str, List[str]], names: Tuple[str, ...]) -> Dict[str, str]:
+        missing = [name for name in names if not query.get(name)]
+        if missing:
+            raise ValueError(f"Missing query parameter(s): {', '.join(missing)}")
+        return {name: query[name][0] for name in names}
+
+    def do_GET(self) -> None:
+        url = urlsplit(self.path)
+        query = parse_qs(url.query)
+        index = self.server.index
+        try:
+            if url.path in ("/upstream", "/downstream"):
+                task = self._parameters(query, ("task",))["task"]
+                layer = query.get("layer", [None])[0]
+                lookup = index.upstream if url.path == "/upstream" else index.downstream
+                document = {"task": task, "layer": layer, url.path[1:]: list(lookup(task, layer))}
+            elif url.path == "/path":
+                parameters = self._parameters(query, ("source", "target"))
+                path = index.path(parameters["source"], parameters["target"])
+                document = {**parameters, "path": list(path) if path is not None else None}
+            else:
+                self._send_json(404, {"error": f"Unknown endpoint '{url.path}'"})
+                return
+        except ValueError as error:
+            self._send_json(400, {"error": str(error)})
+            return
+        except KeyError as error:
+            self._send_json(404, {"error": error.args[0]})
+            return
+        self._send_json(200, document)
+
+    def log_message(self, format: str, *args) -> None:
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class LineageServer(ThreadingHTTPServer):
+    """
+    Threaded HTTP server sharing one LineageIndex (and its query cache) between requests.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        index: LineageIndex,
+        host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT,
+        verbose: bool = False,
+    ):
+        self.index = index
+        self.verbose = verbose
+        super().__init__((host, port), LineageRequestHandler)
@@ -0,0 +1,61 @@
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from itertools import islice
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Optional, Tuple
+
+# Reads the raw content of a DAG file, e.g. from a local disk or a network filesystem
+DAGFileReader = Callable[[Path], bytes]
+
+
+def read_file_bytes(file_path: Path) -> bytes:
+    with open(file_path, "rb") as file:
+        return file.read()
+
+
+class ConcurrentFileLoader:
+    """
+    Read files on a thread pool, overlapping their I/O latency (e.g. on NFS), and yield
+    (path, content) pairs as soon as each read completes.
+
+    At most 'max_in_flight' reads are pending at any time, so memory stays bounded
+    however many files there are. With 'max_workers' set to 0 files are read inline,
+    one at a time.
+    """
+
+    def __init__(
+        self,
+        reader: Optional[DAGFileReader] = None,
+        max_workers: int = 8,
+        max_in_flight: Optional[int] = None,
+    ):
+        self.reader = reader if reader is not None else read_file_bytes
+        self.max_workers = max_workers
+        self.max_in_flight = max_in_flight if max_in_flight is not None else max_workers * 2
+
+    def load(self, file_paths: Iterable[Path]) -> Iterator[Tuple[Path, bytes]]:
+        """
+        Yield the content of every file in completion order. A failed read raises when
+        its result is reached, as reading the files one by one would.
+        """
+        file_paths = iter(file_paths)
+        if self.max_workers <= 0:
+            for file_path in file_paths:
+                yield file_path, self.reader(file_path)
+            return
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            pending = {
+                executor.submit(self.reader, file_path): file_path
+                for file_path in islice(file_paths, self.max_in_flight)
+            }
+            try:
+                while pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for file_path in islice(file_paths, len(done)):
+                        pending[executor.submit(self.reader, file_path)] = file_path
+                    for future in done:
+                        yield pending.pop(future), future.result()
+            finally:
+                # The consumer stopped early (or a read failed), drop the reads not started yet
+                for future in pending:
+                    future.cancel()
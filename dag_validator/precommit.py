@@ -0,0 +1,71 @@
+"""
+Pre-commit entry point validating only the DAG files given on the command line.
+
+The DAG folder is never walked and only the given files are parsed, so the hook costs
+about the same in a 1,000-DAG repository as in a small one. Latency target: under
+200 ms for five changed files, interpreter start-up included, checked by
+'python -m benchmarks.bench_precommit'.
+
+Usage:
+python -m dag_validator.precommit --fail-fast dags/sales_dag.py dags/crm_dag.py
+"""
+import argparse
+import sys
+from typing import List, Optional
+
+DEFAULT_DAG_FOLDER = "dags/"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("filenames", nargs="*", help="changed files, e.g. passed by pre-commit")
+    parser.add_argument("--dag-folder", default=DEFAULT_DAG_FOLDER)
+    parser.add_argument("--fail-fast", action="store_true", help="stop at the first violation")
+    parser.add_argument(
+        "--expected-orphans", help="JSON file of {layer: {dag: [models]}} allowed to be orphaned"
+    )
+    args = parser.parse_args(argv)
+    if not any(filename.endswith(".py") for filename in args.filenames):
+        return 0
+
+    # Imported once there is something to validate, a commit touching no Python file
+    # exits before loading the validator
+    from dag_validator.checks import load_expected_orphans, run_checks
+    from dag_validator.dag_validation import AirflowDAGValidation
+
+    validator = AirflowDAGValidation(args.dag_folder, quiet=True)
+    expected_orphans = load_expected_orphans(args.expected_orphans)
+    upstream_layer_mapping = validator.lineage_engine.upstream_layer_mapping
+
+    failures = []
+    for filename in args.filenames:
+        if not validator.is_dag_file(filename):
+            continue
+
+        dag = validator.dag_name(filename)
+        try:
+            graph = validator.parse_dag_file(filename)
+            result, layer_dependencies = validator.process_dag_graph(filename, graph)
+        except ValueError as error:  # e.g. a dependency cycle
+            failures.append(f"{dag}: {error}")
+        else:
+            failures.extend(
+                run_checks(
+                    {layer: {dag: orphans} for layer, orphans in result.items()},
+                    {layer: {dag: layer_map} for layer, layer_map in layer_dependencies.items()},
+                    upstream_layer_mapping,
+                    expected_orphans,
+                )
+            )
+
+        if failures and args.fail_fast:
+            del failures[1:]
+            break
+
+    for failure in failures:
+        print(failure)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,135 @@
+"""
+Pytest plugin generating one test item per DAG file and layer.
+
+Enable it from a conftest.py:
+pytest_plugins = ["dag_validator.pytest_plugin"]
+
+Tests requesting the 'dag_file' and 'dag_layer' fixtures are parametrized over every DAG
+file of '--dag-folder' (or the 'dag_folder' ini option) and every configured layer. Each
+file is validated lazily, once per session, and its result is shared by every test item
+of that file through the 'dag_result' fixture.
+
+With pytest-xdist, files are spread over the workers by estimated cost (file size) in
+'xdist_group' shards, so 'pytest -n 4 --dist loadgroup' validates each file on one worker.
+"""
+import os
+from typing import Dict
+
+import pytest
+
+from dag_validator.dag_validation import AirflowDAGValidation, DAGFileResult
+from dag_validator.sharding import assign_shards_by_cost
+
+DEFAULT_DAG_FOLDER = "dags/"
+
+
+class DAGValidationSession:
+    """
+    Validator shared by a test session, memoizing the result of every validated DAG file.
+    """
+
+    def __init__(self, validator: AirflowDAGValidation):
+        self.validator = validator
+        self.dag_files = {
+            validator.dag_name(dag_path): dag_path for dag_path in validator.iter_dag_files()
+        }
+        self._results: Dict[str, DAGFileResult] = {}
+        self._errors: Dict[str, Exception] = {}
+
+    def result(self, dag_name: str) -> DAGFileResult:
+        """
+        Validate a DAG file on first use, re-raising its error for every later test item.
+        """
+        if dag_name in self._errors:
+            raise self._errors[dag_name]
+        if dag_name not in self._results:
+            try:
+                self._results[dag_name] = DAGFileResult(
+                    *self.validator._process_dag_file(self.dag_files[dag_name])
+                )
+            except Exception as error:
+                self._errors[dag_name] = error
+                raise
+        return self._results[dag_name]
+
+    def shards(self, shard_count: int) -> Dict[str, int]:
+        """
+        Assign every DAG file to one of 'shard_count' shards of about the same total cost,
+        placing the most expensive files first into the currently cheapest shard.
+        """
+        costs = {
+            dag_name: os.path.getsize(dag_path) for dag_name, dag_path in self.dag_files.items()
+        }
+        return assign_shards_by_cost(costs, shard_count)
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("dag_validator", "Airflow DAG validation")
+    group.addoption("--dag-folder", help="folder of the DAG files to validate")
+    parser.addini("dag_folder", "folder of the DAG files to validate", default=DEFAULT_DAG_FOLDER)
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    config.addinivalue_line(
+        "markers", "xdist_group(name): run all tests of the group on the same xdist worker"
+    )
+
+
+def _dag_validation_session(config: pytest.Config) -> DAGValidationSession:
+    session = getattr(config, "_dag_validation_session", None)
+    if session is None:
+        dag_folder = config.getoption("--dag-folder") or config.getini("dag_folder")
+        session = DAGValidationSession(AirflowDAGValidation(dag_folder))
+        # Collecting no DAG file would skip every check and pass, e.g. from another cwd
+        if not session.dag_files:
+            raise pytest.UsageError(
+                f"{session.validator.dag_folder_path} is empty or does not exist. "
+                "There is no valid DAG to validate."
+            )
+        config._dag_validation_session = session
+    return session
+
+
+def _xdist_worker_count() -> int:
+    # Set by pytest-xdist in every worker, all workers must collect the same shards
+    return int(os.environ.get("PYTEST_XDIST_WORKER_COUNT", 1))
+
+
+def pytest_generate_tests(metafunc: pytest.Metafunc) -> None:
+    if "dag_file" not in metafunc.fixturenames:
+        return
+
+    session = _dag_validation_session(metafunc.config)
+    shards = session.shards(_xdist_worker_count())
+
+    def shard_mark(dag_name: str):
+        return pytest.mark.xdist_group(f"dag_shard_{shards[dag_name]}")
+
+    if "dag_layer" in metafunc.fixturenames:
+        metafunc.parametrize(
+            ["dag_file", "dag_layer"],
+            [
+                pytest.param(dag_name, layer, id=f"{dag_name}-{layer}", marks=shard_mark(dag_name))
+                for dag_name in session.dag_files
+                for layer in session.validator.layer_functions
+            ],
+        )
+    else:
+        metafunc.parametrize(
+            "dag_file",
+            [
+                pytest.param(dag_name, id=dag_name, marks=shard_mark(dag_name))
+                for dag_name in session.dag_files
+            ],
+        )
+
+
+@pytest.fixture(scope="session")
+def dag_validation_session(pytestconfig: pytest.Config) -> DAGValidationSession:
+    return _dag_validation_session(pytestconfig)
+
+
+@pytest.fixture
+def dag_result(dag_validation_session: DAGValidationSession, dag_file: str) -> DAGFileResult:
+    return dag_validation_session.result(dag_file)
+
@@ -0,0 +1,340 @@
+"""
+Rule engine evaluating every enabled check of a DAG file in one graph traversal.
+
+Rules register node and edge visitors by overriding 'visit_node' and 'visit_edge'.
+The engine walks each graph once in topological order, calling the edge visitors of
+every upstream edge of a node, then the node visitors of that node, so a node is
+visited only after all of its upstream nodes and edges.
+
+Passthrough nodes (join nodes of list-to-list declarations, sensors and datasets of the
+global graph) are looked through: rules only visit models, and edge visitors receive
+the model-to-model edges a passthrough node stands for.
+"""
+import re
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from dag_validator.checks import incorrect_upstream_messages, orphan_message
+from dag_validator.dependency_graph import PASSTHROUGH, DependencyGraph
+from dag_validator.lineage import DEFAULT_UPSTREAM_LAYER_MAPPING
+
+# Messages of one DAG file: {layer: {rule: [messages]}}
+RuleResults = Dict[str, Dict[str, List[str]]]
+
+
+class RuleContext:
+    """
+    Graph of the DAG file being evaluated, with its resolved layer maps
+    ({layer: {model: {upstream layer models}}}), collecting the messages of every rule.
+    Rules keep their per-file state (e.g. per-node arrays) in 'state[rule]'.
+    """
+
+    def __init__(
+        self,
+        graph: DependencyGraph,
+        layer_maps: Dict[str, Dict[str, set]],
+        upstream_layer_mapping: Dict[str, str],
+        layer_ranks: Dict[str, int],
+    ):
+        self.graph = graph
+        self.layer_maps = layer_maps
+        self.upstream_layer_mapping = upstream_layer_mapping
+        self.layer_ranks = layer_ranks
+        self.state: Dict["Rule", Any] = {}
+        # (node, layer, rule name, message) in visiting order
+        self.reports: List[Tuple[int, str, str, str]] = []
+        # Upstream models of every passthrough node, in declaration order
+        self.through: Dict[int, Dict[int, None]] = {}
+
+    def upstream_count(self, node: int) -> int:
+        """
+        Number of distinct upstream models of a node, counting the models behind
+        passthrough nodes once even when several passthrough nodes lead to them.
+        """
+        return len(self.upstream_models(node))
+
+    def upstream_models(self, node: int) -> Iterable[int]:
+        """
+        Upstream models of a node, looking through passthrough nodes.
+        """
+        graph = self.graph
+        upstream_nodes = graph.upstream(node)
+        if not graph.passthrough_count or not any(
+            upstream_node in self.through for upstream_node in upstream_nodes
+        ):
+            return upstream_nodes
+
+        models = {}
+        for upstream_node in upstream_nodes:
+            if upstream_node in self.through:
+                models.update(self.through[upstream_node])
+            else:
+                models[upstream_node] = None
+        return models
+
+    def report(self, rule: "Rule", node: int, message: str) -> None:
+        """
+        Record a message of a rule under the layer of a node (empty for unlayered tasks).
+        """
+        self.reports.append((node, self.graph.layer_of(node), rule.name, message))
+
+    def results(self) -> RuleResults:
+        """
+        Messages grouped per layer and rule, ordered by node (the order models were
+        declared in) rather than by the traversal order.
+        """
+        results = {}
+        for _, layer, rule_name, message in sorted(self.reports, key=lambda report: report[0]):
+            results.setdefault(layer, {}).setdefault(rule_name, []).append(message)
+        return results
+
+
+class Rule:
+    """
+    Base class of the rules. Subclasses override the visitors they need, the engine
+    only calls overridden visitors. 'start' and 'finish' run once per DAG file, e.g. to
+    set up per-node state in the context.
+    """
+
+    name = "rule"
+
+    def start(self, context: RuleContext) -> None:
+        pass
+
+    def visit_node(self, context: RuleContext, node: int) -> None:
+        pass
+
+    def visit_edge(self, context: RuleContext, upstream_node: int, downstream_node: int) -> None:
+        pass
+
+    def finish(self, context: RuleContext) -> None:
+        pass
+
+
+def _layer_ranks(upstream_layer_mapping: Dict[str, str]) -> Dict[str, int]:
+    """
+    Rank the mapped layers from the most upstream one
+    # i.e.
+    {'staging': 'source', 'landing': 'staging'} -> {'source': 0, 'staging': 1, 'landing': 2}
+    """
+    ranks = {}
+
+    def rank(layer: str, seen: Set[str]) -> int:
+        if layer not in ranks:
+            upstream_layer = upstream_layer_mapping.get(layer)
+            if upstream_layer is None or upstream_layer in seen:
+                ranks[layer] = 0
+            else:
+                ranks[layer] = rank(upstream_layer, seen | {layer}) + 1
+        return ranks[layer]
+
+    for layer in upstream_layer_mapping:
+        rank(layer, set())
+    return ranks
+
+
+class OrphanRule(Rule):
+    """
+    Models of a mapped layer with upstream tasks but no model of their upstream layer,
+    with the same message as 'checks.find_unexpected_orphans'.
+    # i.e. with {'staging': 'source'}
+    start >> staging_task_x -> "orphaned model 'staging_task_x'"
+    """
+
+    name = "orphan"
+
+    def visit_node(self, context: RuleContext, node: int) -> None:
+        graph = context.graph
+        layer_map = context.layer_maps.get(graph.layer_of(node))
+        if layer_map is not None and not layer_map.get(graph.name(node), True):
+            context.report(self, node, orphan_message(graph.name(node)))
+
+
+class UpstreamPrefixRule(Rule):
+    """
+    Mapped upstream models that are not in the expected upstream layer of their model,
+    with the same meaning as 'checks.find_incorrect_prefixes'.
+    """
+
+    name = "upstream_prefix"
+
+    def visit_node(self, context: RuleContext, node: int) -> None:
+        graph = context.graph
+        model = graph.name(node)
+        upstream_models = context.layer_maps.get(graph.layer_of(node), {}).get(model, ())
+        for message in incorrect_upstream_messages(
+            model, upstream_models, context.upstream_layer_mapping
+        ):
+            context.report(self, node, message)
+
+
+class FanInRule(Rule):
+    """
+    Tasks with more than 'max_upstream' direct upstream tasks.
+    """
+
+    name = "fan_in"
+
+    def __init__(self, max_upstream: int = 10):
+        self.max_upstream = max_upstream
+
+    def visit_node(self, context: RuleContext, node: int) -> None:
+        upstream_count = context.upstream_count(node)
+        if upstream_count > self.max_upstream:
+            context.report(
+                self,
+                node,
+                f"'{context.graph.name(node)}' has {upstream_count} upstream tasks "
+                f"(max {self.max_upstream})",
+            )
+
+
+class NamingRule(Rule):
+    """
+    Models whose name does not match 'pattern' (snake case by default). With
+    'require_layer', mapped layer names (e.g. 'source_', 'staging_') are also required
+    as prefix, except for the names listed in 'allowed' (e.g. 'start', 'end').
+    """
+
+    name = "naming"
+
+    def __init__(
+        self,
+        pattern: str = r"[a-z][a-z0-9]*(_[a-z0-9]+)*",
+        require_layer: bool = False,
+        allowed: Iterable[str] = ("start", "end"),
+    ):
+        self.pattern = re.compile(pattern)
+        self.require_layer = require_layer
+        self.allowed = set(allowed)
+
+    def visit_node(self, context: RuleContext, node: int) -> None:
+        graph = context.graph
+        name = graph.name(node)
+        if name in self.allowed:
+            return
+        if not self.pattern.fullmatch(name):
+            context.report(self, node, f"'{name}' does not match '{self.pattern.pattern}'")
+        elif self.require_layer and graph.layer_of(node) not in context.layer_ranks:
+            context.report(self, node, f"'{name}' is not prefixed by a known layer")
+
+
+class LayerSkipRule(Rule):
+    """
+    Direct dependencies skipping a layer of the layer mapping.
+    # i.e. with {'staging': 'source', 'landing': 'staging'}
+    source_a >> landing_a -> "'source_a' >> 'landing_a' skips layer 'staging'"
+    """
+
+    name = "layer_skip"
+
+    def visit_edge(self, context: RuleContext, upstream_node: int, downstream_node: int) -> None:
+        graph = context.graph
+        ranks = context.layer_ranks
+        upstream_rank = ranks.get(graph.layer_of(upstream_node))
+        downstream_rank = ranks.get(graph.layer_of(downstream_node))
+        if upstream_rank is None or downstream_rank is None:
+            return
+        if downstream_rank - upstream_rank > 1:
+            context.report(
+                self,
+                downstream_node,
+                f"'{graph.name(upstream_node)}' >> '{graph.name(downstream_node)}' skips layer "
+                f"'{context.upstream_layer_mapping[graph.layer_of(downstream_node)]}'",
+            )
+
+
+class ChainDepthRule(Rule):
+    """
+    Dependency chains longer than 'max_depth' tasks, reported once at the first task
+    beyond the limit.
+    """
+
+    name = "chain_depth"
+
+    def __init__(self, max_depth: int = 50):
+        self.max_depth = max_depth
+
+    def start(self, context: RuleContext) -> None:
+        # Longest chain ending at each node, final once all its upstream edges are visited
+        context.state[self] = [1] * len(context.graph)
+
+    def visit_edge(self, context: RuleContext, upstream_node: int, downstream_node: int) -> None:
+        depths = context.state[self]
+        if depths[upstream_node] + 1 > depths[downstream_node]:
+            depths[downstream_node] = depths[upstream_node] + 1
+
+    def visit_node(self, context: RuleContext, node: int) -> None:
+        depths = context.state[self]
+        if depths[node] == self.max_depth + 1:
+            context.report(
+                self,
+                node,
+                f"'{context.graph.name(node)}' ends a chain of {depths[node]} tasks "
+                f"(max {self.max_depth})",
+            )
+
+
+def default_rules() -> List[Rule]:
+    """
+    The checks of the test suite: orphaned models and upstream layer prefixes.
+    """
+    return [OrphanRule(), UpstreamPrefixRule()]
+
+
+class RuleEngine:
+    """
+    Evaluate a set of rules over DAG graphs, sharing one traversal per graph.
+    # i.e.
+    RuleEngine([OrphanRule(), FanInRule(max_upstream=5), ChainDepthRule(max_depth=20)])
+    """
+
+    def __init__(
+        self,
+        rules: Optional[List[Rule]] = None,
+        upstream_layer_mapping: Optional[Dict[str, str]] = None,
+    ):
+        self.rules = rules if rules is not None else default_rules()
+        if upstream_layer_mapping is None:
+            upstream_layer_mapping = DEFAULT_UPSTREAM_LAYER_MAPPING
+        self.upstream_layer_mapping = dict(upstream_layer_mapping)
+        self.layer_ranks = _layer_ranks(self.upstream_layer_mapping)
+
+        # Bind only the overridden visitors, a rule without edge checks costs nothing per edge
+        self._node_visitors = [
+            rule.visit_node for rule in self.rules if type(rule).visit_node is not Rule.visit_node
+        ]
+        self._edge_visitors = [
+            rule.visit_edge for rule in self.rules if type(rule).visit_edge is not Rule.visit_edge
+        ]
+
+    def evaluate(
+        self, graph: DependencyGraph, layer_maps: Optional[Dict[str, Dict[str, set]]] = None
+    ) -> RuleResults:
+        """
+        Evaluate every rule over one graph, returning {layer: {rule: [messages]}}.
+        'layer_maps' are the resolved lineage of the graph, e.g. LineageEngine.resolve(graph).
+        Raises DependencyCycleError if the graph has a cycle.
+        """
+        context = RuleContext(
+            graph, layer_maps or {}, self.upstream_layer_mapping, self.layer_ranks
+        )
+        for rule in self.rules:
+            rule.start(context)
+
+        node_visitors = self._node_visitors
+        edge_visitors = self._edge_visitors
+        kinds = graph.kinds
+        for node in graph.topological_order():
+            if kinds[node] == PASSTHROUGH:
+                context.through[node] = dict.fromkeys(context.upstream_models(node))
+                continue
+            if edge_visitors:
+                for upstream_node in context.upstream_models(node):
+                    for visit_edge in edge_visitors:
+                        visit_edge(context, upstream_node, node)
+            for visit_node in node_visitors:
+                visit_node(context, node)
+
+        for rule in self.rules:
+            rule.finish(context)
+        return context.results()
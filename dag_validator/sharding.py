@@ -0,0 +1,210 @@
+"""
+Split DAG validation across CI nodes and merge their partial results.
+
+Every node validates one shard of the DAG files and writes a partial result file,
+then a single merge step rebuilds the (results, layer_dependencies) pair returned by
+'process_dag_folder' from every partial result.
+"""
+import heapq
+import json
+import os
+import tempfile
+import zlib
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple, Union
+
+from dag_validator import __version__
+
+PARTIAL_RESULT_FORMAT = "dag-validator-partial"
+
+# 'hash' keeps every file on the same shard whatever else changes in the folder,
+# 'cost' balances the shards by file size but needs the whole folder listed first
+SHARD_STRATEGIES = ("hash", "cost")
+
+
+def parse_shard(shard: str) -> Tuple[int, int]:
+    """
+    Parse a shard specification, numbered from 1
+    # i.e.
+    '2/4' -> (2, 4)
+    """
+    index, separator, count = shard.partition("/")
+    try:
+        index, count = int(index), int(count)
+    except ValueError:
+        index, count = 0, 0
+    if not separator or not 1 <= index <= count:
+        raise ValueError(f"Invalid shard '{shard}', expected i/N with 1 <= i <= N")
+    return index, count
+
+
+def hash_shard(dag_name: str, shard_count: int) -> int:
+    """
+    Return the shard of a DAG file (from 0) by a hash of its name that is stable across
+    processes and machines, unlike the built-in hash() of strings.
+    """
+    return zlib.crc32(dag_name.encode()) % shard_count
+
+
+def assign_shards_by_cost(costs: Dict[str, int], shard_count: int) -> Dict[str, int]:
+    """
+    Assign every DAG file to one of 'shard_count' shards (from 0) of about the same total
+    cost, placing the most expensive files first into the currently cheapest shard.
+    """
+    shard_costs = [(0, shard) for shard in range(max(shard_count, 1))]
+    assignment = {}
+    for dag_name in sorted(costs, key=lambda dag_name: (-costs[dag_name], dag_name)):
+        shard_cost, shard = heapq.heappop(shard_costs)
+        assignment[dag_name] = shard
+        heapq.heappush(shard_costs, (shard_cost + costs[dag_name], shard))
+    return assignment
+
+
+def select_shard(
+    dag_files: Iterable[Path],
+    dag_name: Callable[[Path], str],
+    shard: Tuple[int, int],
+    strategy: str = "hash",
+) -> Iterator[Path]:
+    """
+    Yield the DAG files of shard (i, N), in their discovery order.
+    """
+    index, count = shard
+    if strategy == "hash":
+        return (
+            dag_path for dag_path in dag_files if hash_shard(dag_name(dag_path), count) == index - 1
+        )
+    if strategy == "cost":
+        dag_files = list(dag_files)
+        assignment = assign_shards_by_cost(
+            {dag_name(dag_path): os.path.getsize(dag_path) for dag_path in dag_files}, count
+        )
+        return (dag_path for dag_path in dag_files if assignment[dag_name(dag_path)] == index - 1)
+    raise ValueError(f"Unknown shard strategy '{strategy}', expected one of {SHARD_STRATEGIES}")
+
+
+class PartialResult:
+    """
+    Validation results of the DAG files of one shard.
+    """
+
+    def __init__(
+        self,
+        shard: Tuple[int, int],
+        upstream_layer_mapping: Dict[str, str],
+        results: Dict[str, Dict[str, List[str]]],
+        layer_dependencies: Dict[str, Dict[str, Dict[str, set]]],
+        file_errors: Dict[str, str],
+    ):
+        self.shard = shard
+        self.upstream_layer_mapping = upstream_layer_mapping
+        self.results = results
+        self.layer_dependencies = layer_dependencies
+        self.file_errors = file_errors
+
+    def write(self, path: Union[str, Path]) -> None:
+        """
+        Write the partial result as JSON, atomically so a failed job leaves no half file.
+        """
+        document = {
+            "format": PARTIAL_RESULT_FORMAT,
+            "version": __version__,
+            "shard": list(self.shard),
+            "upstream_layer_mapping": self.upstream_layer_mapping,
+            "results": self.results,
+            "layer_dependencies": {
+                layer: {
+                    dag: {model: sorted(upstream) for model, upstream in layer_map.items()}
+                    for dag, layer_map in dag_layer_maps.items()
+                }
+                for layer, dag_layer_maps in self.layer_dependencies.items()
+            },
+            "file_errors": self.file_errors,
+        }
+
+        path = Path(path)
+        file_descriptor, temp_path = tempfile.mkstemp(
+            dir=path.parent, prefix=f".{path.name}", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(file_descriptor, "w") as file:
+                json.dump(document, file, separators=(",", ":"))
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+    @classmethod
+    def read(cls, path: Union[str, Path]) -> "PartialResult":
+        with open(path, "r") as file:
+            document = json.load(file)
+        if document.get("format") != PARTIAL_RESULT_FORMAT:
+            raise ValueError(f"{path} is not a partial DAG validation result")
+        if document["version"] != __version__:
+            raise ValueError(
+                f"{path} was written by validator {document['version']}, not {__version__}"
+            )
+
+        layer_dependencies = {
+            layer: {
+                dag: {model: set(upstream) for model, upstream in layer_map.items()}
+                for dag, layer_map in dag_layer_maps.items()
+            }
+            for layer, dag_layer_maps in document["layer_dependencies"].items()
+        }
+        return cls(
+            tuple(document["shard"]),
+            document["upstream_layer_mapping"],
+            document["results"],
+            layer_dependencies,
+            document["file_errors"],
+        )
+
+
+def merge_partial_results(
+    partial_results: List[PartialResult],
+) -> Tuple[Dict[str, Dict[str, List[str]]], Dict[str, Dict[str, set]]]:
+    """
+    Merge the partial results of every shard into the (results, layer_dependencies) pair
+    returned by 'process_dag_folder', with DAG files in name order.
+
+    Raises ValueError when shards are missing, duplicated or disagree on their layers,
+    and reports the DAG files that failed on any shard together, as a single run would.
+    """
+    if not partial_results:
+        raise ValueError("No partial results to merge")
+
+    shard_count = partial_results[0].shard[1]
+    upstream_layer_mapping = partial_results[0].upstream_layer_mapping
+    shards = sorted(partial.shard for partial in partial_results)
+    if any(partial.shard[1] != shard_count for partial in partial_results):
+        raise ValueError(f"Partial results of different shard counts: {shards}")
+    if any(partial.upstream_layer_mapping != upstream_layer_mapping for partial in partial_results):
+        raise ValueError("Partial results were validated with different layer mappings")
+    missing = sorted(set(range(1, shard_count + 1)) - {index for index, _ in shards})
+    if missing or len(shards) != shard_count:
+        raise ValueError(
+            f"Expected one partial result per shard of {shard_count}, "
+            f"got {shards} (missing {missing})"
+        )
+
+    layers = list(partial_results[0].results)
+    results = {layer: {} for layer in layers}
+    layer_dependencies = {layer: {} for layer in layers}
+    file_errors = {}
+    for partial in partial_results:
+        file_errors.update(partial.file_errors)
+        for layer in layers:
+            results[layer].update(partial.results[layer])
+            layer_dependencies[layer].update(partial.layer_dependencies[layer])
+
+    if file_errors:
+        errors = "\n".join(
+            f"- {dag_name}: {error}" for dag_name, error in sorted(file_errors.items())
+        )
+        raise ValueError(f"{len(file_errors)} DAG file(s) failed validation:\n{errors}")
+
+    for layer in layers:
+        results[layer] = dict(sorted(results[layer].items()))
+        layer_dependencies[layer] = dict(sorted(layer_dependencies[layer].items()))
+    return results, layer_dependencies
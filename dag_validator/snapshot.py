@@ -0,0 +1,392 @@
+import struct
+import sys
+from array import array
+from itertools import accumulate
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+# Layer map entry of one model: (layer, dag, model)
+MappingKey = Tuple[str, str, str]
+# Mapped upstream edge: (layer, dag, model, upstream model)
+MappingEdge = Tuple[str, str, str, str]
+
+SNAPSHOT_MAGIC = b"DAGSNAP1"
+# Magic, string count, DAG block count, model count, upstream count
+SNAPSHOT_HEADER = struct.Struct("<8sIIII")
+
+
+def _to_little_endian(values: array) -> bytes:
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _from_little_endian(data: bytes) -> array:
+    values = array("I")
+    values.frombytes(data)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+
+class SnapshotDiff:
+    """
+    Changes between a baseline snapshot and a new run, proportional to the change.
+    """
+
+    def __init__(self):
+        self.added_edges: List[MappingEdge] = []
+        self.removed_edges: List[MappingEdge] = []
+        self.new_orphans: List[MappingKey] = []
+        self.changed_mappings: Dict[MappingKey, Tuple[Set[str], Set[str]]] = {}
+
+    def __bool__(self) -> bool:
+        return bool(
+            self.added_edges or self.removed_edges or self.new_orphans or self.changed_mappings
+        )
+
+    def format(self) -> str:
+        """
+        Format the changes for CI output
+        # i.e.
+        + staging_to_source example_dag.py: staging_task_a2 <- source_task_a9
+        ! staging_to_source example_dag.py: staging_task_e1 is orphaned
+        """
+        lines = []
+        lines.extend(
+            f"+ {layer} {dag}: {model} <- {upstream}"
+            for layer, dag, model, upstream in self.added_edges
+        )
+        lines.extend(
+            f"- {layer} {dag}: {model} <- {upstream}"
+            for layer, dag, model, upstream in self.removed_edges
+        )
+        lines.extend(
+            f"! {layer} {dag}: {model} is orphaned" for layer, dag, model in self.new_orphans
+        )
+        lines.extend(
+            f"~ {layer} {dag}: {model} {sorted(old_upstream)} -> {sorted(new_upstream)}"
+            for (layer, dag, model), (old_upstream, new_upstream) in self.changed_mappings.items()
+        )
+        return "\n".join(lines)
+
+
+class Snapshot:
+    """
+    Compact, binary snapshot of the layer maps of every DAG.
+
+    All layer, DAG and model names are interned into one sorted string table, so integer
+    IDs sort like the names themselves. Each (layer, dag) block owns a sorted slice of the
+    model ID array, and each model a sorted slice of the upstream ID array (an empty slice
+    is an orphaned model). Two snapshots are compared by a single merge, where unchanged
+    DAG blocks are skipped with array comparisons and only changed ones are decoded.
+    """
+
+    def __init__(
+        self,
+        names: List[str],
+        dag_keys: array,
+        dag_offsets: array,
+        models: array,
+        upstream_counts: array,
+        upstream: array,
+    ):
+        self.names = names
+        self.dag_keys = dag_keys
+        self.dag_offsets = dag_offsets
+        self.models = models
+        self.upstream_counts = upstream_counts
+        self.upstream = upstream
+        self.offsets = array("I", accumulate(upstream_counts, initial=0))
+
+    @classmethod
+    def from_layer_dependencies(
+        cls, layer_dependencies: Dict[str, Dict[str, Dict[str, set]]]
+    ) -> "Snapshot":
+        names = set()
+        for layer, dag_group in layer_dependencies.items():
+            names.add(layer)
+            for dag, layer_map in dag_group.items():
+                names.add(dag)
+                for model, upstream_models in layer_map.items():
+                    names.add(model)
+                    names.update(upstream_models)
+        names = sorted(names)
+        ids = {name: name_id for name_id, name in enumerate(names)}
+
+        # Names sort like their IDs, so sorting each level emits everything in key order
+        dag_keys, dag_offsets = array("I"), array("I", [0])
+        models, upstream_counts, upstream = array("I"), array("I"), array("I")
+        for layer in sorted(layer_dependencies):
+            dag_group = layer_dependencies[layer]
+            for dag in sorted(dag_group):
+                layer_map = dag_group[dag]
+                for model in sorted(layer_map):
+                    models.append(ids[model])
+                    upstream_counts.append(len(layer_map[model]))
+                    upstream.extend(
+                        sorted(ids[upstream_model] for upstream_model in layer_map[model])
+                    )
+                dag_keys.extend((ids[layer], ids[dag]))
+                dag_offsets.append(len(models))
+        return cls(names, dag_keys, dag_offsets, models, upstream_counts, upstream)
+
+    def __len__(self) -> int:
+        return len(self.models)
+
+    def entries(self) -> Iterator[Tuple[MappingKey, List[str]]]:
+        names = self.names
+        for block in range(len(self.dag_offsets) - 1):
+            layer, dag = (names[name_id] for name_id in self.dag_keys[block * 2:block * 2 + 2])
+            for index in range(self.dag_offsets[block], self.dag_offsets[block + 1]):
+                upstream_ids = self.upstream[self.offsets[index]:self.offsets[index + 1]]
+                yield (
+                    (layer, dag, names[self.models[index]]),
+                    [names[upstream_id] for upstream_id in upstream_ids],
+                )
+
+    def to_layer_dependencies(self) -> Dict[str, Dict[str, Dict[str, set]]]:
+        layer_dependencies = {}
+        for (layer, dag, model), upstream_models in self.entries():
+            layer_map = layer_dependencies.setdefault(layer, {}).setdefault(dag, {})
+            layer_map[model] = set(upstream_models)
+        return layer_dependencies
+
+    def write(self, path: str) -> None:
+        encoded_names = [name.encode() for name in self.names]
+        with open(path, "wb") as file:
+            file.write(
+                SNAPSHOT_HEADER.pack(
+                    SNAPSHOT_MAGIC,
+                    len(self.names),
+                    len(self.dag_offsets) - 1,
+                    len(self),
+                    len(self.upstream),
+                )
+            )
+            file.write(_to_little_endian(array("I", map(len, encoded_names))))
+            file.write(b"".join(encoded_names))
+            for values in (
+                self.dag_keys,
+                self.dag_offsets,
+                self.models,
+                self.upstream_counts,
+                self.upstream,
+            ):
+                file.write(_to_little_endian(values))
+
+    @classmethod
+    def read(cls, path: str) -> "Snapshot":
+        with open(path, "rb") as file:
+            data = file.read()
+
+        magic, name_count, dag_count, model_count, upstream_count = (
+            SNAPSHOT_HEADER.unpack_from(data)
+        )
+        if magic != SNAPSHOT_MAGIC:
+            raise ValueError(f"{path} is not a DAG validation snapshot.")
+
+        position = SNAPSHOT_HEADER.size
+
+        def read_array(count: int) -> array:
+            nonlocal position
+            values = _from_little_endian(data[position:position + count * 4])
+            position += count * 4
+            return values
+
+        names = []
+        for length in read_array(name_count):
+            names.append(data[position:position + length].decode())
+            position += length
+        return cls(
+            names,
+            dag_keys=read_array(dag_count * 2),
+            dag_offsets=read_array(dag_count + 1),
+            models=read_array(model_count),
+            upstream_counts=read_array(model_count),
+            upstream=read_array(upstream_count),
+        )
+
+    def _union_ranks(self, baseline: "Snapshot") -> Tuple[List[str], array, array]:
+        """
+        Merge both sorted string tables into one, returning it with the rank of every name
+        ID of this snapshot and of the baseline in the merged table.
+        """
+        names, ranks, baseline_ranks = [], array("I"), array("I")
+        index, baseline_index = 0, 0
+        while index < len(self.names) or baseline_index < len(baseline.names):
+            if baseline_index >= len(baseline.names) or (
+                index < len(self.names) and self.names[index] < baseline.names[baseline_index]
+            ):
+                ranks.append(len(names))
+                names.append(self.names[index])
+                index += 1
+            elif index >= len(self.names) or baseline.names[baseline_index] < self.names[index]:
+                baseline_ranks.append(len(names))
+                names.append(baseline.names[baseline_index])
+                baseline_index += 1
+            else:
+                ranks.append(len(names))
+                baseline_ranks.append(len(names))
+                names.append(self.names[index])
+                index += 1
+                baseline_index += 1
+        return names, ranks, baseline_ranks
+
+    def diff(self, baseline: "Snapshot") -> SnapshotDiff:
+        """
+        Compare this snapshot against a baseline in one linear merge of the sorted DAG
+        blocks and, within changed blocks only, of their sorted models.
+        Models only in this snapshot add all their edges, models only in the baseline remove
+        them, and models in both report a changed mapping when their upstream models differ.
+        """
+        # Translate both snapshots into one merged string table, so IDs compare across them
+        if self.names == baseline.names:
+            names, current, previous = self.names, self._translated(), baseline._translated()
+        else:
+            names, ranks, baseline_ranks = self._union_ranks(baseline)
+            current = self._translated(ranks)
+            previous = baseline._translated(baseline_ranks)
+
+        diff = SnapshotDiff()
+        block, baseline_block = 0, 0
+        block_count = len(self.dag_offsets) - 1
+        baseline_block_count = len(baseline.dag_offsets) - 1
+
+        while block < block_count or baseline_block < baseline_block_count:
+            if block < block_count:
+                dag_key = current["dag_keys"][block * 2:block * 2 + 2]
+            if baseline_block < baseline_block_count:
+                baseline_dag_key = previous["dag_keys"][baseline_block * 2:baseline_block * 2 + 2]
+
+            if baseline_block >= baseline_block_count or (
+                block < block_count and dag_key < baseline_dag_key
+            ):
+                entries = self.dag_offsets[block:block + 2]
+                self._diff_models(diff, names, dag_key, current, entries, previous, (0, 0))
+                block += 1
+            elif block >= block_count or baseline_dag_key < dag_key:
+                entries = baseline.dag_offsets[baseline_block:baseline_block + 2]
+                self._diff_models(diff, names, baseline_dag_key, current, (0, 0), previous, entries)
+                baseline_block += 1
+            else:
+                entries = self.dag_offsets[block:block + 2]
+                baseline_entries = baseline.dag_offsets[baseline_block:baseline_block + 2]
+                if not self._same_block(current, entries, previous, baseline_entries):
+                    self._diff_models(
+                        diff, names, dag_key, current, entries, previous, baseline_entries
+                    )
+                block += 1
+                baseline_block += 1
+
+        return diff
+
+    def _translated(self, ranks: Optional[array] = None) -> Dict[str, array]:
+        # Without ranks, both snapshots share the same string table and IDs already compare
+        def translate(values: array) -> array:
+            return values if ranks is None else array("I", map(ranks.__getitem__, values))
+
+        return {
+            "dag_keys": translate(self.dag_keys),
+            "models": translate(self.models),
+            "upstream": translate(self.upstream),
+            "upstream_counts": self.upstream_counts,
+            "offsets": self.offsets,
+        }
+
+    @staticmethod
+    def _same_block(
+        current: Dict[str, array],
+        entries: Tuple[int, int],
+        previous: Dict[str, array],
+        baseline_entries: Tuple[int, int],
+    ) -> bool:
+        (start, end), (baseline_start, baseline_end) = entries, baseline_entries
+        return (
+            current["models"][start:end] == previous["models"][baseline_start:baseline_end]
+            and current["upstream_counts"][start:end]
+            == previous["upstream_counts"][baseline_start:baseline_end]
+            and current["upstream"][current["offsets"][start]:current["offsets"][end]]
+            == previous["upstream"][
+                previous["offsets"][baseline_start]:previous["offsets"][baseline_end]
+            ]
+        )
+
+    def _diff_models(
+        self,
+        diff: SnapshotDiff,
+        names: List[str],
+        dag_key: array,
+        current: Dict[str, array],
+        entries: Tuple[int, int],
+        previous: Dict[str, array],
+        baseline_entries: Tuple[int, int],
+    ) -> None:
+        # Merge the sorted models of one DAG block, decoding only the changed ones
+        layer, dag = names[dag_key[0]], names[dag_key[1]]
+        (index, end), (baseline_index, baseline_end) = entries, baseline_entries
+
+        def upstream_models(snapshot: Dict[str, array], entry: int) -> List[str]:
+            offsets = snapshot["offsets"]
+            upstream_ids = snapshot["upstream"][offsets[entry]:offsets[entry + 1]]
+            return [names[upstream_id] for upstream_id in upstream_ids]
+
+        while index < end or baseline_index < baseline_end:
+            if index < end:
+                model = current["models"][index]
+            if baseline_index < baseline_end:
+                baseline_model = previous["models"][baseline_index]
+
+            if baseline_index >= baseline_end or (index < end and model < baseline_model):
+                # New model
+                key = (layer, dag, names[model])
+                new_upstream = upstream_models(current, index)
+                diff.added_edges.extend((*key, upstream) for upstream in new_upstream)
+                if not new_upstream:
+                    diff.new_orphans.append(key)
+                index += 1
+            elif index >= end or baseline_model < model:
+                # Removed model
+                key = (layer, dag, names[baseline_model])
+                diff.removed_edges.extend(
+                    (*key, upstream) for upstream in upstream_models(previous, baseline_index)
+                )
+                baseline_index += 1
+            else:
+                new_upstream = upstream_models(current, index)
+                old_upstream = upstream_models(previous, baseline_index)
+                if new_upstream != old_upstream:
+                    self._diff_upstream(
+                        diff, (layer, dag, names[model]), new_upstream, old_upstream
+                    )
+                index += 1
+                baseline_index += 1
+
+    def _diff_upstream(
+        self,
+        diff: SnapshotDiff,
+        key: MappingKey,
+        upstream_models: List[str],
+        baseline_upstream_models: List[str],
+    ) -> None:
+        # Both upstream lists are sorted, merge them to find added and removed edges
+        index, baseline_index = 0, 0
+        while index < len(upstream_models) or baseline_index < len(baseline_upstream_models):
+            if baseline_index >= len(baseline_upstream_models) or (
+                index < len(upstream_models)
+                and upstream_models[index] < baseline_upstream_models[baseline_index]
+            ):
+                diff.added_edges.append((*key, upstream_models[index]))
+                index += 1
+            elif index >= len(upstream_models) or (
+                baseline_upstream_models[baseline_index] < upstream_models[index]
+            ):
+                diff.removed_edges.append((*key, baseline_upstream_models[baseline_index]))
+                baseline_index += 1
+            else:
+                index += 1
+                baseline_index += 1
+
+        diff.changed_mappings[key] = (set(baseline_upstream_models), set(upstream_models))
+        if not upstream_models:
+            diff.new_orphans.append(key)
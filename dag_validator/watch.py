@@ -0,0 +1,187 @@
+"""
+Watch mode: keep parsed DAG graphs in memory and revalidate only changed files.
+
+Usage:
+python -m dag_validator.watch dags/ --interval 0.5
+"""
+import argparse
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from dag_validator.dag_validation import AirflowDAGValidation
+from dag_validator.dependency_graph import DependencyGraph
+from dag_validator.global_graph import GlobalDependencyGraph
+
+
+class WatchedDAG:
+    """
+    Last validation state of one DAG file.
+    """
+
+    def __init__(
+        self,
+        signature: Tuple[int, int],
+        graph: Optional[DependencyGraph],
+        result: Dict[str, List[str]],
+        layer_dependencies: Dict[str, Dict[str, set]],
+        error: Optional[str] = None,
+    ):
+        self.signature = signature
+        self.graph = graph
+        self.result = result
+        self.layer_dependencies = layer_dependencies
+        self.error = error
+
+
+class DAGFolderWatcher:
+    """
+    Poll 'dag_folder_path' of a validator and revalidate only the DAG files that changed.
+
+    Files are compared by modification time and size from a single folder scan, so a
+    poll of an unchanged 1,000-file folder costs a few milliseconds. Changed files are
+    re-parsed and re-mapped, every other file keeps its graph and results in memory.
+    With 'global_lineage' enabled on the validator, changed files are also merged into
+    one repository-wide graph, replacing only the edges each file contributed.
+    """
+
+    def __init__(
+        self,
+        validator: AirflowDAGValidation,
+        on_change: Optional[Callable[[str, Optional[WatchedDAG]], None]] = None,
+    ):
+        self.validator = validator
+        self.on_change = on_change if on_change is not None else self.report_change
+        self.dags: Dict[str, WatchedDAG] = {}
+        self.global_graph = GlobalDependencyGraph() if validator.global_lineage else None
+
+    def _scan(self) -> Dict[str, Tuple[Path, Tuple[int, int]]]:
+        signatures = {}
+        for dag_path in self.validator.iter_dag_files():
+            try:
+                stat = dag_path.stat()
+            except FileNotFoundError:
+                continue  # removed between the directory listing and the stat
+            signatures[self.validator.dag_name(dag_path)] = (
+                dag_path,
+                (stat.st_mtime_ns, stat.st_size),
+            )
+        return signatures
+
+    def poll(self) -> List[str]:
+        """
+        Revalidate added or modified DAG files, forget removed ones and return their names.
+        """
+        signatures = self._scan()
+        changed = []
+
+        for dag_name in sorted(set(self.dags) - set(signatures)):
+            del self.dags[dag_name]
+            if self.global_graph is not None:
+                self.global_graph.remove_file(dag_name)
+            changed.append(dag_name)
+            self.on_change(dag_name, None)
+
+        for dag_name, (dag_path, signature) in sorted(signatures.items()):
+            watched = self.dags.get(dag_name)
+            if watched is not None and watched.signature == signature:
+                continue
+
+            watched = self.validate(dag_path, signature)
+            self.dags[dag_name] = watched
+            if self.global_graph is not None:
+                self._merge_global_graph(dag_name, dag_path, watched)
+            changed.append(dag_name)
+            self.on_change(dag_name, watched)
+
+        return changed
+
+    def validate(self, dag_path: Path, signature: Tuple[int, int]) -> WatchedDAG:
+        try:
+            graph = self.validator.parse_dag_file(dag_path)
+            result, layer_dependencies = self.validator.process_dag_graph(dag_path, graph)
+        except Exception as error:
+            return WatchedDAG(signature, None, {}, {}, f"{type(error).__name__}: {error}")
+        return WatchedDAG(signature, graph, result, layer_dependencies)
+
+    def _merge_global_graph(self, dag_name: str, dag_path: Path, watched: WatchedDAG) -> None:
+        if watched.graph is None:
+            self.global_graph.remove_file(dag_name)
+            return
+        try:
+            links = self.validator.parse_cross_dag_links(dag_path)
+            self.global_graph.update_file(dag_name, watched.graph, links)
+        except Exception as error:  # e.g. a DAG ID already declared by another file
+            watched.error = f"{type(error).__name__}: {error}"
+            self.global_graph.remove_file(dag_name)
+
+    def results(
+        self,
+    ) -> Tuple[Dict[str, Dict[str, List[str]]], Dict[str, Dict[str, set]]]:
+        """
+        Return the current results in the same structure as 'process_dag_folder'.
+        """
+        if self.global_graph is not None:
+            return self.validator.process_global_graph(self.global_graph)
+
+        results = {layer: {} for layer in self.validator.layer_functions.keys()}
+        layer_dependencies = {layer: {} for layer in self.validator.layer_functions.keys()}
+        for dag_name, watched in sorted(self.dags.items()):
+            for layer in watched.result:
+                results[layer][dag_name] = watched.result[layer]
+                layer_dependencies[layer][dag_name] = watched.layer_dependencies[layer]
+        return results, layer_dependencies
+
+    def report_change(self, dag_name: str, watched: Optional[WatchedDAG]) -> None:
+        if watched is None:
+            print(f"\n--- Removed '{dag_name}'")
+            return
+        if watched.error is not None:
+            print(f"\n!!! Failed to validate '{dag_name}': {watched.error}")
+            return
+
+        print(f"\n+++ Validated '{dag_name}'")
+        for layer, orphaned_models in watched.result.items():
+            print(f"*** {layer}: orphaned models {orphaned_models}")
+            for model, upstream_models in sorted(watched.layer_dependencies[layer].items()):
+                print(f"    {model}: {sorted(upstream_models)}")
+
+    def run(self, interval: float = 0.5, iterations: Optional[int] = None) -> None:
+        """
+        Poll forever (or 'iterations' times), sleeping 'interval' seconds between polls.
+        """
+        count = 0
+        while iterations is None or count < iterations:
+            start = time.perf_counter()
+            changed = self.poll()
+            if changed:
+                elapsed = (time.perf_counter() - start) * 1000
+                print(f"\n=== Revalidated {len(changed)} file(s) in {elapsed:.1f} ms")
+            count += 1
+            time.sleep(interval)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("dag_folder_path", nargs="?", default="dags/")
+    parser.add_argument("--interval", type=float, default=0.5, help="seconds between polls")
+    parser.add_argument(
+        "--global-lineage",
+        action="store_true",
+        help="resolve ExternalTaskSensor and Dataset links across DAG files",
+    )
+    args = parser.parse_args()
+
+    watcher = DAGFolderWatcher(
+        AirflowDAGValidation(
+            args.dag_folder_path, quiet=True, global_lineage=args.global_lineage
+        )
+    )
+    try:
+        watcher.run(interval=args.interval)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
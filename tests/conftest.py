@@ -1,5 +1,37 @@
+import textwrap
+
 import pytest
 from dag_validator.dag_validation import AirflowDAGValidation
+from dag_validator.lineage import DEFAULT_UPSTREAM_LAYER_MAPPING
+
+# One 'test_dag_output.py' item per DAG file and layer, validating each DAG file once
+pytest_plugins = ["dag_validator.pytest_plugin", "pytester"]
+
+# Three DAGs linked by an ExternalTaskSensor (reporting on sales) and a Dataset (crm)
+SALES_DAG = """
+with DAG("sales", schedule=None) as dag:
+    source_orders = DummyOperator(task_id="source_orders", outlets=[Dataset("s3://sales/orders")])
+    staging_orders = DummyOperator(task_id="staging_orders")
+    source_orders >> staging_orders
+"""
+
+CRM_DAG = """
+customers = Dataset("s3://crm/customers")
+dag = DAG(dag_id="crm")
+source_customers = DummyOperator(task_id="source_customers", outlets=[customers], dag=dag)
+source_customers >> staging_customers_raw
+"""
+
+REPORTING_DAG = """
+with DAG("reporting", schedule=[Dataset("s3://crm/customers")]) as dag:
+    wait_for_orders = ExternalTaskSensor(
+        task_id="wait_for_orders",
+        external_dag_id="sales",
+        external_task_id="source_orders",
+    )
+    wait_for_orders >> staging_report >> landing_report
+    staging_customers >> landing_report
+"""
 
 
 @pytest.fixture
@@ -20,4 +52,16 @@ def expected_orphaned_all_models_with_no_upstream():
 
 @pytest.fixture
 def expected_prefix_mapping():
-    return {"landing": "staging", "staging": "source"}
+    return dict(DEFAULT_UPSTREAM_LAYER_MAPPING)
+
+
+@pytest.fixture
+def linked_dag_sources():
+    return {"sales.py": SALES_DAG, "crm.py": CRM_DAG, "reporting.py": REPORTING_DAG}
+
+
+@pytest.fixture
+def linked_dag_folder(tmp_path, linked_dag_sources):
+    for name, source in linked_dag_sources.items():
+        (tmp_path / name).write_text(textwrap.dedent(source))
+    return tmp_path
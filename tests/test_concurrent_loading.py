@@ -0,0 +1,65 @@
+import threading
+import time
+
+import pytest
+
+from dag_validator.dag_validation import AirflowDAGValidation
+from dag_validator.loader import ConcurrentFileLoader, read_file_bytes
+
+
+@pytest.fixture
+def dag_folder(tmp_path):
+    source = open("dags/example_dag.py").read()
+    for index in range(12):
+        (tmp_path / f"example_dag_{index:02d}.py").write_text(source)
+    (tmp_path / "helpers.py").write_text("RETRIES = 3\n")
+    return tmp_path
+
+
+def test_concurrent_loading_matches_serial_results(dag_folder):
+    """
+    Test method to check files loaded on the thread pool are validated like serial reads
+    """
+    active, peak = [0], [0]
+    lock = threading.Lock()
+
+    def slow_reader(file_path):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.01)
+        with lock:
+            active[0] -= 1
+        return read_file_bytes(file_path)
+
+    serial = AirflowDAGValidation(dag_folder, quiet=True).process_dag_folder()
+    validator = AirflowDAGValidation(dag_folder, io_workers=4, reader=slow_reader, quiet=True)
+
+    assert validator.process_dag_folder() == serial
+    assert 1 < peak[0] <= 4
+    assert validator.metrics.counters["skipped_files"] == 1
+
+
+def test_loader_bounds_reads_in_flight(tmp_path):
+    """
+    Test method to check the loader never submits more than 'max_in_flight' reads ahead
+    """
+    paths = [tmp_path / f"file_{index}.py" for index in range(20)]
+    for path in paths:
+        path.write_text(path.name)
+    requested = []
+
+    def reader(file_path):
+        requested.append(file_path)
+        return read_file_bytes(file_path)
+
+    loader = ConcurrentFileLoader(reader, max_workers=2, max_in_flight=3)
+    loaded = loader.load(paths)
+    next(loaded)
+    # the initial window, refilled once for the reads completed so far
+    assert len(requested) <= 6
+    loaded.close()
+
+    assert sorted(ConcurrentFileLoader(max_workers=2).load(paths)) == [
+        (path, path.name.encode()) for path in sorted(paths)
+    ]
@@ -0,0 +1,67 @@
+import shutil
+
+from dag_validator.dag_validation import DAGFileResult, PARALLEL_MIN_FILES, AirflowDAGValidation
+
+
+def _copy_example_dag(path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    shutil.copy("dags/example_dag.py", path)
+
+
+def test_dag_files_are_discovered_recursively(tmp_path):
+    """
+    Test method to check nested DAG files are found, skipping caches, tests and hidden folders
+    """
+    for name in (
+        "example_dag.py",
+        "marketing/daily_dag.py",
+        "marketing/__pycache__/daily_dag.py",
+        "marketing/test_daily_dag.py",
+        "tests/conftest.py",
+        ".venv/lib/site.py",
+    ):
+        _copy_example_dag(tmp_path / name)
+    (tmp_path / "marketing" / "README.md").write_text("Marketing DAGs")
+
+    validator = AirflowDAGValidation(tmp_path, quiet=True)
+    assert [validator.dag_name(path) for path in validator.iter_dag_files()] == [
+        "example_dag.py",
+        "marketing/daily_dag.py",
+    ]
+
+    results, _ = validator.process_dag_folder()
+    assert list(results["staging_to_source"]) == ["example_dag.py", "marketing/daily_dag.py"]
+
+    flat_validator = AirflowDAGValidation(tmp_path, quiet=True, recursive=False)
+    assert [path.name for path in flat_validator.iter_dag_files()] == ["example_dag.py"]
+
+    filtered_validator = AirflowDAGValidation(
+        tmp_path, quiet=True, include=("marketing/*.py",), exclude=("__pycache__",)
+    )
+    assert [filtered_validator.dag_name(path) for path in filtered_validator.iter_dag_files()] == [
+        "marketing/daily_dag.py",
+        "marketing/test_daily_dag.py",
+    ]
+
+
+def test_dag_results_are_streamed_per_file(tmp_path):
+    """
+    Test method to check results are yielded per file, serially and from the process pool
+    """
+    for index in range(PARALLEL_MIN_FILES):
+        _copy_example_dag(tmp_path / f"group_{index % 4}" / f"example_dag_{index:03d}.py")
+
+    serial = AirflowDAGValidation(tmp_path, quiet=True).iter_dag_results()
+    first_result = next(serial)
+    assert isinstance(first_result, DAGFileResult)
+    assert first_result.dag_name == "group_0/example_dag_000.py"
+    assert first_result.results["staging_to_source"] == []
+    assert first_result.error is None
+
+    validator = AirflowDAGValidation(tmp_path, parallel=True, max_workers=2, quiet=True)
+    streamed = sorted(validator.iter_dag_results())
+    assert [dag_result.dag_name for dag_result in streamed] == [
+        first_result.dag_name,
+        *(dag_result.dag_name for dag_result in serial),
+    ]
+    assert all(dag_result.results == first_result.results for dag_result in streamed)
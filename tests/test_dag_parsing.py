@@ -0,0 +1,150 @@
+from dag_validator.dag_validation import AirflowDAGValidation
+from dag_validator.dependency_extractor import extract_dependencies, has_dependency_markers
+
+
+def test_parse_all_dependencies_expands_lists():
+    """
+    Test method to expand list dependencies into single edges
+
+    e.g. 'a >> [b, c] >> e'
+    Expected: 'a >> b', 'a >> c', 'b >> e', 'c >> e'
+    """
+    validator = AirflowDAGValidation("dags/")
+
+    assert validator.parse_all_dependencies("a >> [b, c] >> e") == [
+        "\n    a >> b",
+        "\n    a >> c",
+        "\n    b >> e",
+        "\n    c >> e",
+    ]
+    assert list(validator.iter_dependency_edges("[a, b] >> [c, d]")) == [
+        ("a", "c"),
+        ("a", "d"),
+        ("b", "c"),
+        ("b", "d"),
+    ]
+
+
+def test_dag_file_is_parsed_once_for_all_layers(monkeypatch):
+    """
+    Test method to check every registered layer shares a single parse of the DAG file
+    """
+    validator = AirflowDAGValidation("dags/")
+    validator.layer_functions["landing_to_staging_copy"] = (
+        validator.generate_landing_to_staging_upstream_dependencies
+    )
+
+    parse_calls = []
+    parse_dag_source = validator.parse_dag_source
+    monkeypatch.setattr(
+        validator,
+        "parse_dag_source",
+        lambda *args: parse_calls.append(1) or parse_dag_source(*args),
+    )
+    results, _ = validator.process_dag_folder()
+
+    assert len(parse_calls) == len(list(validator.dag_folder_path.glob("*.py")))
+    assert set(results) == set(validator.layer_functions)
+
+
+def test_extract_dependencies_from_all_declaration_styles():
+    """
+    Test method to extract edges from multi-line chains, '<<', set_upstream/set_downstream,
+    chain() and cross_downstream()
+    """
+    source = """
+from airflow.models.baseoperator import chain, cross_downstream
+
+# source_task_x >> staging_task_x is only a comment
+doc_md = '''
+source_task_y >> staging_task_y is only documentation
+'''
+(
+    source_task_a1
+    >> staging_task_a2
+)
+landing_task_a3 << staging_task_a2
+staging_task_b3.set_downstream(staging_task_b4)
+staging_task_b4.set_upstream([source_task_b1, source_task_b2])
+chain(source_task_c1, [staging_task_c2, staging_task_c3], [landing_task_c4, landing_task_c5])
+cross_downstream(from_tasks=[source_task_d1, source_task_d2], to_tasks=[staging_task_d3])
+"""
+    assert extract_dependencies(source) == [
+        ("source_task_a1", "staging_task_a2"),
+        ("staging_task_a2", "landing_task_a3"),
+        ("staging_task_b3", "staging_task_b4"),
+        ("source_task_b1", "staging_task_b4"),
+        ("source_task_b2", "staging_task_b4"),
+        ("source_task_c1", "staging_task_c2"),
+        ("source_task_c1", "staging_task_c3"),
+        ("staging_task_c2", "landing_task_c4"),
+        ("staging_task_c3", "landing_task_c5"),
+        ("source_task_d1", "staging_task_d3"),
+        ("source_task_d2", "staging_task_d3"),
+    ]
+
+
+def test_only_airflow_chain_functions_declare_dependencies():
+    """
+    Test method to check 'chain' from itertools is an ordinary call, while the Airflow
+    helpers count whether imported by name or called through their module
+    """
+    source = """
+from itertools import chain
+from airflow.models import baseoperator
+from airflow.utils.helpers import cross_downstream
+
+for table in chain(staging_tables, landing_tables):
+    print(table)
+baseoperator.chain(source_task_a1, staging_task_a2)
+cross_downstream([source_task_b1], [staging_task_b2])
+"""
+    assert extract_dependencies(source) == [
+        ("source_task_a1", "staging_task_a2"),
+        ("source_task_b1", "staging_task_b2"),
+    ]
+    assert extract_dependencies("chain(source_task_a1, staging_task_a2)\n") == []
+
+def test_extractor_matches_regex_parser_on_example_dag():
+    """
+    Test method to check the AST extractor and the legacy regex parser agree on the example DAG
+    """
+    validator = AirflowDAGValidation("dags/")
+    with open("dags/example_dag.py") as file:
+        dag_string = file.read()
+
+    assert list(validator.parse_dag_source(dag_string).edges()) == list(
+        validator.parse_dag_source_with_regex(dag_string).edges()
+    )
+
+
+def test_extractor_handles_very_long_chains():
+    """
+    Test method to check long '>>' chains do not hit the recursion limit
+    """
+    source = " >> ".join(f"staging_task_{index}" for index in range(2000))
+
+    assert len(extract_dependencies(source)) == 1999
+
+
+def test_dag_files_without_dependency_markers_are_skipped(tmp_path):
+    """
+    Test method to check helper, empty and undecodable files without markers are skipped
+    while DAG files are streamed line by line
+    """
+    (tmp_path / "helpers.py").write_text("def build_operator(task_id):\n    return task_id\n")
+    (tmp_path / "empty.py").write_bytes(b"")
+    (tmp_path / "generated.py").write_bytes(b"# \xff\xfe not utf-8\n")
+    validator = AirflowDAGValidation(tmp_path, quiet=True)
+
+    for name in ("helpers.py", "empty.py", "generated.py"):
+        assert not has_dependency_markers(tmp_path / name)
+        assert len(validator.parse_dag_file(tmp_path / name)) == 0
+    assert validator.metrics.counters["skipped_files"] == 3
+
+    assert has_dependency_markers("dags/example_dag.py")
+    with open("dags/example_dag.py") as file:
+        dag_string = file.read()
+    assert list(validator.parse_dag_file("dags/example_dag.py").edges()) == list(
+        validator.parse_dag_source(dag_string).edges()
+    )
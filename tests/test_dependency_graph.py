@@ -0,0 +1,111 @@
+from dag_validator import dependency_graph
+from dag_validator.dag_validation import AirflowDAGValidation
+from dag_validator.dependency_graph import DependencyGraph
+from dag_validator.rules import (
+    FanInRule,
+    LayerSkipRule,
+    OrphanRule,
+    RuleEngine,
+    UpstreamPrefixRule,
+)
+
+
+def test_graph_interns_models_and_indexes_layers():
+    """
+    Test method to check node interning, adjacency and the layer index
+    """
+    graph = DependencyGraph.from_dependency_string(
+        "\n    source_task_a1 >> staging_task_a2"
+        "\n    source_task_a1 >> staging_task_a2"
+        "\n    staging_task_a2 >> landing_task_a3"
+    )
+
+    staging = graph.node_id("staging_task_a2")
+    assert len(graph) == 3
+    assert graph.edge_count == 2
+    assert [graph.name(node) for node in graph.upstream(staging)] == ["source_task_a1"]
+    assert [graph.name(node) for node in graph.downstream(staging)] == ["landing_task_a3"]
+    assert [graph.name(node) for node in graph.layer_nodes("staging")] == ["staging_task_a2"]
+    assert list(graph.layer_nodes("vault")) == []
+
+
+def test_layer_mapper_walks_long_same_layer_chains(airflow_dag_validator):
+    """
+    Test method to map a base model through a chain of same-layer models
+
+    e.g. 'source_a >> staging_a >> staging_b >> staging_c'
+    Expected: 'staging_c': {'source_a'}
+    """
+    graph = DependencyGraph.from_edges(
+        [
+            ("source_a", "staging_a"),
+            ("staging_a", "staging_b"),
+            ("staging_b", "staging_c"),
+            ("landing_x", "staging_d"),
+        ]
+    )
+
+    layer_map = airflow_dag_validator.generate_staging_to_source_upstream_dependencies(graph)
+
+    assert layer_map == {
+        "staging_a": {"source_a"},
+        "staging_b": {"source_a"},
+        "staging_c": {"source_a"},
+        "staging_d": set(),
+    }
+    assert airflow_dag_validator.find_orphaned_models(layer_map) == ["staging_d"]
+
+
+def test_list_to_list_declarations_share_a_join_node(monkeypatch):
+    """
+    Test method to check large list-to-list declarations are stored in O(m + n) edges
+    while orphans, layer maps, rule results and the listed dependencies stay identical
+
+    e.g. '[source_0..source_99] >> [staging_0..staging_99] >> [landing_0..landing_99]'
+    Expected: 400 edges through 2 join nodes instead of 20,000 pairwise edges
+    """
+    sources = ", ".join(f"source_{index}" for index in range(100))
+    staging = ", ".join(f"staging_{index}" for index in range(100))
+    landing = ", ".join(f"landing_{index}" for index in range(100))
+    dag_string = (
+        f"[{sources}] >> [{staging}] >> [{landing}]\n"
+        f"start >> [staging_orphan_a, staging_orphan_b] >> [{landing}]\n"
+        f"[{', '.join(sources.split(', ')[:40])}] >> [staging_0, staging_extra]\n"
+    )
+
+    def validate():
+        validator = AirflowDAGValidation("dags/", quiet=True)
+        graph = validator.parse_dag_source(dag_string)
+        layer_maps = {
+            layer: layer_function(graph)
+            for layer, layer_function in validator.layer_functions.items()
+        }
+        orphans = {
+            layer: validator.find_orphaned_models(layer_map)
+            for layer, layer_map in layer_maps.items()
+        }
+        rule_results = RuleEngine(
+            [OrphanRule(), UpstreamPrefixRule(), FanInRule(max_upstream=50), LayerSkipRule()]
+        ).evaluate(graph, layer_maps)
+        return graph, layer_maps, orphans, rule_results, list(graph.expanded_edges())
+
+    graph, layer_maps, orphans, rule_results, edges = validate()
+    monkeypatch.setattr(dependency_graph, "JOIN_MIN_EDGES", float("inf"))
+    (
+        pairwise_graph,
+        pairwise_layer_maps,
+        pairwise_orphans,
+        pairwise_rule_results,
+        pairwise_edges,
+    ) = validate()
+
+    assert graph.edge_count == 4 * 100 + 2 + (2 + 100) + (40 + 2)
+    assert pairwise_graph.edge_count == 2 * 100 * 100 + 2 + 2 * 100 + 40
+    assert graph.passthrough_count == 4
+    assert layer_maps == pairwise_layer_maps
+    # staging_0 is fed by 40 sources through both join nodes, and counted once
+    assert rule_results == pairwise_rule_results
+    assert "'staging_0' has 100 upstream tasks (max 50)" in rule_results["staging"]["fan_in"]
+    assert orphans == pairwise_orphans
+    assert orphans["staging_to_source"] == ["staging_orphan_a", "staging_orphan_b"]
+    assert edges == pairwise_edges
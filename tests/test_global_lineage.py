@@ -0,0 +1,126 @@
+import pytest
+
+from dag_validator.cross_dag import extract_cross_dag_links
+from dag_validator.dag_validation import AirflowDAGValidation
+from dag_validator.watch import DAGFolderWatcher
+
+
+def test_extract_cross_dag_links(linked_dag_sources):
+    """
+    Test method to find the DAG ID, sensor targets and datasets of a DAG file
+    """
+    reporting = extract_cross_dag_links(
+        linked_dag_sources["reporting.py"], default_dag_id="reporting_file"
+    )
+    assert reporting.dag_id == "reporting"
+    assert reporting.sensors == {"wait_for_orders": [("sales", "source_orders")]}
+    assert reporting.schedule == ["s3://crm/customers"]
+
+    crm = extract_cross_dag_links(linked_dag_sources["crm.py"], default_dag_id="crm_file")
+    assert crm.dag_id == "crm"
+    assert crm.outlets == {"source_customers": ["s3://crm/customers"]}
+
+
+def test_global_lineage_resolves_cross_dag_upstream_models(linked_dag_folder):
+    """
+    Test method to check models fed by other DAGs are no longer reported as orphaned
+    """
+    per_file_results, _ = AirflowDAGValidation(linked_dag_folder, quiet=True).process_dag_folder()
+    assert per_file_results["staging_to_source"]["reporting.py"] == ["staging_report"]
+
+    validator = AirflowDAGValidation(linked_dag_folder, quiet=True, global_lineage=True)
+    results, layer_dependencies = validator.process_dag_folder()
+
+    assert results["staging_to_source"]["reporting.py"] == []
+    assert layer_dependencies["staging_to_source"]["reporting.py"] == {
+        # The sensor is a root task of a dataset-scheduled DAG, so it waits for both
+        "staging_report": {"sales::source_orders", "crm::source_customers"},
+        "staging_customers": {"crm::source_customers"},
+    }
+    assert layer_dependencies["staging_to_source"]["sales.py"] == {
+        "staging_orders": {"source_orders"}
+    }
+    assert layer_dependencies["landing_to_staging"]["reporting.py"] == {
+        "landing_report": {"staging_report", "staging_customers"}
+    }
+
+
+def test_global_graph_merges_changed_files_incrementally(linked_dag_folder):
+    """
+    Test method to check a changed or removed file only replaces its own edges
+    """
+    validator = AirflowDAGValidation(linked_dag_folder, quiet=True, global_lineage=True)
+    watcher = DAGFolderWatcher(validator, on_change=lambda dag_name, watched: None)
+    watcher.poll()
+    global_graph = watcher.global_graph
+    assert watcher.results() == validator.process_dag_folder()
+
+    # Point the sensor at a task of another DAG
+    reporting = linked_dag_folder / "reporting.py"
+    reporting.write_text(
+        reporting.read_text().replace('"source_orders"', '"source_customers"').replace(
+            '"sales"', '"crm"'
+        )
+    )
+    assert watcher.poll() == ["reporting.py"]
+    assert watcher.global_graph is global_graph
+    _, layer_dependencies = watcher.results()
+    assert layer_dependencies["staging_to_source"]["reporting.py"]["staging_report"] == {
+        "crm::source_customers"
+    }
+    assert watcher.results() == validator.process_dag_folder()
+
+    # Without the producing DAG, the dataset consumer is orphaned again
+    (linked_dag_folder / "crm.py").unlink()
+    watcher.poll()
+    results, _ = watcher.results()
+    assert results["staging_to_source"]["reporting.py"] == ["staging_customers"]
+    assert watcher.results() == validator.process_dag_folder()
+
+
+def test_global_graph_keeps_dag_files_sharing_a_file_name_apart(tmp_path):
+    """
+    Test method to check files with the same name in different folders get their own
+    DAG ID, and that two files declaring the same DAG ID are rejected
+    """
+    (tmp_path / "a").mkdir()
+    (tmp_path / "b").mkdir()
+    (tmp_path / "a" / "daily.py").write_text("source_x >> staging_y\n")
+    (tmp_path / "b" / "daily.py").write_text("source_x >> staging_y\nstaging_y >> landing_z\n")
+    validator = AirflowDAGValidation(tmp_path, quiet=True, global_lineage=True)
+    watcher = DAGFolderWatcher(validator, on_change=lambda dag_name, watched: None)
+    watcher.poll()
+
+    _, layer_dependencies = validator.process_dag_folder()
+    assert layer_dependencies["staging_to_source"] == {
+        "a/daily.py": {"staging_y": {"source_x"}},
+        "b/daily.py": {"staging_y": {"source_x"}},
+    }
+    assert watcher.results() == validator.process_dag_folder()
+
+    (tmp_path / "a" / "daily.py").write_text("source_w >> staging_y\n")
+    assert watcher.poll() == ["a/daily.py"]
+    _, layer_dependencies = watcher.results()
+    assert layer_dependencies["staging_to_source"]["b/daily.py"] == {"staging_y": {"source_x"}}
+    assert watcher.results() == validator.process_dag_folder()
+
+    for name in ("a", "b"):
+        (tmp_path / name / "daily.py").write_text(
+            'with DAG("daily") as dag:\n    source_x >> staging_y\n'
+        )
+    with pytest.raises(ValueError, match="'daily' of b/daily.py is already declared by a/daily.py"):
+        validator.process_dag_folder()
+    watcher.poll()
+    assert "already declared" in watcher.dags["b/daily.py"].error
+    assert set(watcher.global_graph.files) == {"a/daily.py"}
+
+    # Once a/daily.py renames its DAG, the ID is free for b/daily.py
+    (tmp_path / "a" / "daily.py").write_text(
+        'with DAG("hourly") as dag:\n    source_x >> staging_y\n'
+    )
+    (tmp_path / "b" / "daily.py").write_text(
+        'with DAG("daily") as dag:\n    source_x >> staging_y\n    staging_y >> landing_z\n'
+    )
+    watcher.poll()
+    assert watcher.dags["b/daily.py"].error is None
+    assert watcher.results() == validator.process_dag_folder()
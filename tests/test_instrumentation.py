@@ -0,0 +1,34 @@
+import json
+import shutil
+
+from dag_validator.dag_validation import AirflowDAGValidation
+from dag_validator.instrumentation import PHASES
+
+
+def test_quiet_mode_records_phases_without_printing(capsys):
+    """
+    Test method to check quiet mode prints nothing while every phase is still measured
+    """
+    validator = AirflowDAGValidation("dags/", quiet=True)
+    validator.process_dag_folder()
+
+    assert capsys.readouterr().out == ""
+    assert set(validator.metrics.timings["example_dag.py"]) == set(PHASES)
+    assert validator.metrics.counters == {"files": 1, "nodes": 9, "edges": 8}
+
+
+def test_metrics_report_cache_hit_rate_as_json(tmp_path):
+    """
+    Test method to export counters and the cache hit rate of two cached runs
+    """
+    shutil.copy("dags/example_dag.py", tmp_path)
+    validator = AirflowDAGValidation(tmp_path, cache_dir=tmp_path / "cache", quiet=True)
+    validator.process_dag_folder()
+    validator.process_dag_folder()
+
+    report = json.loads(validator.metrics.to_json(tmp_path / "report.json"))
+
+    assert report["cache_hit_rate"] == 0.5
+    assert report["counters"]["cache_misses"] == 1
+    assert list(report["phases"]) == list(PHASES)
+    assert "cache hit rate 50.0%" in validator.metrics.format_summary()
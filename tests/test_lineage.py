@@ -0,0 +1,109 @@
+import pytest
+
+from dag_validator.dag_validation import AirflowDAGValidation
+from dag_validator.dependency_graph import DependencyCycleError, DependencyGraph
+from dag_validator.lineage import LineageEngine
+
+MEDALLION_LAYER_MAPPING = {
+    "bronze": "raw",
+    "silver": "bronze",
+    "gold": "silver",
+    "mart": "gold",
+    "report": "mart",
+}
+
+
+def test_lineage_engine_resolves_every_layer_in_one_sweep(monkeypatch):
+    """
+    Test method to resolve a 6-layer medallion pipeline with a single topological sweep
+    """
+    graph = DependencyGraph.from_edges(
+        [
+            ("raw_a", "bronze_a"),
+            ("raw_b", "bronze_b"),
+            ("bronze_a", "bronze_c"),
+            ("bronze_b", "bronze_c"),
+            ("bronze_c", "silver_a"),
+            ("silver_a", "silver_b"),
+            ("silver_b", "gold_a"),
+            ("gold_a", "mart_a"),
+            ("raw_b", "mart_b"),
+            ("mart_a", "report_a"),
+            ("mart_b", "report_a"),
+        ]
+    )
+    engine = LineageEngine(MEDALLION_LAYER_MAPPING)
+    sweeps = []
+    sweep = engine._sweep
+    monkeypatch.setattr(engine, "_sweep", lambda graph: sweeps.append(1) or sweep(graph))
+
+    layer_maps = engine.resolve(graph)
+
+    assert layer_maps == {
+        "bronze": {"bronze_a": {"raw_a"}, "bronze_b": {"raw_b"}, "bronze_c": {"raw_a", "raw_b"}},
+        "silver": {"silver_a": {"bronze_c"}, "silver_b": {"bronze_c"}},
+        "gold": {"gold_a": {"silver_b"}},
+        "mart": {"mart_a": {"gold_a"}, "mart_b": set()},
+        "report": {"report_a": {"mart_a", "mart_b"}},
+    }
+    assert engine.resolve(graph) is layer_maps
+    assert len(sweeps) == 1
+
+
+def test_layer_functions_follow_the_configured_layer_mapping():
+    """
+    Test method to check one layer function is registered per configured layer
+    """
+    validator = AirflowDAGValidation("dags/", upstream_layer_mapping=MEDALLION_LAYER_MAPPING)
+
+    assert list(validator.layer_functions) == [
+        "bronze_to_raw",
+        "silver_to_bronze",
+        "gold_to_silver",
+        "mart_to_gold",
+        "report_to_mart",
+    ]
+
+
+def test_lineage_engine_handles_deep_chains_and_wide_diamonds():
+    """
+    Test method to resolve chains deeper than the recursion limit and diamonds with
+    exponentially many paths
+    """
+    chain = [("source_0", "staging_0")] + [
+        (f"staging_{index}", f"staging_{index + 1}") for index in range(20000)
+    ]
+    diamond = [(f"source_{index}", "staging_d_0_0") for index in range(3)] + [
+        (f"staging_d_{rank}_{upstream}", f"staging_d_{rank + 1}_{downstream}")
+        for rank in range(40)
+        for upstream in range(2)
+        for downstream in range(2)
+    ]
+    engine = LineageEngine({"staging": "source"})
+
+    chain_map = engine.resolve(DependencyGraph.from_edges(chain))["staging"]
+    diamond_map = engine.resolve(DependencyGraph.from_edges(diamond))["staging"]
+
+    assert chain_map["staging_20000"] == {"source_0"}
+    assert diamond_map["staging_d_40_1"] == {"source_0", "source_1", "source_2"}
+
+
+def test_dependency_cycle_is_reported():
+    """
+    Test method to check a cycle is reported with its models instead of hanging
+    """
+    graph = DependencyGraph.from_edges(
+        [
+            ("source_a", "staging_a"),
+            ("staging_a", "staging_b"),
+            ("staging_b", "staging_c"),
+            ("staging_c", "staging_a"),
+            ("staging_c", "landing_a"),
+        ]
+    )
+
+    with pytest.raises(DependencyCycleError) as error:
+        LineageEngine().resolve(graph)
+
+    assert sorted(error.value.cycle) == ["staging_a", "staging_b", "staging_c"]
+    assert "staging_a >> staging_b >> staging_c >> staging_a" in str(error.value)
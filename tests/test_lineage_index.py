@@ -0,0 +1,161 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+from dag_validator.dag_validation import AirflowDAGValidation
+from dag_validator.dependency_graph import PASSTHROUGH, DependencyGraph, get_layer
+from dag_validator.lineage_index import LineageIndex
+from dag_validator.lineage_server import LineageServer
+
+
+@pytest.fixture(scope="module")
+def example_index():
+    return AirflowDAGValidation("dags/", quiet=True).build_lineage_index()
+
+
+def test_upstream_downstream_and_path_queries(example_index):
+    """
+    Test method to query the lineage of the example DAG by bare and qualified task names
+    """
+    assert example_index.upstream("landing_task_c1", layer="staging") == (
+        "example_dag::staging_task_a2",
+        "example_dag::staging_task_b3",
+        "example_dag::staging_task_b4",
+    )
+    assert example_index.upstream("example_dag::landing_task_c1", layer="source") == (
+        "example_dag::source_task_a1",
+        "example_dag::source_task_b1",
+        "example_dag::source_task_b2",
+    )
+    assert example_index.downstream("source_task_a1") == (
+        "example_dag::landing_task_a3",
+        "example_dag::landing_task_c1",
+        "example_dag::staging_task_a2",
+    )
+    assert example_index.path("source_task_a1", "landing_task_a3") == (
+        "example_dag::source_task_a1",
+        "example_dag::staging_task_a2",
+        "example_dag::landing_task_a3",
+    )
+    assert example_index.path("landing_task_a3", "source_task_a1") is None
+
+    example_index.upstream("landing_task_c1", layer="staging")
+    assert example_index.cache_info().hits >= 1
+    with pytest.raises(KeyError, match="Unknown task"):
+        example_index.upstream("landing_task_z9")
+
+
+def test_index_looks_through_passthrough_nodes(linked_dag_folder):
+    """
+    Test method to follow sensors across DAGs and join nodes of list-to-list declarations,
+    without returning either
+    """
+    index = AirflowDAGValidation(linked_dag_folder, quiet=True).build_lineage_index()
+    assert index.upstream("landing_report", layer="source") == (
+        "crm::source_customers",
+        "sales::source_orders",
+    )
+    assert index.path("source_orders", "landing_report") == (
+        "sales::source_orders",
+        "reporting::staging_report",
+        "reporting::landing_report",
+    )
+
+    graph = DependencyGraph()
+    graph.add_bipartite_edges(
+        [f"source_{index}" for index in range(10)], [f"staging_{index}" for index in range(10)]
+    )
+    join_index = LineageIndex(graph)
+    assert len(join_index.downstream("source_3")) == 10
+    assert join_index.path("source_3", "staging_7") == ("source_3", "staging_7")
+
+
+def test_index_composes_lineage_across_linked_dags():
+    """
+    Test method to check lineage crossing several DAGs, and entering the same DAG twice,
+    matches a plain graph walk while bitsets only span one DAG
+    """
+    graph = DependencyGraph()
+    for upstream, downstream in [
+        ("a::source_1", "a::staging_1"),
+        ("a::staging_1", "dataset::orders"),
+        ("dataset::orders", "b::staging_2"),
+        ("b::staging_2", "b::landing_2"),
+        ("b::landing_2", "a::wait_for_b"),
+        ("a::wait_for_b", "a::landing_3"),
+        ("a::source_4", "a::landing_3"),
+        ("c::source_5", "b::staging_2"),
+    ]:
+        # Qualified tasks keep the layer of their task name, as in the global graph
+        for name in (upstream, downstream):
+            graph.add_node(name, layer=get_layer(name.partition("::")[2]))
+        graph.add_edge(upstream, downstream)
+    for passthrough in ("dataset::orders", "a::wait_for_b"):
+        graph.set_kind(graph.node_id(passthrough), PASSTHROUGH)
+    index = LineageIndex(graph)
+
+    def walk(node, neighbours):
+        seen, pending = set(), [node]
+        while pending:
+            for other in neighbours(pending.pop()):
+                if other not in seen:
+                    seen.add(other)
+                    pending.append(other)
+        return tuple(
+            sorted(graph.name(other) for other in seen if graph.kind_of(other) != PASSTHROUGH)
+        )
+
+    for node in range(len(graph)):
+        if graph.kind_of(node) == PASSTHROUGH:
+            continue
+        assert index.upstream(graph.name(node)) == walk(node, graph.upstream)
+        assert index.downstream(graph.name(node)) == walk(node, graph.downstream)
+    assert max(len(group_nodes) for group_nodes in index.group_nodes) == 5
+    assert index.path("source_1", "landing_3") == (
+        "a::source_1",
+        "a::staging_1",
+        "b::staging_2",
+        "b::landing_2",
+        "a::landing_3",
+    )
+    assert index.upstream("landing_3", layer="source") == (
+        "a::source_1",
+        "a::source_4",
+        "c::source_5",
+    )
+
+def test_lineage_server_answers_from_the_index(example_index):
+    """
+    Test method to query the local lineage server over HTTP
+    """
+    server = LineageServer(example_index, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    def get(path):
+        try:
+            with urllib.request.urlopen(base_url + path) as response:
+                return response.status, json.load(response)
+        except urllib.error.HTTPError as error:
+            return error.code, json.load(error)
+
+    try:
+        assert get("/upstream?task=landing_task_c1&layer=staging") == (
+            200,
+            {
+                "task": "landing_task_c1",
+                "layer": "staging",
+                "upstream": list(example_index.upstream("landing_task_c1", "staging")),
+            },
+        )
+        status, document = get("/path?source=source_task_a1&target=landing_task_a3")
+        assert status == 200 and len(document["path"]) == 3
+        assert get("/downstream?task=unknown_task")[0] == 404
+        assert get("/path?source=source_task_a1")[0] == 400
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,40 @@
+import shutil
+
+import pytest
+
+from dag_validator.dag_validation import PARALLEL_MIN_FILES, AirflowDAGValidation
+
+
+@pytest.fixture
+def large_dag_folder(tmp_path):
+    for index in range(PARALLEL_MIN_FILES):
+        shutil.copy("dags/example_dag.py", tmp_path / f"example_dag_{index:03d}.py")
+    return tmp_path
+
+
+def test_parallel_results_match_serial_results(large_dag_folder):
+    """
+    Test method to check the process pool merges results in the same order as the serial run
+    """
+    serial = AirflowDAGValidation(large_dag_folder, quiet=True).process_dag_folder()
+    validator = AirflowDAGValidation(large_dag_folder, parallel=True, max_workers=2, quiet=True)
+    parallel = validator.process_dag_folder()
+
+    assert parallel == serial
+    assert validator.metrics.counters["files"] == PARALLEL_MIN_FILES
+    assert list(parallel[0]["staging_to_source"]) == sorted(
+        parallel[0]["staging_to_source"]
+    )
+
+
+def test_parallel_collects_per_file_errors(large_dag_folder):
+    """
+    Test method to check a failing DAG file does not stop the other files in the pool
+    """
+    (large_dag_folder / "broken_dag.py").write_bytes(b"\xff\xfe >> \xff")
+    validator = AirflowDAGValidation(large_dag_folder, parallel=True, max_workers=2, quiet=True)
+
+    with pytest.raises(ValueError, match="1 DAG file"):
+        validator.process_dag_folder()
+
+    assert list(validator.file_errors) == ["broken_dag.py"]
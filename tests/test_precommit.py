@@ -0,0 +1,67 @@
+import json
+import shutil
+
+from dag_validator.dag_validation import AirflowDAGValidation
+from dag_validator.precommit import main
+
+
+def test_precommit_validates_only_the_given_dag_files(tmp_path, monkeypatch, capsys):
+    """
+    Test method to check the hook skips non-DAG files, never walks the DAG folder and
+    stops at the first violation with --fail-fast
+    """
+    dag_folder = tmp_path / "dags"
+    (dag_folder / "tests").mkdir(parents=True)
+    shutil.copy("dags/example_dag.py", dag_folder / "example_dag.py")
+    (dag_folder / "orphan_a.py").write_text("start >> staging_task_a\n")
+    (dag_folder / "orphan_b.py").write_text("start >> staging_task_b\n")
+    (dag_folder / "tests" / "test_orphan.py").write_text("start >> staging_task_c\n")
+    (tmp_path / "setup.py").write_text("start >> staging_task_d\n")
+
+    def walk_folder(self):
+        raise AssertionError("the DAG folder must not be walked")
+
+    monkeypatch.setattr(AirflowDAGValidation, "iter_dag_files", walk_folder)
+    changed_files = [
+        str(tmp_path / "setup.py"),
+        str(dag_folder / "tests" / "test_orphan.py"),
+        str(dag_folder / "example_dag.py"),
+        str(dag_folder / "orphan_a.py"),
+        str(dag_folder / "orphan_b.py"),
+        "README.md",
+    ]
+
+    assert main(["--dag-folder", str(dag_folder), *changed_files]) == 1
+    assert capsys.readouterr().out.splitlines() == [
+        "orphan_a.py, staging_to_source: orphaned model 'staging_task_a'",
+        "orphan_b.py, staging_to_source: orphaned model 'staging_task_b'",
+    ]
+
+    assert main(["--dag-folder", str(dag_folder), "--fail-fast", *changed_files]) == 1
+    assert capsys.readouterr().out.splitlines() == [
+        "orphan_a.py, staging_to_source: orphaned model 'staging_task_a'"
+    ]
+
+    assert main(["--dag-folder", str(dag_folder), str(dag_folder / "example_dag.py")]) == 0
+    assert main(["--dag-folder", str(dag_folder), "README.md"]) == 0
+
+
+def test_precommit_names_dag_files_the_same_for_absolute_paths(tmp_path, monkeypatch):
+    """
+    Test method to check expected orphans match whether the file names or the DAG
+    folder are given as relative or absolute paths
+    """
+    (tmp_path / "dags" / "marketing").mkdir(parents=True)
+    (tmp_path / "dags" / "marketing" / "orphan.py").write_text("start >> staging_task_a\n")
+    (tmp_path / "expected_orphans.json").write_text(
+        json.dumps({"staging_to_source": {"marketing/orphan.py": ["staging_task_a"]}})
+    )
+    monkeypatch.chdir(tmp_path)
+
+    for dag_folder, filename in (
+        ("dags", "dags/marketing/orphan.py"),
+        ("dags", str(tmp_path / "dags" / "marketing" / "orphan.py")),
+        (str(tmp_path / "dags"), "dags/marketing/orphan.py"),
+    ):
+        argv = ["--dag-folder", dag_folder, "--expected-orphans", "expected_orphans.json"]
+        assert main([*argv, filename]) == 0
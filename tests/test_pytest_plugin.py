@@ -0,0 +1,58 @@
+import shutil
+
+import pytest
+
+from dag_validator.dag_validation import AirflowDAGValidation
+from dag_validator.pytest_plugin import DAGValidationSession
+
+
+def test_session_validates_each_dag_file_once(tmp_path, monkeypatch):
+    """
+    Test method to check every DAG file is validated once, however many items share it
+    """
+    shutil.copy("dags/example_dag.py", tmp_path / "example_dag.py")
+    session = DAGValidationSession(AirflowDAGValidation(tmp_path, quiet=True))
+    parse_calls = []
+    original_parse_dag_file = session.validator.parse_dag_file
+    monkeypatch.setattr(
+        session.validator,
+        "parse_dag_file",
+        lambda *args: parse_calls.append(args) or original_parse_dag_file(*args),
+    )
+
+    first_result = session.result("example_dag.py")
+    assert session.result("example_dag.py") is first_result
+    assert first_result.results == {"staging_to_source": [], "landing_to_staging": []}
+    assert len(parse_calls) == 1
+
+
+def test_session_shards_dag_files_by_size(tmp_path):
+    """
+    Test method to check DAG files are spread over shards of about the same total size
+    """
+    for name, size in {"a.py": 900, "b.py": 500, "c.py": 400, "d.py": 300, "e.py": 200}.items():
+        (tmp_path / name).write_text("#" * size)
+    session = DAGValidationSession(AirflowDAGValidation(tmp_path, quiet=True))
+
+    assert session.shards(2) == {"a.py": 0, "b.py": 1, "c.py": 1, "d.py": 0, "e.py": 1}
+    assert set(session.shards(1).values()) == {0}
+
+
+def test_collection_fails_without_dag_files(pytester, tmp_path):
+    """
+    Test method to check an empty or missing DAG folder fails the run instead of
+    skipping every check
+    """
+    pytester.makepyfile(
+        test_dags="""
+        def test_dag_file(dag_result, dag_layer):
+            assert not dag_result.results[dag_layer]
+        """
+    )
+
+    for dag_folder in (tmp_path, tmp_path / "missing"):
+        result = pytester.runpytest(
+            "-p", "dag_validator.pytest_plugin", "--dag-folder", str(dag_folder)
+        )
+        assert result.ret == pytest.ExitCode.INTERRUPTED  # a collection error
+        assert "is empty or does not exist" in str(result.stdout) + str(result.stderr)
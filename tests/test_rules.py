@@ -0,0 +1,107 @@
+from dag_validator.checks import find_incorrect_prefixes
+from dag_validator.dag_validation import AirflowDAGValidation
+from dag_validator.dependency_graph import DependencyGraph
+from dag_validator.lineage import LineageEngine
+from dag_validator.rules import (
+    ChainDepthRule,
+    FanInRule,
+    LayerSkipRule,
+    NamingRule,
+    OrphanRule,
+    Rule,
+    RuleEngine,
+    UpstreamPrefixRule,
+)
+
+
+def evaluate(edges, rules):
+    graph = DependencyGraph.from_edges(edges)
+    return RuleEngine(rules).evaluate(graph, LineageEngine().resolve(graph))
+
+
+def test_default_rules_match_the_orphan_results():
+    """
+    Test method to check the default rules report the orphans of process_dag_folder
+    """
+    validator = AirflowDAGValidation("dags/", quiet=True)
+    results, _ = validator.process_dag_folder()
+
+    assert validator.evaluate_rules() == {"example_dag.py": {}}
+    assert results["staging_to_source"]["example_dag.py"] == []
+    assert evaluate([("start", "staging_task_x")], [OrphanRule()]) == {
+        "staging": {"orphan": ["orphaned model 'staging_task_x'"]}
+    }
+
+
+def test_upstream_prefix_rule_matches_the_prefix_check():
+    """
+    Test method to check the upstream prefix rule and the prefix check of the CLI
+    compare whole layer prefixes, e.g. 'sourcery_x' is not in layer 'source'
+    """
+    graph = DependencyGraph.from_edges([("sourcery_x", "staging_a"), ("source_b", "staging_a")])
+    layer_map = {"staging_a": {"sourcery_x", "source_b"}}
+
+    assert RuleEngine([UpstreamPrefixRule()]).evaluate(graph, {"staging": layer_map}) == {
+        "staging": {
+            "upstream_prefix": ["'staging_a' maps to 'sourcery_x', expected layer 'source'"]
+        }
+    }
+    assert find_incorrect_prefixes({"staging_to_source": {"dag.py": layer_map}}) == [
+        "dag.py, staging_to_source: 'staging_a' maps to 'sourcery_x', expected layer 'source'"
+    ]
+
+
+def test_builtin_rules_aggregate_per_layer_and_rule():
+    """
+    Test method to check fan-in, naming, layer skip and chain depth are all reported
+    from one evaluation, grouped by layer and rule
+    """
+    edges = [
+        ("source_a", "staging_a"),
+        ("source_b", "staging_a"),
+        ("source_c", "staging_a"),
+        ("staging_a", "staging_b"),
+        ("staging_b", "landing_a"),
+        ("source_a", "landing_Bad"),
+    ]
+    rules = [FanInRule(max_upstream=2), NamingRule(), LayerSkipRule(), ChainDepthRule(max_depth=2)]
+
+    assert evaluate(edges, rules) == {
+        "staging": {
+            "fan_in": ["'staging_a' has 3 upstream tasks (max 2)"],
+            "chain_depth": ["'staging_b' ends a chain of 3 tasks (max 2)"],
+        },
+        "landing": {
+            "layer_skip": ["'source_a' >> 'landing_Bad' skips layer 'staging'"],
+            "naming": ["'landing_Bad' does not match '[a-z][a-z0-9]*(_[a-z0-9]+)*'"],
+        },
+    }
+
+
+def test_rules_share_one_traversal():
+    """
+    Test method to check every node and edge is visited once per rule, upstream first
+    """
+
+    class RecordingRule(Rule):
+        name = "recording"
+
+        def __init__(self):
+            self.visits = []
+
+        def visit_node(self, context, node):
+            self.visits.append(context.graph.name(node))
+
+        def visit_edge(self, context, upstream_node, downstream_node):
+            graph = context.graph
+            self.visits.append((graph.name(upstream_node), graph.name(downstream_node)))
+
+    class NodeOnlyRule(Rule):
+        name = "node_only"
+
+    recording = RecordingRule()
+    engine = RuleEngine([recording, NodeOnlyRule()])
+    assert engine.evaluate(DependencyGraph.from_edges([("a", "b"), ("b", "c")])) == {}
+
+    assert recording.visits == ["a", ("a", "b"), "b", ("b", "c"), "c"]
+    assert len(engine._node_visitors) == len(engine._edge_visitors) == 1
@@ -0,0 +1,89 @@
+import shutil
+
+import pytest
+
+from dag_validator.checks import run_checks
+from dag_validator.cli import main
+from dag_validator.dag_validation import AirflowDAGValidation
+from dag_validator.sharding import PartialResult, merge_partial_results, parse_shard
+
+
+@pytest.fixture
+def dag_folder(tmp_path):
+    folder = tmp_path / "dags"
+    (folder / "marketing").mkdir(parents=True)
+    for index in range(5):
+        shutil.copy("dags/example_dag.py", folder / f"example_dag_{index}.py")
+        shutil.copy("dags/example_dag.py", folder / "marketing" / f"daily_dag_{index}.py")
+    (folder / "orphan_dag.py").write_text("start >> staging_task_x\n")
+    return folder
+
+
+@pytest.mark.parametrize("strategy", ["hash", "cost"])
+def test_merged_shards_match_a_single_run(dag_folder, tmp_path, strategy):
+    """
+    Test method to check every file lands on exactly one shard and merging the partial
+    results gives the same output as validating the whole folder at once
+    """
+    partial_results = [
+        AirflowDAGValidation(
+            dag_folder, shard=(index, 3), shard_strategy=strategy, quiet=True
+        ).write_partial_result(tmp_path / f"partial_{index}.json")
+        for index in (1, 2, 3)
+    ]
+    shard_files = [set(partial.results["staging_to_source"]) for partial in partial_results]
+    assert sum(len(files) for files in shard_files) == len(set.union(*shard_files)) == 11
+
+    merged = merge_partial_results(
+        [PartialResult.read(tmp_path / f"partial_{index}.json") for index in (3, 1, 2)]
+    )
+    assert merged == AirflowDAGValidation(dag_folder, quiet=True).process_dag_folder()
+
+
+def test_merge_requires_every_shard(dag_folder, tmp_path):
+    """
+    Test method to check a missing shard fails the merge instead of passing silently
+    """
+    AirflowDAGValidation(dag_folder, shard=(1, 2), quiet=True).write_partial_result(
+        tmp_path / "partial_1.json"
+    )
+
+    with pytest.raises(ValueError, match="missing \\[2\\]"):
+        merge_partial_results([PartialResult.read(tmp_path / "partial_1.json")])
+    with pytest.raises(ValueError, match="i/N"):
+        parse_shard("3/2")
+
+
+def test_cli_merge_runs_the_checks_once(dag_folder, tmp_path, capsys):
+    """
+    Test method to check the merge command reports orphaned models of every shard
+    """
+    for index in (1, 2):
+        assert main(
+            ["validate", str(dag_folder), "--shard", f"{index}/2",
+             "--output", str(tmp_path / f"partial_{index}.json")]
+        ) == 0
+
+    partial_paths = [str(tmp_path / f"partial_{index}.json") for index in (1, 2)]
+    assert main(["merge", *partial_paths]) == 1
+    assert "orphan_dag.py, staging_to_source: orphaned model 'staging_task_x'" in (
+        capsys.readouterr().out
+    )
+
+    expected_orphans = tmp_path / "expected_orphans.json"
+    expected_orphans.write_text('{"staging_to_source": {"orphan_dag.py": ["staging_task_x"]}}')
+    assert main(["merge", *partial_paths, "--expected-orphans", str(expected_orphans)]) == 0
+
+
+def test_prefix_check_flags_skipped_layers():
+    """
+    Test method to check an upstream model outside the expected upstream layer is reported
+    """
+    layer_dependencies = {
+        "landing_to_staging": {"example_dag.py": {"landing_task_c1": {"source_task_a1"}}}
+    }
+
+    assert run_checks({}, layer_dependencies) == [
+        "example_dag.py, landing_to_staging: 'landing_task_c1' maps to 'source_task_a1', "
+        "expected layer 'staging'"
+    ]
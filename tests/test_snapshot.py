@@ -0,0 +1,63 @@
+from dag_validator.dag_validation import AirflowDAGValidation
+from dag_validator.snapshot import Snapshot
+
+
+def test_snapshot_round_trip(tmp_path):
+    """
+    Test method to check a snapshot restores the layer maps of every DAG
+    """
+    validator = AirflowDAGValidation("dags/", quiet=True)
+    _, layer_dependencies = validator.process_dag_folder()
+
+    validator.write_snapshot(tmp_path / "baseline.snap", layer_dependencies)
+
+    assert Snapshot.read(tmp_path / "baseline.snap").to_layer_dependencies() == layer_dependencies
+    assert not validator.diff_snapshot(tmp_path / "baseline.snap", layer_dependencies)
+
+
+def test_snapshot_diff_reports_only_changes():
+    """
+    Test method to check the diff reports added and removed edges, new orphans and changed mappings
+    """
+    baseline = Snapshot.from_layer_dependencies(
+        {
+            "staging_to_source": {
+                "dag_a.py": {
+                    "staging_a": {"source_a", "source_b"},
+                    "staging_b": {"source_b"},
+                    "staging_removed": {"source_c"},
+                },
+                "dag_b.py": {"staging_c": {"source_c"}},
+            }
+        }
+    )
+    current = Snapshot.from_layer_dependencies(
+        {
+            "staging_to_source": {
+                "dag_a.py": {
+                    "staging_a": {"source_a", "source_d"},
+                    "staging_b": set(),
+                    "staging_new": set(),
+                },
+                "dag_b.py": {"staging_c": {"source_c"}},
+            }
+        }
+    )
+
+    diff = current.diff(baseline)
+
+    assert diff.added_edges == [("staging_to_source", "dag_a.py", "staging_a", "source_d")]
+    assert diff.removed_edges == [
+        ("staging_to_source", "dag_a.py", "staging_a", "source_b"),
+        ("staging_to_source", "dag_a.py", "staging_b", "source_b"),
+        ("staging_to_source", "dag_a.py", "staging_removed", "source_c"),
+    ]
+    assert diff.new_orphans == [
+        ("staging_to_source", "dag_a.py", "staging_b"),
+        ("staging_to_source", "dag_a.py", "staging_new"),
+    ]
+    assert diff.changed_mappings == {
+        ("staging_to_source", "dag_a.py", "staging_a"): ({"source_a", "source_b"}, {"source_a", "source_d"}),
+        ("staging_to_source", "dag_a.py", "staging_b"): ({"source_b"}, set()),
+    }
+    assert "! staging_to_source dag_a.py: staging_new is orphaned" in diff.format()
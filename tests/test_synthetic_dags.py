@@ -0,0 +1,28 @@
+from benchmarks.synthetic import generate_dag_folder, generate_dag_source, upstream_layer_mapping
+from dag_validator.dag_validation import AirflowDAGValidation
+
+
+def test_synthetic_dag_shape():
+    """
+    Test method to check the generated dependencies follow the requested shape
+    """
+    source = generate_dag_source(tasks=12, layers=3, chain_depth=2, fan_in=2, fan_out=2, list_size=2)
+    dependencies = [line for line in source.splitlines() if ">>" in line]
+
+    assert "staging_task_0 >> staging_task_1" in dependencies
+    assert sum(line.startswith("[") for line in dependencies) == 2
+
+
+def test_synthetic_dag_folder_validates_without_orphans(tmp_path):
+    """
+    Test method to check a generated multi-layer folder maps every layer without orphans
+    """
+    generate_dag_folder(tmp_path, files=3, tasks=60, layers=6, chain_depth=3, fan_in=3)
+    validator = AirflowDAGValidation(
+        tmp_path, upstream_layer_mapping=upstream_layer_mapping(6), quiet=True
+    )
+    results, layer_dependencies = validator.process_dag_folder()
+
+    assert len(results) == 5
+    assert all(not orphans for dag_group in results.values() for orphans in dag_group.values())
+    assert len(layer_dependencies["layer5_to_layer4"]["synthetic_dag_00000.py"]) == 10
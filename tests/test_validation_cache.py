@@ -0,0 +1,57 @@
+import shutil
+
+import pytest
+
+from dag_validator import cache as cache_module
+from dag_validator.cache import ValidationCache
+from dag_validator.dag_validation import AirflowDAGValidation
+
+
+def test_unchanged_dag_files_are_served_from_cache(tmp_path, monkeypatch):
+    """
+    Test method to check a second run reuses cached results instead of re-parsing the DAG
+    """
+    dag_folder = tmp_path / "dags"
+    dag_folder.mkdir()
+    shutil.copy("dags/example_dag.py", dag_folder)
+    cache_dir = tmp_path / "cache"
+
+    first_run = AirflowDAGValidation(dag_folder, cache_dir=cache_dir).process_dag_folder()
+
+    validator = AirflowDAGValidation(dag_folder, cache_dir=cache_dir)
+    monkeypatch.setattr(
+        validator,
+        "parse_dag_source",
+        lambda *args: pytest.fail("DAG file was parsed again"),
+    )
+    assert validator.process_dag_folder() == first_run
+
+
+def test_cache_key_changes_with_content_layers_and_validator_sources(tmp_path, monkeypatch):
+    """
+    Test method to check the cache key covers the file content, the configured layers
+    and the sources of the parsing and lineage modules
+    """
+    cache = ValidationCache(tmp_path)
+
+    key = cache.make_key(b"a >> b", ["staging_to_source"])
+    assert key == cache.make_key(b"a >> b", ["staging_to_source"])
+    assert key != cache.make_key(b"a >> c", ["staging_to_source"])
+    assert key != cache.make_key(b"a >> b", ["staging_to_source", "landing_to_staging"])
+
+    # i.e. entries written before a change to the extractor or the lineage semantics
+    monkeypatch.setattr(cache_module, "validator_source_digest", lambda: b"changed parser")
+    assert key != cache.make_key(b"a >> b", ["staging_to_source"])
+
+
+def test_prune_evicts_least_recently_used_entries(tmp_path):
+    """
+    Test method to check entries are evicted once the cache exceeds its size bound
+    """
+    cache = ValidationCache(tmp_path, max_bytes=0)
+    cache.put("ab01", [("a", "b")], {"staging_to_source": {}}, {"staging_to_source": []})
+
+    assert cache.get("ab01") is not None
+    assert cache.prune() == 1
+    assert cache.get("ab01") is None
+
@@ -0,0 +1,33 @@
+import os
+import shutil
+
+from dag_validator.dag_validation import AirflowDAGValidation
+from dag_validator.watch import DAGFolderWatcher
+
+
+def test_watcher_revalidates_only_changed_dag_files(tmp_path):
+    """
+    Test method to check only added, modified and removed DAG files are revalidated
+    """
+    for name in ("dag_a.py", "dag_b.py"):
+        shutil.copy("dags/example_dag.py", tmp_path / name)
+    changes = []
+    watcher = DAGFolderWatcher(
+        AirflowDAGValidation(tmp_path, quiet=True),
+        on_change=lambda dag_name, watched: changes.append((dag_name, watched)),
+    )
+
+    assert watcher.poll() == ["dag_a.py", "dag_b.py"]
+    assert watcher.poll() == []
+
+    dag_a = tmp_path / "dag_a.py"
+    dag_a.write_text(dag_a.read_text() + "\nlanding_task_c1 >> staging_task_orphan\n")
+    os.utime(dag_a, ns=(0, os.stat(dag_a).st_mtime_ns + 1))
+    (tmp_path / "dag_b.py").unlink()
+
+    assert watcher.poll() == ["dag_b.py", "dag_a.py"]
+    assert changes[-2] == ("dag_b.py", None)
+    assert changes[-1][1].result["staging_to_source"] == ["staging_task_orphan"]
+
+    results, layer_dependencies = watcher.results()
+    assert list(results["staging_to_source"]) == ["dag_a.py"]